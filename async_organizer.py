@@ -0,0 +1,153 @@
+"""
+API asíncrona para integrar el organizador en servicios asyncio.
+"""
+
+import asyncio
+import threading
+import concurrent.futures
+from functools import partial
+from typing import AsyncIterator, Callable, List, Optional, Tuple, Dict
+
+from organizer import FileOrganizer, FileInfo, OrganizePlan
+
+
+class JobCancelled(BaseException):
+    """Se lanza dentro del hilo de trabajo cuando el consumidor asíncrono se cancela."""
+
+
+class AsyncOrganizer:
+    """
+    Envoltorio asíncrono de un FileOrganizer. Las operaciones bloqueantes se
+    ejecutan en un ThreadPoolExecutor y sus resultados llegan como iteradores
+    asíncronos, sin bloquear el bucle de eventos.
+    
+    Cada trabajo concurrente necesita su propio FileOrganizer; varios
+    AsyncOrganizer pueden compartir el mismo executor.
+    """
+    
+    def __init__(self, organizer: FileOrganizer = None,
+                 executor: Optional[concurrent.futures.Executor] = None,
+                 max_workers: int = 4, queue_size: int = 256):
+        self.organizer = organizer or FileOrganizer()
+        self._owns_executor = executor is None
+        self.executor = executor or concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="organizer"
+        )
+        self.queue_size = queue_size
+    
+    async def __aenter__(self) -> "AsyncOrganizer":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+    
+    async def _run(self, func: Callable, *args, **kwargs):
+        """Ejecuta una llamada bloqueante en el executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+    
+    async def _stream(self, job: Callable, abort_on_cancel: bool = True) -> AsyncIterator:
+        """
+        Ejecuta job(emit, cancel_event) en el executor y entrega cada elemento
+        emitido. La cola acotada frena al hilo si el consumidor va más lento.
+        Al cancelar, o al cerrar el iterador antes de tiempo, se activa
+        cancel_event; con abort_on_cancel además la siguiente llamada a emit
+        interrumpe el trabajo.
+        """
+        loop = asyncio.get_running_loop()
+        items = asyncio.Queue(self.queue_size)
+        cancel_event = threading.Event()
+        
+        def emit(item):
+            if cancel_event.is_set():
+                if abort_on_cancel:
+                    raise JobCancelled()
+                return
+            future = asyncio.run_coroutine_threadsafe(items.put(item), loop)
+            while True:
+                try:
+                    future.result(timeout=0.1)
+                    return
+                except concurrent.futures.TimeoutError:
+                    if cancel_event.is_set():
+                        future.cancel()
+                        if abort_on_cancel:
+                            raise JobCancelled()
+                        return
+        
+        def run():
+            try:
+                return job(emit, cancel_event)
+            except JobCancelled:
+                return None
+        
+        task = loop.run_in_executor(self.executor, run)
+        getter = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(items.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                    continue
+                
+                # El trabajo terminó: emit espera a que cada elemento esté en la cola
+                getter.cancel()
+                while not items.empty():
+                    yield items.get_nowait()
+                task.result()
+                return
+        finally:
+            cancel_event.set()
+            if getter is not None and not getter.done():
+                getter.cancel()
+    
+    async def scan(self) -> AsyncIterator[FileInfo]:
+        """Genera los archivos del origen a medida que se recorren."""
+        def job(emit, cancel_event):
+            for file_info in self.organizer.iter_files(cancel_event):
+                emit(file_info)
+        
+        async for file_info in self._stream(job):
+            yield file_info
+    
+    async def get_files(self) -> List[FileInfo]:
+        return await self._run(self.organizer.get_files)
+    
+    async def find_duplicates(self, files: List[FileInfo] = None) -> AsyncIterator[Tuple[str, List[FileInfo]]]:
+        """Genera (hash, archivos) por cada grupo de duplicados en cuanto se confirma."""
+        def job(emit, cancel_event):
+            self.organizer.find_duplicates(files=files, duplicate_callback=lambda h, group: emit((h, group)),
+                                           cancel_event=cancel_event)
+        
+        async for group in self._stream(job):
+            yield group
+    
+    async def build_plan(self, files: List[FileInfo] = None) -> OrganizePlan:
+        return await self._run(self.organizer.build_plan, files)
+    
+    async def organize(self, files: List[FileInfo] = None) -> AsyncIterator[Dict[str, str]]:
+        """
+        Organiza y genera el resultado de cada archivo (status, source,
+        destination, error). Al cancelar se termina la operación en curso y se
+        guarda el historial antes de parar; el resumen queda en organizer.results.
+        """
+        def job(emit, cancel_event):
+            return self.organizer.organize(files=files, outcome_callback=emit, cancel_event=cancel_event)
+        
+        async for outcome in self._stream(job, abort_on_cancel=False):
+            yield outcome
+    
+    async def execute_plan(self, plan: OrganizePlan) -> AsyncIterator[Dict[str, str]]:
+        def job(emit, cancel_event):
+            return self.organizer.execute_plan(plan, outcome_callback=emit, cancel_event=cancel_event)
+        
+        async for outcome in self._stream(job, abort_on_cancel=False):
+            yield outcome
+    
+    async def undo_last(self) -> Tuple[bool, str]:
+        return await self._run(self.organizer.undo_last)
@@ -3,11 +3,18 @@ Punto de entrada de la aplicación.
 """
 
 import sys
+from pathlib import Path
 from PySide6.QtWidgets import QApplication
 from ui import OrganizerWindow
+from worker import WORKER_FLAG, serve
 
 
 def main():
+    # El ejecutable congelado no puede lanzar worker.py: se relanza a sí mismo con WORKER_FLAG
+    if len(sys.argv) == 3 and sys.argv[1] == WORKER_FLAG:
+        serve(Path(sys.argv[2]))
+        return
+    
     app = QApplication(sys.argv)
     window = OrganizerWindow()
     window.show()
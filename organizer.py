@@ -1,9 +1,36 @@
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Iterator, Union
 from datetime import datetime
+import os
+import sys
+import stat
+import re
+import fnmatch
+import filecmp
+import string
 import shutil
 import hashlib
 import json
+import csv
+import io
+import time
+import struct
+import threading
+import platform
+import ctypes
+import heapq
+import random
+import queue
+import tempfile
+import itertools
+import zipfile
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 EXTENSION_CATEGORIES = {
@@ -19,6 +46,30 @@ EXTENSION_CATEGORIES = {
     "Libros": [".epub", ".mobi", ".azw", ".azw3", ".fb2", ".djvu"],
 }
 
+DEFAULT_CATEGORY = "Otros"
+
+
+def build_category_index(categories: Dict[str, List[str]]) -> Dict[str, str]:
+    """Invierte una tabla categoría → extensiones en un diccionario extensión → categoría."""
+    index = {}
+    for category, extensions in categories.items():
+        for ext in extensions:
+            ext = ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
+            index[ext] = category
+    return index
+
+
+def load_category_table(table_file: Path) -> Dict[str, List[str]]:
+    """Lee una tabla de categorías en JSON: {"Categoría": [".ext", ...]}."""
+    with open(table_file, 'r', encoding='utf-8') as f:
+        table = json.load(f)
+    if not isinstance(table, dict) or not all(isinstance(v, list) for v in table.values()):
+        raise ValueError("La tabla de categorías debe ser un objeto {categoría: [extensiones]}")
+    return table
+
+
+EXTENSION_TO_CATEGORY = build_category_index(EXTENSION_CATEGORIES)
+
 SIZE_CATEGORIES = {
     "Pequeños (<1MB)": (0, 1024 * 1024),
     "Medianos (1MB-100MB)": (1024 * 1024, 100 * 1024 * 1024),
@@ -26,16 +77,443 @@ SIZE_CATEGORIES = {
     "Muy grandes (>1GB)": (1024 * 1024 * 1024, float('inf')),
 }
 
+DEFAULT_EXCLUDED_DIRS = [
+    ".git", ".svn", ".hg", "node_modules", "__pycache__",
+    ".snapshot", ".snapshots", ".Trash-*", "$RECYCLE.BIN", "@eaDir",
+    ".papelera_duplicados",
+]
+
+
+class TokenBucket:
+    """Cubeta de tokens segura entre hilos. Con rate=None no limita nada."""
+    
+    def __init__(self, rate: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.rate = None
+        self.capacity = 0.0
+        self.tokens = 0.0
+        self.last = time.monotonic()
+        self.set_rate(rate)
+    
+    def set_rate(self, rate: Optional[float]):
+        """Cambia el límite en caliente; la ráfaga permitida es un segundo de tasa."""
+        with self._lock:
+            self._refill()
+            self.rate = rate if rate and rate > 0 else None
+            self.capacity = float(self.rate or 0)
+            self.tokens = min(self.tokens, self.capacity)
+    
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+    
+    def consume(self, amount: float = 1):
+        """Descuenta tokens y espera mientras el saldo sea negativo."""
+        with self._lock:
+            if self.rate is None:
+                return
+            self._refill()
+            self.tokens -= amount
+        
+        while True:
+            with self._lock:
+                if self.rate is None:
+                    return
+                self._refill()
+                if self.tokens >= 0:
+                    return
+                wait = -self.tokens / self.rate
+            # Se duerme en tramos cortos para aplicar cambios de límite en caliente
+            time.sleep(min(wait, 0.25))
+
+
+class IOThrottle:
+    """Límite de ancho de banda (bytes/s) y de operaciones (archivos/s) compartido."""
+    
+    def __init__(self):
+        self.bandwidth = TokenBucket()
+        self.operations = TokenBucket()
+    
+    def set_limits(self, bytes_per_second: Optional[float] = None, files_per_second: Optional[float] = None):
+        self.bandwidth.set_rate(bytes_per_second)
+        self.operations.set_rate(files_per_second)
+    
+    def consume_bytes(self, amount: int):
+        self.bandwidth.consume(amount)
+    
+    def consume_operation(self):
+        self.operations.consume(1)
+
+
+IOPRIO_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+
+_IOPRIO_SET_SYSCALL = {"x86_64": 251, "i386": 289, "i686": 289, "aarch64": 30, "armv7l": 314}
+
+
+def set_process_priority(nice: Optional[int] = None, io_class: Optional[str] = None, io_level: int = 4,
+                         thread_only: bool = False) -> bool:
+    """
+    Ajusta nice e ionice de todos los hilos del proceso (en Linux ambos son
+    por hilo; los hilos creados después los heredan). Con thread_only solo
+    cambia el hilo actual, lo que solo es posible en Linux. Devuelve False si algo falla.
+    """
+    thread_ids = [0]
+    if thread_only:
+        if not os.path.isdir("/proc/self/task"):
+            return False
+        thread_ids = [threading.get_native_id()]
+    elif os.path.isdir("/proc/self/task"):
+        thread_ids = [int(tid) for tid in os.listdir("/proc/self/task")]
+    
+    ok = True
+    if nice is not None and hasattr(os, "setpriority"):
+        for tid in thread_ids:
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, nice)
+            except OSError:
+                ok = False
+    
+    if io_class is not None:
+        syscall_number = _IOPRIO_SET_SYSCALL.get(platform.machine())
+        if syscall_number is None or io_class not in IOPRIO_CLASSES:
+            return False
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+        except OSError:
+            return False
+        level = 0 if io_class == "idle" else io_level
+        value = (IOPRIO_CLASSES[io_class] << 13) | level
+        for tid in thread_ids:
+            # ioprio_set(IOPRIO_WHO_PROCESS, tid, value)
+            if libc.syscall(syscall_number, 1, tid, value) != 0:
+                ok = False
+    
+    return ok
+
+
+class IOOptions:
+    """Opciones de E/S compartidas por los bucles de hash, copia y movimiento."""
+    
+    def __init__(self):
+        self.drop_cache = True
+        self.memory_limit = None
+        self.drop_window = 8 * 1024 * 1024
+        self.small_file = 256 * 1024
+        self.throttle = IOThrottle()
+
+
+io_options = IOOptions()
+
+
+# Las opciones de E/S son de todo el proceso: se cambian con funciones de módulo,
+# no desde un FileOrganizer, porque afectan a todos los organizadores a la vez
+def set_cache_friendly(enabled: bool) -> None:
+    """Libera de la caché de páginas lo que ya se ha leído o copiado."""
+    io_options.drop_cache = enabled
+
+
+def set_io_memory_limit(limit: Optional[int]) -> None:
+    """Limita el tamaño de los búferes de lectura (None = automático)."""
+    io_options.memory_limit = limit if limit else None
+
+
+def set_io_limits(bytes_per_second: Optional[float] = None, files_per_second: Optional[float] = None) -> None:
+    """Limita el ancho de banda y las operaciones por segundo; se puede cambiar en marcha."""
+    io_options.throttle.set_limits(bytes_per_second, files_per_second)
+
+
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
 
-def get_file_hash(file_path: Path, chunk_size: int = 8192) -> str:
+
+def _fadvise(fd: int, offset: int, length: int, advice_name: str):
+    if _HAS_FADVISE:
+        try:
+            os.posix_fadvise(fd, offset, length, getattr(os, advice_name))
+        except OSError:
+            pass
+
+
+def choose_chunk_size(size: int, device: int = None) -> int:
+    """Tamaño de bloque según el tamaño del archivo y el tipo de dispositivo."""
+    if size <= 1024 * 1024:
+        chunk = 64 * 1024
+    elif size <= 64 * 1024 * 1024:
+        chunk = 1024 * 1024
+    else:
+        chunk = 4 * 1024 * 1024
+    
+    # En discos rotacionales, bloques grandes reducen los saltos del cabezal
+    if device is not None and size > 64 * 1024 * 1024 and _device_probe.is_rotational(device):
+        chunk = 8 * 1024 * 1024
+    
+    if io_options.memory_limit:
+        chunk = min(chunk, io_options.memory_limit)
+    return max(chunk, 4096)
+
+
+def _stream_file(f, size: int, device: int, chunk_size: int = None) -> Iterator[memoryview]:
+    """
+    Lee un archivo en bloques declarando acceso secuencial y liberando la caché
+    ya leída. El búfer se reutiliza: cada bloque debe consumirse antes del siguiente.
+    """
+    fd = f.fileno()
+    chunk_size = chunk_size or choose_chunk_size(size, device)
+    drop = io_options.drop_cache and size >= io_options.small_file
+    if drop:
+        _fadvise(fd, 0, 0, "POSIX_FADV_SEQUENTIAL")
+    
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    offset = 0
+    dropped = 0
+    while True:
+        read = f.readinto(buffer)
+        if not read:
+            break
+        io_options.throttle.consume_bytes(read)
+        yield view[:read]
+        offset += read
+        if drop and offset - dropped >= io_options.drop_window:
+            _fadvise(fd, dropped, offset - dropped, "POSIX_FADV_DONTNEED")
+            dropped = offset
+    
+    if drop and offset > dropped:
+        _fadvise(fd, dropped, 0, "POSIX_FADV_DONTNEED")
+
+
+def get_file_hash(file_path: Path, chunk_size: int = None) -> str:
     """Calcula el hash MD5 de un archivo."""
     hasher = hashlib.md5()
-    with open(file_path, 'rb') as f:
-        while chunk := f.read(chunk_size):
+    io_options.throttle.consume_operation()
+    with open(file_path, 'rb', buffering=0) as f:
+        st = os.fstat(f.fileno())
+        for chunk in _stream_file(f, st.st_size, st.st_dev, chunk_size):
             hasher.update(chunk)
     return hasher.hexdigest()
 
 
+PARTIAL_HASH_SAMPLE = 64 * 1024
+
+
+def get_partial_hash(file_path: Path, size: int) -> str:
+    """MD5 del primer y último bloque de 64 KB: descarta rápido archivos distintos del mismo tamaño."""
+    hasher = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        hasher.update(f.read(PARTIAL_HASH_SAMPLE))
+        if size > 2 * PARTIAL_HASH_SAMPLE:
+            f.seek(size - PARTIAL_HASH_SAMPLE)
+        hasher.update(f.read(PARTIAL_HASH_SAMPLE))
+    return hasher.hexdigest()
+
+
+def copy_file(source, destination, chunk_size: int = None):
+    """
+    Copia contenido y metadatos como shutil.copy2, pero declarando acceso
+    secuencial y descartando de la caché las páginas ya copiadas.
+    """
+    with open(source, 'rb', buffering=0) as fsrc, open(destination, 'wb', buffering=0) as fdst:
+        st = os.fstat(fsrc.fileno())
+        out_fd = fdst.fileno()
+        written = 0
+        flushed = 0
+        for chunk in _stream_file(fsrc, st.st_size, st.st_dev, chunk_size):
+            while chunk:
+                n = os.write(out_fd, chunk)
+                chunk = chunk[n:]
+                written += n
+            # DONTNEED sobre el destino inicia la escritura y libera lo ya escrito
+            if io_options.drop_cache and written - flushed >= io_options.drop_window:
+                _fadvise(out_fd, 0, written, "POSIX_FADV_DONTNEED")
+                flushed = written
+        if io_options.drop_cache and st.st_size >= io_options.small_file:
+            _fadvise(out_fd, 0, 0, "POSIX_FADV_DONTNEED")
+    shutil.copystat(source, destination)
+    return destination
+
+
+FICLONE = 0x40049409
+
+
+def _clone_file(src_fd: int, dst_fd: int) -> bool:
+    """Intenta una copia por referencia del kernel (reflink en btrfs/XFS); no mueve datos."""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError:
+        return False
+
+
+def copy_file_verified(source, destination, chunk_size: int = None) -> str:
+    """
+    Copia calculando el MD5 del origen en la misma lectura y comprueba después el
+    destino leído desde disco. Si el kernel puede clonar el archivo se confía en
+    el clon y solo se lee el origen. Devuelve el hash; si no coincide borra el
+    destino y lanza OSError.
+    """
+    source_hasher = hashlib.md5()
+    with open(source, 'rb', buffering=0) as fsrc, open(destination, 'wb', buffering=0) as fdst:
+        st = os.fstat(fsrc.fileno())
+        out_fd = fdst.fileno()
+        cloned = _clone_file(fsrc.fileno(), out_fd)
+        for chunk in _stream_file(fsrc, st.st_size, st.st_dev, chunk_size):
+            source_hasher.update(chunk)
+            while not cloned and chunk:
+                n = os.write(out_fd, chunk)
+                chunk = chunk[n:]
+        if not cloned:
+            # Sin esto la comprobación leería la caché en lugar del disco
+            if hasattr(os, "fdatasync"):
+                os.fdatasync(out_fd)
+            else:
+                os.fsync(out_fd)
+            _fadvise(out_fd, 0, 0, "POSIX_FADV_DONTNEED")
+    shutil.copystat(source, destination)
+    
+    source_hash = source_hasher.hexdigest()
+    if not cloned and get_file_hash(Path(destination), chunk_size) != source_hash:
+        os.unlink(destination)
+        raise OSError(f"la copia de {source} no coincide con el original")
+    return source_hash
+
+
+def _write_all(fd: int, chunk) -> None:
+    while chunk:
+        n = os.write(fd, chunk)
+        chunk = chunk[n:]
+
+
+def copy_file_fanout(source, destinations: List[str], chunk_size: int = None, compute_hash: bool = False,
+                     verify: bool = False, executor: ThreadPoolExecutor = None) -> Tuple[Optional[str], Dict[str, Exception]]:
+    """
+    Lee el origen una sola vez y escribe cada bloque en todos los destinos a la
+    vez. Un destino que falla se abandona sin afectar a los demás. Devuelve el
+    MD5 (si compute_hash o verify) y los errores por destino; con verify se
+    relee cada destino desde disco y se borra si no coincide.
+    """
+    hasher = hashlib.md5() if compute_hash or verify else None
+    errors = {}
+    outputs = {}
+    try:
+        with open(source, 'rb', buffering=0) as fsrc:
+            for destination in destinations:
+                try:
+                    outputs[destination] = open(destination, 'wb', buffering=0)
+                except OSError as e:
+                    errors[destination] = e
+            
+            st = os.fstat(fsrc.fileno())
+            for chunk in _stream_file(fsrc, st.st_size, st.st_dev, chunk_size):
+                live = [d for d in outputs if d not in errors]
+                if not live:
+                    break
+                if executor is not None and len(live) > 1 and len(chunk) >= io_options.small_file:
+                    # os.write libera el GIL: los destinos se escriben en paralelo mientras se calcula el hash
+                    futures = {d: executor.submit(_write_all, outputs[d].fileno(), chunk) for d in live}
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    for destination, future in futures.items():
+                        try:
+                            future.result()
+                        except OSError as e:
+                            errors[destination] = e
+                else:
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    for destination in live:
+                        try:
+                            _write_all(outputs[destination].fileno(), chunk)
+                        except OSError as e:
+                            errors[destination] = e
+            
+            if verify:
+                for destination, output in outputs.items():
+                    if destination not in errors:
+                        try:
+                            if hasattr(os, "fdatasync"):
+                                os.fdatasync(output.fileno())
+                            else:
+                                os.fsync(output.fileno())
+                        except OSError as e:
+                            errors[destination] = e
+                            continue
+                        _fadvise(output.fileno(), 0, 0, "POSIX_FADV_DONTNEED")
+    except Exception:
+        # El fallo está en el origen: ninguna copia quedó completa
+        for destination, output in outputs.items():
+            output.close()
+            try:
+                os.unlink(destination)
+            except OSError:
+                pass
+        raise
+    finally:
+        for output in outputs.values():
+            output.close()
+    
+    file_hash = hasher.hexdigest() if hasher is not None else None
+    for destination in destinations:
+        if destination in errors:
+            if destination in outputs and os.path.exists(destination):
+                os.unlink(destination)
+            continue
+        shutil.copystat(source, destination)
+        if verify and get_file_hash(Path(destination), chunk_size) != file_hash:
+            os.unlink(destination)
+            errors[destination] = OSError(f"la copia de {source} no coincide con el original")
+    return file_hash, errors
+
+
+def sync_filesystem(path) -> bool:
+    """Vuelca a disco el sistema de archivos que contiene path con syncfs (solo Linux)."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except (OSError, TypeError):
+        return False
+    if not hasattr(libc, "syncfs"):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return libc.syncfs(fd) == 0
+    finally:
+        os.close(fd)
+
+
+def _fsync_path(path, directory: bool = False):
+    if directory and os.name == "nt":
+        return  # En Windows no se pueden abrir carpetas
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_paths(paths: List[Path]):
+    """
+    Hace duraderos los archivos indicados con un solo syncfs por sistema de
+    archivos. Sin syncfs, fsync de cada archivo y de su carpeta. Lanza OSError si falla.
+    """
+    by_device = {}
+    for path in paths:
+        by_device.setdefault(os.stat(path).st_dev, []).append(path)
+    
+    for device_paths in by_device.values():
+        if sync_filesystem(device_paths[0]):
+            continue
+        folders = set()
+        for path in device_paths:
+            _fsync_path(path)
+            folders.add(path.parent)
+        for folder in folders:
+            _fsync_path(folder, directory=True)
+
+
 def get_size_category(size: int) -> str:
     """Retorna la categoría de tamaño para un archivo."""
     for category, (min_size, max_size) in SIZE_CATEGORIES.items():
@@ -44,15 +522,415 @@ def get_size_category(size: int) -> str:
     return "Desconocido"
 
 
+def get_extension(name: str) -> str:
+    """Extrae la extensión en minúsculas de un nombre (igual que Path.suffix)."""
+    dot = name.rfind('.')
+    if 0 < dot < len(name) - 1:
+        return name[dot:].lower()
+    return ""
+
+
+def split_patterns(text: str) -> List[str]:
+    """
+    Separa patrones por comas. Una coma dentro de {}, () o [] de un patrón re:
+    pertenece a la expresión (por ejemplo re:\\d{1,3}).
+    """
+    patterns = []
+    for piece in text.split(','):
+        if patterns and patterns[-1].lstrip().startswith('re:') and _unclosed(patterns[-1]):
+            patterns[-1] += ',' + piece
+        else:
+            patterns.append(piece)
+    return patterns
+
+
+def _unclosed(regex: str) -> bool:
+    depth = 0
+    escaped = False
+    for c in regex:
+        if escaped:
+            escaped = False
+        elif c == '\\':
+            escaped = True
+        elif c in '{([':
+            depth += 1
+        elif c in '})]':
+            depth -= 1
+    return depth > 0
+
+
+class PatternSet:
+    """Patrones que no se pueden unir en una sola regex; se prueban uno a uno."""
+    
+    def __init__(self, patterns: List[re.Pattern]):
+        self.patterns = patterns
+    
+    def search(self, name: str):
+        for pattern in self.patterns:
+            found = pattern.search(name)
+            if found:
+                return found
+        return None
+
+
+def compile_patterns(patterns: Union[str, List[str], None], exact: bool = False) -> Union[re.Pattern, PatternSet, None]:
+    """
+    Compila patrones (texto, glob como *.bak o regex con prefijo re:) en una
+    única expresión regular sin distinción de mayúsculas. Con exact=True el
+    texto simple debe coincidir con el nombre completo. Si las regex no se
+    pueden combinar (referencias numeradas, grupos repetidos, flags en medio),
+    se devuelve un PatternSet.
+    """
+    if isinstance(patterns, str):
+        patterns = split_patterns(patterns)
+    
+    parts = []
+    regexes = []
+    combinable = True
+    for pattern in patterns or []:
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        if pattern.startswith('re:'):
+            regex = pattern[3:]
+            try:
+                re.compile(regex, re.IGNORECASE)
+            except re.error:
+                regex = re.escape(regex)
+            # Dentro de una alternativa, \\1 apuntaría a otro grupo
+            if re.search(r'\\[1-9]', regex):
+                combinable = False
+            parts.append(f"(?:{regex})")
+            regexes.append(regex)
+        elif any(c in pattern for c in '*?['):
+            parts.append(rf"(?:\A{fnmatch.translate(pattern)})")
+            regexes.append(parts[-1])
+        elif exact:
+            parts.append(rf"(?:\A{re.escape(pattern)}\Z)")
+            regexes.append(parts[-1])
+        else:
+            parts.append(re.escape(pattern))
+            regexes.append(parts[-1])
+    
+    if not parts:
+        return None
+    if combinable:
+        try:
+            return re.compile('|'.join(parts), re.IGNORECASE)
+        except re.error:
+            pass
+    return PatternSet([re.compile(regex, re.IGNORECASE) for regex in regexes])
+
+
+class FileFilter:
+    """
+    Filtros compilados una sola vez. Nombre y extensión se comprueban sobre la
+    entrada del directorio, antes de cualquier stat; tamaño y fecha después.
+    """
+    
+    def __init__(self, extensions: List[str] = None, include=None, exclude=None,
+                 min_size: int = 0, max_size: float = float('inf'),
+                 min_date: Optional[datetime] = None, max_date: Optional[datetime] = None,
+                 exclude_dirs=None):
+        self.extensions = frozenset(ext.lower() for ext in extensions) if extensions else None
+        self.include = compile_patterns(include)
+        self.exclude = compile_patterns(exclude)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.min_mtime = min_date.timestamp() if min_date else None
+        self.max_mtime = max_date.timestamp() if max_date else None
+        self.exclude_dirs = compile_patterns(exclude_dirs, exact=True)
+    
+    def match_dir(self, name: str) -> bool:
+        return self.exclude_dirs is None or not self.exclude_dirs.search(name)
+    
+    def match_name(self, name: str) -> bool:
+        if self.extensions is not None and get_extension(name) not in self.extensions:
+            return False
+        
+        if self.include is not None and not self.include.search(name):
+            return False
+        
+        if self.exclude is not None and self.exclude.search(name):
+            return False
+        
+        return True
+    
+    def match_stat(self, size: int, mtime: float) -> bool:
+        if not (self.min_size <= size <= self.max_size):
+            return False
+        
+        if self.min_mtime is not None and mtime < self.min_mtime:
+            return False
+        
+        if self.max_mtime is not None and mtime > self.max_mtime:
+            return False
+        
+        return True
+    
+    def matches(self, file_info: "FileInfo") -> bool:
+        return (self.match_name(file_info.name) and
+                self.match_stat(file_info.size, file_info.modified_date.timestamp()))
+
+
+class IOScheduler:
+    """
+    Ordena las lecturas por posición física en discos rotacionales: primer
+    extent vía FIEMAP si está disponible, o el número de inodo como aproximación.
+    En SSD y dispositivos desconocidos mantiene el orden original.
+    """
+    
+    FS_IOC_FIEMAP = 0xC020660B
+    FIEMAP_HEADER = struct.Struct("=QQLLLL")
+    FIEMAP_EXTENT = struct.Struct("=QQQQQLLLL")
+    
+    def __init__(self, use_fiemap: bool = True):
+        self.use_fiemap = use_fiemap and fcntl is not None
+        self._rotational = {}
+    
+    def is_rotational(self, device: int) -> bool:
+        """Consulta /sys/block/*/queue/rotational para el dispositivo indicado."""
+        if device in self._rotational:
+            return self._rotational[device]
+        
+        rotational = False
+        try:
+            block = os.path.realpath(f"/sys/dev/block/{os.major(device)}:{os.minor(device)}")
+            # Las particiones no tienen queue/, se consulta el disco padre
+            for folder in (block, os.path.dirname(block)):
+                flag_file = os.path.join(folder, "queue", "rotational")
+                if os.path.exists(flag_file):
+                    with open(flag_file, 'r') as f:
+                        rotational = f.read().strip() == "1"
+                    break
+        except (OSError, AttributeError, ValueError):
+            rotational = False
+        
+        self._rotational[device] = rotational
+        return rotational
+    
+    def physical_offset(self, path, inode: int) -> int:
+        """Posición física del primer extent del archivo, o el inodo si no se puede obtener."""
+        if not self.use_fiemap:
+            return inode
+        
+        buffer = bytearray(self.FIEMAP_HEADER.size + self.FIEMAP_EXTENT.size)
+        self.FIEMAP_HEADER.pack_into(buffer, 0, 0, 0xFFFFFFFFFFFFFFFF, 0, 0, 1, 0)
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                fcntl.ioctl(fd, self.FS_IOC_FIEMAP, buffer)
+            finally:
+                os.close(fd)
+        except OSError:
+            return inode
+        
+        mapped = self.FIEMAP_HEADER.unpack_from(buffer, 0)[3]
+        if not mapped:
+            return inode
+        return self.FIEMAP_EXTENT.unpack_from(buffer, self.FIEMAP_HEADER.size)[1]
+    
+    def order(self, items: list, location=None) -> list:
+        """
+        Devuelve los elementos en orden de lectura. location(item) debe devolver
+        (ruta, dispositivo, inodo); por defecto usa item.path, item.device e item.inode.
+        """
+        if location is None:
+            location = lambda item: (item.path, item.device, item.inode)
+        
+        keyed = []
+        reorder = False
+        for position, item in enumerate(items):
+            path, device, inode = location(item)
+            if self.is_rotational(device):
+                reorder = True
+                keyed.append(((device, self.physical_offset(path, inode)), item))
+            else:
+                keyed.append(((device, position), item))
+        
+        if not reorder:
+            return list(items)
+        keyed.sort(key=lambda pair: pair[0])
+        return [item for _, item in keyed]
+
+
+_device_probe = IOScheduler(use_fiemap=False)
+
+DATE_GRANULARITY_FORMATS = {"year": "%Y", "month": "%Y/%m", "day": "%Y/%m/%d"}
+
+EXIF_EXTENSIONS = {".jpg", ".jpeg", ".tif", ".tiff", ".dng", ".nef", ".cr2", ".arw", ".raw"}
+MP4_EXTENSIONS = {".mp4", ".mov", ".m4v", ".3gp"}
+CAPTURE_DATE_EXTENSIONS = EXIF_EXTENSIONS | MP4_EXTENSIONS
+
+METADATA_HEADER_LIMIT = 256 * 1024
+QUICKTIME_EPOCH_OFFSET = 2082844800
+
+
+def _parse_exif_datetime(raw: bytes) -> Optional[datetime]:
+    value = raw.rstrip(b"\0 ")
+    # strptime acepta campos de una cifra: una fecha cortada daría una hora equivocada
+    if len(value) != 19:
+        return None
+    try:
+        return datetime.strptime(value.decode("ascii"), "%Y:%m:%d %H:%M:%S")
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+def _read_tiff_capture_date(data: bytes) -> Optional[datetime]:
+    """Busca DateTimeOriginal (o DateTime) en una cabecera TIFF/EXIF ya leída."""
+    if data[:2] == b"II":
+        endian = "<"
+    elif data[:2] == b"MM":
+        endian = ">"
+    else:
+        return None
+    if len(data) < 8 or struct.unpack_from(endian + "H", data, 2)[0] != 42:
+        return None
+    
+    def read_ifd(offset: int) -> dict:
+        entries = {}
+        if offset + 2 > len(data):
+            return entries
+        count = struct.unpack_from(endian + "H", data, offset)[0]
+        for i in range(count):
+            pos = offset + 2 + 12 * i
+            if pos + 12 > len(data):
+                break
+            tag, kind, size = struct.unpack_from(endian + "HHI", data, pos)
+            entries[tag] = (kind, size, data[pos + 8:pos + 12])
+        return entries
+    
+    def ascii_value(entry) -> bytes:
+        kind, size, raw = entry
+        if kind != 2:
+            return b""
+        if size <= 4:
+            return raw[:size]
+        offset = struct.unpack(endian + "I", raw)[0]
+        return data[offset:offset + size]
+    
+    ifd0 = read_ifd(struct.unpack_from(endian + "I", data, 4)[0])
+    if 0x8769 in ifd0:
+        exif = read_ifd(struct.unpack(endian + "I", ifd0[0x8769][2])[0])
+        for tag in (0x9003, 0x9004):
+            if tag in exif:
+                date = _parse_exif_datetime(ascii_value(exif[tag]))
+                if date:
+                    return date
+    if 0x0132 in ifd0:
+        return _parse_exif_datetime(ascii_value(ifd0[0x0132]))
+    return None
+
+
+def _read_jpeg_capture_date(data: bytes) -> Optional[datetime]:
+    """Recorre los segmentos JPEG de la cabecera hasta el bloque APP1 Exif."""
+    if data[:2] != b"\xff\xd8":
+        return None
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in (0xD9, 0xDA):
+            break
+        length = struct.unpack_from(">H", data, pos + 2)[0]
+        if marker == 0xE1 and data[pos + 4:pos + 10] == b"Exif\0\0":
+            return _read_tiff_capture_date(data[pos + 10:pos + 2 + length])
+        pos += 2 + length
+    return None
+
+
+def _read_mp4_creation_date(f) -> Optional[datetime]:
+    """Lee creation_time del átomo mvhd leyendo solo cabeceras de átomos."""
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    
+    def boxes(start: int, stop: int):
+        pos = start
+        for _ in range(256):
+            if pos + 8 > stop:
+                return
+            f.seek(pos)
+            header = f.read(16)
+            if len(header) < 8:
+                return
+            size, kind = struct.unpack(">I4s", header[:8])
+            header_size = 8
+            if size == 1 and len(header) == 16:
+                size = struct.unpack(">Q", header[8:16])[0]
+                header_size = 16
+            elif size == 0:
+                size = stop - pos
+            if size < header_size:
+                return
+            yield kind, pos + header_size, pos + size
+            pos += size
+    
+    for kind, body, stop in boxes(0, end):
+        if kind != b"moov":
+            continue
+        for child, child_body, _ in boxes(body, stop):
+            if child == b"mvhd":
+                f.seek(child_body)
+                data = f.read(12)
+                if len(data) < 8:
+                    return None
+                if data[0] == 1:
+                    created = struct.unpack(">Q", data[4:12])[0] if len(data) == 12 else 0
+                else:
+                    created = struct.unpack(">I", data[4:8])[0]
+                if created <= QUICKTIME_EPOCH_OFFSET:
+                    return None
+                try:
+                    return datetime.fromtimestamp(created - QUICKTIME_EPOCH_OFFSET)
+                except (OverflowError, OSError, ValueError):
+                    return None
+        return None
+    return None
+
+
+def read_capture_date(path: Path) -> Optional[datetime]:
+    """
+    Fecha de captura leída de una cabecera acotada, sin decodificadores
+    externos: EXIF DateTimeOriginal en JPEG/TIFF/RAW o mvhd en MP4/MOV.
+    """
+    extension = path.suffix.lower()
+    try:
+        with open(path, 'rb') as f:
+            if extension in MP4_EXTENSIONS:
+                return _read_mp4_creation_date(f)
+            data = f.read(METADATA_HEADER_LIMIT)
+    except OSError:
+        return None
+    
+    try:
+        if data[:2] == b"\xff\xd8":
+            return _read_jpeg_capture_date(data)
+        return _read_tiff_capture_date(data)
+    except struct.error:
+        return None
+
+
 class FileInfo:
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, stat_result: os.stat_result = None):
+        if stat_result is None:
+            stat_result = path.stat()
         self.path = path
         self.name = path.name
         self.extension = path.suffix.lower()
-        self.size = path.stat().st_size
-        self.modified_date = datetime.fromtimestamp(path.stat().st_mtime)
+        self.size = stat_result.st_size
+        self.inode = stat_result.st_ino
+        self.device = stat_result.st_dev
+        self.modified_date = datetime.fromtimestamp(stat_result.st_mtime)
         self.size_category = get_size_category(self.size)
+        self.capture_date = None
+        self._capture_checked = False
         self._hash = None
+        self.root = None
     
     @property
     def hash(self) -> str:
@@ -84,6 +962,9 @@ class FileInfo:
         }
 
 
+UNDOABLE_BATCH_TYPES = ("move", "duplicates")
+
+
 class OrganizationHistory:
     def __init__(self, history_file: Path = None):
         self.history_file = history_file or Path.home() / ".organizer_history.json"
@@ -110,12 +991,32 @@ class OrganizationHistory:
             "operations": []
         })
     
-    def add_to_batch(self, source: str, destination: str):
+    def add_to_batch(self, source: str, destination: str, action: str = None, file_hash: str = None,
+                     member: str = None):
         if self.batches:
-            self.batches[-1]["operations"].append({
+            operation = {
                 "source": source,
                 "destination": destination
-            })
+            }
+            if action:
+                operation["action"] = action
+            if file_hash:
+                operation["hash"] = file_hash
+            if member:
+                operation["member"] = member
+            self.batches[-1]["operations"].append(operation)
+    
+    def add_marker(self, path: str):
+        """Anota una marca de carpeta organizada creada por el lote; deshacerlo la borra."""
+        if self.batches:
+            self.batches[-1].setdefault("markers", []).append(path)
+    
+    def _remove_markers(self, batch: dict):
+        for path in batch.get("markers", []):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
     
     def finish_batch(self):
         self.save_history()
@@ -129,11 +1030,12 @@ class OrganizationHistory:
         
         last_batch = self.batches[-1]
         
-        if last_batch["type"] != "move":
-            return False, "Solo se pueden deshacer operaciones de mover"
+        if last_batch["type"] not in UNDOABLE_BATCH_TYPES:
+            return False, "Solo se pueden deshacer operaciones de mover o de limpieza de duplicados"
         
         operations = last_batch["operations"]
         if not operations:
+            self._remove_markers(last_batch)
             self.batches.pop()
             self.save_history()
             return False, "El lote está vacío"
@@ -141,6 +1043,8 @@ class OrganizationHistory:
         restored = 0
         errors = 0
         total = len(operations)
+        packs = {}
+        pack_indexes = {}
         
         for i, op in enumerate(reversed(operations)):
             try:
@@ -149,7 +1053,18 @@ class OrganizationHistory:
                 
                 if destination.exists():
                     source.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(destination), str(source))
+                    if op.get("action") == "packed":
+                        # El índice de cada paquete se lee una sola vez para todo el lote
+                        members = pack_indexes.get(str(destination))
+                        if members is None:
+                            members = pack_indexes[str(destination)] = load_pack_index(destination)
+                        extract_packed_file(destination, op["member"], source, members)
+                        packs.setdefault(str(destination), []).append(True)
+                    elif op.get("action") == "removed":
+                        # El origen se borró por ser idéntico a un archivo que ya estaba en el destino
+                        copy_file(str(destination), str(source))
+                    else:
+                        shutil.move(str(destination), str(source))
                     restored += 1
                 else:
                     errors += 1
@@ -158,7 +1073,18 @@ class OrganizationHistory:
                     progress_callback(i + 1, total)
             except Exception:
                 errors += 1
+                if op.get("action") == "packed":
+                    packs.setdefault(op["destination"], []).append(False)
         
+        # Los paquetes creados por el lote se borran si todos sus archivos se restauraron
+        for archive, results in packs.items():
+            if all(results):
+                for path in (archive, f"{archive}.json"):
+                    if os.path.exists(path):
+                        os.unlink(path)
+        
+        # Sin la marca, las carpetas vuelven a recorrerse al organizar
+        self._remove_markers(last_batch)
         self.batches.pop()
         self.save_history()
         
@@ -171,11 +1097,298 @@ class OrganizationHistory:
         self.save_history()
 
 
-class DuplicateFinder:
+class CachedStat:
+    """Resultado de stat reconstruido a partir del índice de escaneo."""
+    __slots__ = ("st_size", "st_mtime_ns", "st_ino", "st_dev")
+    
+    def __init__(self, size: int, mtime_ns: int, ino: int = 0, dev: int = 0):
+        self.st_size = size
+        self.st_mtime_ns = mtime_ns
+        self.st_ino = ino
+        self.st_dev = dev
+    
+    @property
+    def st_mtime(self) -> float:
+        return self.st_mtime_ns / 1e9
+
+
+class IndexedEntry:
+    """Entrada de archivo de una carpeta sin cambios, listada desde el índice."""
+    __slots__ = ("path", "name", "_stat")
+    
+    def __init__(self, folder: str, name: str, stat_result):
+        self.path = os.path.join(folder, name)
+        self.name = name
+        self._stat = stat_result
+    
+    def stat(self):
+        return self._stat
+
+
+class ScanDelta:
+    """Cambios detectados entre dos escaneos incrementales."""
+    
     def __init__(self):
+        self.added = []
+        self.modified = []
+        self.removed = []
+    
+    @property
+    def changed(self) -> List["FileInfo"]:
+        """Archivos nuevos o modificados, listos para organize() o DuplicateFinder."""
+        return self.added + self.modified
+    
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.removed)
+    
+    def to_dict(self) -> dict:
+        return {
+            "added": [str(f.path) for f in self.added],
+            "modified": [str(f.path) for f in self.modified],
+            "removed": list(self.removed)
+        }
+
+
+class ScanIndex:
+    """
+    Instantánea persistente por carpeta (mtime_ns, número de entradas, hijos)
+    que permite volver a listar solo las carpetas que cambiaron.
+    """
+    
+    # Carpetas modificadas hace menos de esto no se dan por buenas la próxima vez
+    RACY_WINDOW_NS = 2 * 10**9
+    METADATA_KEYS = ("hash", "capture")
+    
+    def __init__(self, index_file: Path = None):
+        self.index_file = index_file or Path.home() / ".organizer_scan_index.json"
+        self.roots = {}
+        self.load_index()
+    
+    def load_index(self):
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.roots = json.load(f)
+            except:
+                self.roots = {}
+    
+    def save_index(self):
+        tmp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.roots, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, self.index_file)
+    
+    def get_snapshot(self, root: Path, follow_symlinks: bool = False) -> dict:
+        snapshot = self.roots.get(str(root))
+        if not snapshot or snapshot.get("follow_symlinks") != follow_symlinks:
+            return {}
+        return snapshot["dirs"]
+    
+    def set_snapshot(self, root: Path, dirs: dict, follow_symlinks: bool = False):
+        self.roots[str(root)] = {"follow_symlinks": follow_symlinks, "dirs": dirs}
+    
+    def lookup(self, path: str) -> Optional[dict]:
+        """Devuelve el registro guardado de un archivo, si existe."""
+        folder, name = os.path.split(path)
+        for snapshot in list(self.roots.values()):
+            folder_record = snapshot["dirs"].get(folder)
+            if folder_record is not None:
+                return folder_record["files"].get(name)
+        return None
+    
+    def valid_record(self, path: str, stat_result) -> Optional[dict]:
+        """El registro del archivo solo si tamaño y fecha de modificación siguen coincidiendo."""
+        record = self.lookup(path)
+        if (record is None or record["size"] != stat_result.st_size
+                or record["mtime_ns"] != stat_result.st_mtime_ns):
+            return None
+        return record
+    
+    def record_metadata(self, files: List["FileInfo"]):
+        """Guarda hashes y fechas de captura ya calculados para no repetirlos en el siguiente escaneo."""
+        for file_info in files:
+            if file_info._hash is None and not file_info._capture_checked:
+                continue
+            record = self.lookup(str(file_info.path))
+            if record is None or record["size"] != file_info.size:
+                continue
+            if file_info._hash is not None:
+                record["hash"] = file_info._hash
+            if file_info._capture_checked:
+                record["capture"] = file_info.capture_date.isoformat() if file_info.capture_date else ""
+    
+    def record_hash(self, path: str, file_hash: str):
+        """
+        Guarda el hash calculado al copiar un archivo. Si está dentro de una carpeta
+        indexada pero aún no tiene registro (un destino recién creado), lo añade
+        marcado como nuevo para que el siguiente escaneo lo reutilice.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        fields = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino, "hash": file_hash}
+        record = self.lookup(path)
+        if record is not None:
+            record.update(fields)
+            return
+        
+        folder, name = os.path.split(path)
+        for root, snapshot in self.roots.items():
+            if folder == root or folder.startswith(os.path.join(root, "")):
+                # mtime_ns -1: la carpeta se vuelve a listar y conserva lo anotado aquí
+                folder_record = snapshot["dirs"].setdefault(folder, {
+                    "mtime_ns": -1, "dev": st.st_dev, "count": 0, "dirs": [], "files": {}
+                })
+                folder_record["files"][name] = dict(fields, added=True)
+                return
+    
+    def clear(self):
+        self.roots = {}
+        if self.index_file.exists():
+            self.index_file.unlink()
+
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ARCHIVE_READ_SIZE = 1024 * 1024
+
+
+def archive_kind(name: str) -> Optional[str]:
+    """Devuelve 'zip', 'tar' o None según el nombre del archivo."""
+    lower = name.lower()
+    if lower.endswith(ZIP_SUFFIXES):
+        return "zip"
+    if lower.endswith(TAR_SUFFIXES):
+        return "tar"
+    return None
+
+
+class ArchiveMember(FileInfo):
+    """Archivo dentro de un zip o tar, tratado como entrada virtual sin extraerlo."""
+    
+    def __init__(self, archive: FileInfo, member: str, size: int, mtime: float, crc: Optional[int] = None,
+                 index: int = 0):
+        stat_result = CachedStat(size, int(mtime * 1e9), archive.inode, archive.device)
+        super().__init__(Path(archive.path, member.lstrip("/")), stat_result)
+        self.archive = archive
+        self.member = member
+        self.crc = crc
+        # Posición dentro del archivo: un zip o tar puede repetir nombres
+        self.index = index
+        self.root = archive.root
+    
+    @property
+    def hash(self) -> str:
+        if self._hash is None:
+            hash_archive_members(self.archive.path, [self])
+            if self._hash is None:
+                raise OSError(f"No se pudo leer {self.path}")
+        return self._hash
+
+
+def _same_content(path_a: Path, path_b: Path) -> bool:
+    """Comprueba en el momento que dos archivos son iguales: tamaño, hash parcial y después byte a byte."""
+    size = os.stat(path_a).st_size
+    if os.stat(path_b).st_size != size:
+        return False
+    if get_partial_hash(path_a, size) != get_partial_hash(path_b, size):
+        return False
+    if size <= 2 * PARTIAL_HASH_SAMPLE:
+        return True
+    return filecmp.cmp(path_a, path_b, shallow=False)
+
+
+def _hash_stream(f) -> str:
+    hasher = hashlib.md5()
+    while True:
+        chunk = f.read(ARCHIVE_READ_SIZE)
+        if not chunk:
+            break
+        io_options.throttle.consume_bytes(len(chunk))
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def iter_archive_members(file_info: FileInfo) -> Iterator[ArchiveMember]:
+    """
+    Lista los archivos de un zip o tar sin extraerlos. En zip basta el directorio
+    central; un tar comprimido debe descomprimirse entero para recorrerlo.
+    """
+    kind = archive_kind(file_info.name)
+    fallback_mtime = file_info.modified_date.timestamp()
+    try:
+        if kind == "zip":
+            with zipfile.ZipFile(file_info.path) as archive:
+                for index, info in enumerate(archive.infolist()):
+                    if info.is_dir():
+                        continue
+                    # Una fecha inválida en un miembro no descarta el archivo entero
+                    try:
+                        member = ArchiveMember(file_info, info.filename, info.file_size,
+                                               datetime(*info.date_time).timestamp(), info.CRC, index)
+                    except (ValueError, OverflowError, OSError):
+                        member = ArchiveMember(file_info, info.filename, info.file_size,
+                                               fallback_mtime, info.CRC, index)
+                    yield member
+        elif kind == "tar":
+            with tarfile.open(file_info.path, "r:*") as archive:
+                for index, info in enumerate(archive):
+                    if not info.isfile():
+                        continue
+                    try:
+                        member = ArchiveMember(file_info, info.name, info.size, info.mtime, index=index)
+                    except (ValueError, OverflowError, OSError):
+                        member = ArchiveMember(file_info, info.name, info.size, fallback_mtime, index=index)
+                    yield member
+    except (OSError, EOFError, ValueError, zipfile.BadZipFile, tarfile.TarError):
+        return
+
+
+def hash_archive_members(archive_path: Path, members: List[ArchiveMember]):
+    """
+    Calcula el MD5 de varios miembros abriendo el archivo una sola vez. Los tar
+    se recorren en orden y se detienen tras el último miembro pedido.
+    """
+    pending = {member.index: member for member in members if member._hash is None}
+    if not pending:
+        return
+    
+    io_options.throttle.consume_operation()
+    try:
+        if archive_kind(archive_path.name) == "zip":
+            with zipfile.ZipFile(archive_path) as archive:
+                infos = archive.infolist()
+                for index, member in pending.items():
+                    try:
+                        with archive.open(infos[index]) as f:
+                            member._hash = _hash_stream(f)
+                    except (OSError, RuntimeError, ValueError, IndexError, zipfile.BadZipFile):
+                        continue  # Miembro cifrado o dañado
+        else:
+            with tarfile.open(archive_path, "r:*") as archive:
+                for index, info in enumerate(archive):
+                    member = pending.pop(index, None)
+                    if member is None:
+                        continue
+                    member._hash = _hash_stream(archive.extractfile(info))
+                    if not pending:
+                        break
+    except (OSError, EOFError, ValueError, zipfile.BadZipFile, tarfile.TarError):
+        return
+
+
+class DuplicateFinder:
+    def __init__(self, scheduler: Optional[IOScheduler] = None):
         self.duplicates = {}
+        self.scheduler = scheduler
     
-    def find_duplicates(self, files: List[FileInfo], progress_callback=None) -> Dict[str, List[FileInfo]]:
+    def find_duplicates(self, files: List[FileInfo], progress_callback=None, duplicate_callback=None,
+                        cancel_event: Optional[threading.Event] = None) -> Dict[str, List[FileInfo]]:
+        """
+        duplicate_callback(hash, archivos) se llama con cada grupo en cuanto se cierra.
+        Si se activa cancel_event se deja de hashear y se devuelven los grupos ya cerrados.
+        """
         self.duplicates = {}
         
         size_groups = {}
@@ -184,31 +1397,78 @@ class DuplicateFinder:
                 size_groups[file_info.size] = []
             size_groups[file_info.size].append(file_info)
         
-        total = len([f for files in size_groups.values() if len(files) > 1 for f in files])
-        processed = 0
-        
+        candidate_groups = {}
         for size, file_list in size_groups.items():
             if len(file_list) > 1:
-                hash_groups = {}
-                for file_info in file_list:
-                    try:
-                        file_hash = file_info.hash
-                        if file_hash not in hash_groups:
-                            hash_groups[file_hash] = []
-                        hash_groups[file_hash].append(file_info)
-                        
-                        processed += 1
-                        if progress_callback:
-                            progress_callback(processed, total)
-                    except Exception:
-                        continue
-                
-                for file_hash, hash_files in hash_groups.items():
+                file_list = self._filter_by_crc(file_list)
+                if len(file_list) > 1:
+                    candidate_groups[size] = file_list
+        
+        candidates = [f for file_list in candidate_groups.values() for f in file_list]
+        if self.scheduler is not None:
+            candidates = self.scheduler.order(candidates, self._location)
+        
+        # Los miembros de un mismo archivo comprimido se leen juntos en una sola apertura
+        archive_groups = {}
+        for file_info in candidates:
+            if isinstance(file_info, ArchiveMember):
+                archive_groups.setdefault(str(file_info.archive.path), []).append(file_info)
+        
+        total = len(candidates)
+        remaining = {size: len(file_list) for size, file_list in candidate_groups.items()}
+        hash_groups = {}
+        
+        for processed, file_info in enumerate(candidates, 1):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            try:
+                if isinstance(file_info, ArchiveMember) and file_info._hash is None:
+                    archive_path = file_info.archive.path
+                    hash_archive_members(archive_path, archive_groups.pop(str(archive_path), [file_info]))
+                groups = hash_groups.setdefault(file_info.size, {})
+                groups.setdefault(file_info.hash, []).append(file_info)
+            except Exception:
+                pass
+            
+            if progress_callback:
+                progress_callback(processed, total)
+            
+            # Un grupo de tamaño se cierra en cuanto se han leído todos sus archivos
+            remaining[file_info.size] -= 1
+            if remaining[file_info.size] == 0:
+                for file_hash, hash_files in hash_groups.pop(file_info.size, {}).items():
                     if len(hash_files) > 1:
                         self.duplicates[file_hash] = hash_files
+                        if duplicate_callback:
+                            duplicate_callback(file_hash, hash_files)
         
         return self.duplicates
     
+    @staticmethod
+    def _location(file_info: FileInfo):
+        if isinstance(file_info, ArchiveMember):
+            return file_info.archive.path, file_info.device, file_info.inode
+        return file_info.path, file_info.device, file_info.inode
+    
+    @staticmethod
+    def _filter_by_crc(file_list: List[FileInfo]) -> List[FileInfo]:
+        """
+        Primera criba con el CRC que guarda el zip: un miembro solo puede coincidir
+        con otro del mismo CRC o con un archivo cuyo CRC se desconoce.
+        """
+        crc_counts = {}
+        unknown = 0
+        for file_info in file_list:
+            crc = getattr(file_info, "crc", None)
+            if crc is None:
+                unknown += 1
+            else:
+                crc_counts[crc] = crc_counts.get(crc, 0) + 1
+        
+        if not crc_counts or unknown:
+            return file_list
+        return [f for f in file_list if crc_counts[f.crc] > 1]
+    
     def get_duplicate_count(self) -> int:
         return sum(len(files) - 1 for files in self.duplicates.values())
     
@@ -220,22 +1480,1104 @@ class DuplicateFinder:
         return total
 
 
+class ExternalDuplicateFinder(DuplicateFinder):
+    """
+    Búsqueda de duplicados con memoria acotada. Los pares (tamaño, ruta) se
+    vuelcan a tramos ordenados en disco al llenar el presupuesto y se mezclan
+    después; solo se mantiene en memoria el grupo de tamaño que se está hashando.
+    """
+    
+    RECORD = struct.Struct(">QI")
+    RECORD_OVERHEAD = 120  # Coste aproximado en memoria de cada tupla (tamaño, ruta)
+    
+    def __init__(self, scheduler: Optional[IOScheduler] = None, memory_limit: int = 256 * 1024 * 1024,
+                 spill_dir: Optional[str] = None, file_factory=None, group_callback=None,
+                 keep_groups: bool = True):
+        super().__init__(scheduler)
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        # Sin keep_groups los grupos solo llegan a duplicate_callback y la memoria no crece con ellos
+        self.keep_groups = keep_groups
+        # file_factory reconstruye el FileInfo de una ruta; group_callback recibe cada grupo ya hasheado
+        self.file_factory = file_factory or (lambda path: FileInfo(Path(path)))
+        self.group_callback = group_callback
+        self.runs_written = 0
+    
+    def _write_run(self, records: List[Tuple[int, bytes]], folder: str) -> str:
+        records.sort()
+        run_path = os.path.join(folder, f"run-{self.runs_written:05d}.bin")
+        with open(run_path, 'wb') as f:
+            for size, path in records:
+                f.write(self.RECORD.pack(size, len(path)))
+                f.write(path)
+        self.runs_written += 1
+        return run_path
+    
+    def _read_run(self, run_path: str) -> Iterator[Tuple[int, bytes]]:
+        with open(run_path, 'rb', buffering=1024 * 1024) as f:
+            while True:
+                header = f.read(self.RECORD.size)
+                if not header:
+                    break
+                size, length = self.RECORD.unpack(header)
+                yield size, f.read(length)
+    
+    def find_duplicates(self, files, progress_callback=None, duplicate_callback=None,
+                        cancel_event: Optional[threading.Event] = None) -> Dict[str, List[FileInfo]]:
+        """Acepta cualquier iterable de FileInfo, por ejemplo FileOrganizer.iter_files()."""
+        self.duplicates = {}
+        self.runs_written = 0
+        
+        with tempfile.TemporaryDirectory(prefix="organizer-dups-", dir=self.spill_dir) as folder:
+            runs = []
+            records = []
+            used = 0
+            total = 0
+            for file_info in files:
+                if cancel_event is not None and cancel_event.is_set():
+                    return self.duplicates
+                path = os.fsencode(str(file_info.path))
+                records.append((file_info.size, path))
+                used += len(path) + self.RECORD_OVERHEAD
+                total += 1
+                if used >= self.memory_limit:
+                    runs.append(self._write_run(records, folder))
+                    records = []
+                    used = 0
+                if progress_callback and total % 1000 == 0:
+                    progress_callback(total, 0)
+            
+            records.sort()
+            streams = [self._read_run(run_path) for run_path in runs] + [iter(records)]
+            merged = heapq.merge(*streams)
+            
+            processed = 0
+            for size, group in itertools.groupby(merged, key=lambda record: record[0]):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                paths = [path for _, path in group]
+                processed += len(paths)
+                if len(paths) > 1:
+                    self._hash_group(size, paths, duplicate_callback, cancel_event)
+                if progress_callback:
+                    progress_callback(processed, total)
+        
+        return self.duplicates
+    
+    def _hash_group(self, size: int, paths: List[bytes], duplicate_callback=None,
+                    cancel_event: Optional[threading.Event] = None):
+        group = []
+        for path in paths:
+            try:
+                file_info = self.file_factory(os.fsdecode(path))
+            except OSError:
+                continue
+            if file_info.size == size:
+                group.append(file_info)
+        
+        if self.scheduler is not None:
+            group = self.scheduler.order(group)
+        
+        hash_groups = {}
+        for file_info in group:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            try:
+                hash_groups.setdefault(file_info.hash, []).append(file_info)
+            except Exception:
+                pass
+        
+        for file_hash, hash_files in hash_groups.items():
+            if len(hash_files) > 1:
+                if self.keep_groups:
+                    self.duplicates[file_hash] = hash_files
+                if duplicate_callback:
+                    duplicate_callback(file_hash, hash_files)
+        if self.group_callback:
+            self.group_callback(group)
+
+
+KEEP_POLICIES = ["oldest", "newest", "shortest_path", "preferred_root"]
+TRASH_FOLDER_NAME = ".papelera_duplicados"
+
+
+class DuplicateResolver:
+    """
+    Resuelve en bloque los grupos de DuplicateFinder.duplicates: elige qué copia
+    conservar según la política y elimina o manda a la papelera el resto.
+    """
+    
+    def __init__(self, duplicates: Dict[str, List[FileInfo]], policy: str = "oldest",
+                 preferred_root: Optional[Path] = None):
+        if policy not in KEEP_POLICIES:
+            raise ValueError(f"Política desconocida: {policy}")
+        self.duplicates = duplicates
+        self.policy = policy
+        self.preferred_root = Path(os.path.realpath(preferred_root)) if preferred_root else None
+        self.results = {"removed": [], "errors": [], "freed_bytes": 0}
+    
+    def choose_keeper(self, files: List[FileInfo]) -> FileInfo:
+        if self.policy == "newest":
+            return max(files, key=lambda f: f.modified_date)
+        if self.policy == "shortest_path":
+            return min(files, key=lambda f: (len(str(f.path)), str(f.path)))
+        if self.policy == "preferred_root" and self.preferred_root is not None:
+            preferred = [f for f in files
+                         if self.preferred_root in Path(os.path.realpath(f.path)).parents]
+            if preferred:
+                return min(preferred, key=lambda f: (len(str(f.path)), str(f.path)))
+        return min(files, key=lambda f: f.modified_date)
+    
+    @staticmethod
+    def _distinct_files(files: List[FileInfo]) -> List[FileInfo]:
+        """Quita enlaces simbólicos y deja una sola entrada por (st_dev, st_ino): no son copias."""
+        distinct = {}
+        for file_info in files:
+            if isinstance(file_info, ArchiveMember):
+                continue
+            try:
+                st = os.lstat(file_info.path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            distinct.setdefault((st.st_dev, st.st_ino), file_info)
+        return list(distinct.values())
+    
+    def plan(self) -> List[Tuple[FileInfo, List[FileInfo]]]:
+        """(conservado, eliminados) por grupo. Los archivos dentro de zip/tar y los enlaces nunca se tocan."""
+        resolution = []
+        for files in self.duplicates.values():
+            files = self._distinct_files(files)
+            if len(files) < 2:
+                continue
+            keeper = self.choose_keeper(files)
+            resolution.append((keeper, [f for f in files if f is not keeper]))
+        return resolution
+    
+    def _trash_path(self, file_info: FileInfo, trash_folder: Path) -> Path:
+        # Una papelera relativa se crea dentro de la carpeta de origen de cada archivo, en su mismo disco
+        if not trash_folder.is_absolute():
+            if file_info.root is None:
+                return file_info.path.parent / trash_folder / file_info.name
+            return file_info.root / trash_folder / file_info.path.relative_to(file_info.root)
+        return trash_folder / file_info.path.relative_to(file_info.path.anchor)
+    
+    @staticmethod
+    def _unchanged(file_info: FileInfo) -> Optional[os.stat_result]:
+        try:
+            st = os.lstat(file_info.path)
+        except FileNotFoundError:
+            return None
+        if (not stat.S_ISREG(st.st_mode) or st.st_size != file_info.size
+                or datetime.fromtimestamp(st.st_mtime) != file_info.modified_date):
+            return None
+        return st
+    
+    def _verify(self, keeper: FileInfo, file_info: FileInfo, trash_folder: Optional[Path]):
+        """Justo antes de tocar file_info comprueba que ambos siguen como al buscarlos; lanza ValueError si no."""
+        keeper_stat = self._unchanged(keeper)
+        if keeper_stat is None:
+            raise ValueError("el archivo conservado ha cambiado o ya no existe")
+        file_stat = self._unchanged(file_info)
+        if file_stat is None:
+            raise ValueError("el archivo ha cambiado desde la búsqueda")
+        if (keeper_stat.st_dev, keeper_stat.st_ino) == (file_stat.st_dev, file_stat.st_ino):
+            raise ValueError("es el mismo archivo que el conservado")
+        # Un borrado no se puede deshacer desde la papelera: se comparan los bytes
+        if trash_folder is None and not _same_content(keeper.path, file_info.path):
+            raise ValueError("el contenido ya no coincide con el conservado")
+    
+    def _remove(self, file_info: FileInfo, trash_folder: Optional[Path]) -> Optional[Path]:
+        if trash_folder is None:
+            os.unlink(file_info.path)
+            return None
+        
+        target = self._trash_path(file_info, trash_folder)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # rename falla con EXDEV en vez de copiar si la papelera está en otro disco
+        os.rename(file_info.path, target)
+        return target
+    
+    def resolve(self, history: OrganizationHistory, trash_folder: Optional[Path] = None,
+                workers: int = 8, progress_callback=None) -> dict:
+        """
+        Elimina (trash_folder=None) o renombra a la papelera las copias sobrantes en
+        paralelo; una papelera relativa se crea en la carpeta de origen de cada archivo. Cada operación queda en el historial: deshacer devuelve los archivos
+        de la papelera o, si se borraron, vuelve a copiar el conservado en su lugar.
+        """
+        self.results = {"removed": [], "errors": [], "freed_bytes": 0}
+        tasks = [(keeper, file_info) for keeper, removed in self.plan() for file_info in removed]
+        total = len(tasks)
+        history.start_batch("duplicates")
+        
+        def remove(task):
+            keeper, file_info = task
+            try:
+                self._verify(keeper, file_info, trash_folder)
+                return keeper, file_info, self._remove(file_info, trash_folder), None
+            except (OSError, ValueError) as e:
+                return keeper, file_info, None, e
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for processed, (keeper, file_info, target, error) in enumerate(executor.map(remove, tasks), 1):
+                if error is not None:
+                    self.results["errors"].append(f"{file_info.name}: {error}")
+                elif target is not None:
+                    history.add_to_batch(str(file_info.path), str(target))
+                else:
+                    history.add_to_batch(str(file_info.path), str(keeper.path), "removed", keeper._hash)
+                if error is None:
+                    self.results["removed"].append(str(file_info.path))
+                    self.results["freed_bytes"] += file_info.size
+                if progress_callback:
+                    progress_callback(processed, total)
+        
+        history.finish_batch()
+        return self.results
+
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+TEMPLATE_FIELDS = {"ext", "category", "year", "month", "day", "size_bucket"}
+
+
+def parse_size(text: str) -> int:
+    """Convierte '10MB', '512 KB' o '1024' en bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?B)?\s*", text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Tamaño no válido: {text}")
+    return int(float(match.group(1)) * SIZE_UNITS[(match.group(2) or "B").upper()])
+
+
+RULE_SIZE_CONDITION = re.compile(r"size(<=|>=|<|>)")
+RULE_CONDITION = re.compile(r"(?i)(\*$|\*\.[^.*?\[\]]+$|ext=|name=|re:|year=|after=|before=|size(<=|>=|<|>))")
+
+
+class DestinationRule:
+    """Regla de destino: condiciones sobre el archivo → plantilla de ruta."""
+    
+    def __init__(self, template: str, extensions: List[str] = None, pattern: str = None,
+                 min_size: int = 0, max_size: float = float('inf'),
+                 min_date: Optional[datetime] = None, max_date: Optional[datetime] = None,
+                 line: int = 0):
+        self.template = template
+        self.extensions = [ext.lower() for ext in extensions] if extensions else []
+        self.pattern = pattern
+        self.regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.min_date = min_date
+        self.max_date = max_date
+        self.line = line
+        
+        for _, field, _, _ in string.Formatter().parse(template):
+            if field is not None and field not in TEMPLATE_FIELDS:
+                raise ValueError(f"Línea {line}: campo desconocido {{{field}}} en la plantilla")
+        # Un formato inválido ({year:d}, llaves sueltas...) falla aquí y no al organizar
+        try:
+            template.format_map({field: "x" for field in TEMPLATE_FIELDS})
+        except (ValueError, KeyError, IndexError, AttributeError, TypeError) as e:
+            raise ValueError(f"Línea {line}: plantilla no válida: {e}")
+    
+    def matches(self, file_info: "FileInfo", file_date: datetime) -> bool:
+        if self.extensions and file_info.extension not in self.extensions:
+            return False
+        if self.regex is not None and not self.regex.match(file_info.name):
+            return False
+        if not (self.min_size <= file_info.size <= self.max_size):
+            return False
+        if self.min_date is not None and file_date < self.min_date:
+            return False
+        if self.max_date is not None and file_date >= self.max_date:
+            return False
+        return True
+    
+    @classmethod
+    def parse(cls, text: str, line: int = 0) -> "DestinationRule":
+        """
+        Interpreta una línea como: *.pdf size>10MB year=2023 -> Docs/{year}/{month}/large
+        Condiciones: *.ext, ext=a,b, name=<glob>, re:<regex> (puede llevar espacios), size>N, size<N,
+        year=AAAA o AAAA..AAAA, after=AAAA-MM-DD, before=AAAA-MM-DD.
+        """
+        if "->" not in text:
+            raise ValueError(f"Línea {line}: falta '->' seguido de la plantilla")
+        conditions, template = text.rsplit("->", 1)
+        template = template.strip()
+        if not template:
+            raise ValueError(f"Línea {line}: plantilla vacía")
+        
+        options = {"extensions": [], "pattern": None, "line": line}
+        for token in cls._tokens(conditions):
+            lower = token.lower()
+            ext_glob = re.fullmatch(r"\*(\.[^.*?\[\]]+)", token)
+            if token == "*":
+                continue
+            elif ext_glob:
+                options["extensions"].append(ext_glob.group(1))
+            elif lower.startswith("ext="):
+                options["extensions"] += [e if e.startswith('.') else f'.{e}' for e in token[4:].split(',') if e]
+            elif lower.startswith("name="):
+                options["pattern"] = fnmatch.translate(token[5:])
+            elif lower.startswith("re:"):
+                options["pattern"] = f"(?s:.*?)(?:{token[3:]})"
+            elif RULE_SIZE_CONDITION.match(lower):
+                match = re.fullmatch(r"size(<=|>=|<|>)(.+)", lower)
+                if not match:
+                    raise ValueError(f"Línea {line}: condición de tamaño no válida: {token}")
+                # Los límites se guardan inclusivos: size>N empieza en N+1 y size<N acaba en N-1
+                size = parse_size(match.group(2))
+                if match.group(1) == ">=":
+                    options["min_size"] = size
+                elif match.group(1) == ">":
+                    options["min_size"] = size + 1
+                elif match.group(1) == "<=":
+                    options["max_size"] = size
+                else:
+                    options["max_size"] = size - 1
+            elif lower.startswith("year="):
+                first, _, last = token[5:].partition("..")
+                options["min_date"] = datetime(int(first), 1, 1)
+                options["max_date"] = datetime(int(last or first) + 1, 1, 1)
+            elif lower.startswith("after="):
+                options["min_date"] = datetime.fromisoformat(token[6:])
+            elif lower.startswith("before="):
+                options["max_date"] = datetime.fromisoformat(token[7:])
+            elif any(c in token for c in '*?['):
+                options["pattern"] = fnmatch.translate(token)
+            else:
+                raise ValueError(f"Línea {line}: condición no reconocida: {token}")
+        
+        return cls(template, **options)
+    
+    @staticmethod
+    def _tokens(conditions: str) -> List[str]:
+        """Condiciones separadas por espacios; un re: sigue hasta la siguiente condición reconocible."""
+        tokens = []
+        for match in re.finditer(r"\S+", conditions):
+            if tokens and tokens[-1][0].lower().startswith("re:") and not RULE_CONDITION.match(match.group()):
+                tokens[-1] = (conditions[tokens[-1][1]:match.end()], tokens[-1][1])
+            else:
+                tokens.append((match.group(), match.start()))
+        return [token for token, _ in tokens]
+
+
+class RuleEngine:
+    """
+    Reglas de destino ordenadas, compiladas en cubos por extensión. Cada cubo
+    tiene una única regex combinada que localiza la primera regla cuyo patrón
+    de nombre coincide, así que evaluar cientos de reglas cuesta una búsqueda
+    en diccionario y un match por archivo.
+    """
+    
+    def __init__(self, rules: List[DestinationRule]):
+        self.rules = rules
+        
+        generic = [rule for rule in rules if not rule.extensions]
+        extensions = {ext for rule in rules for ext in rule.extensions}
+        self._generic_bucket = self._compile_bucket(generic)
+        self._buckets = {}
+        for ext in extensions:
+            bucket = [rule for rule in rules if not rule.extensions or ext in rule.extensions]
+            self._buckets[ext] = self._compile_bucket(bucket)
+    
+    @staticmethod
+    def _compile_bucket(rules: List[DestinationRule]) -> Tuple[List[DestinationRule], Optional[re.Pattern]]:
+        if not rules:
+            return rules, None
+        # Envolver las reglas renumera sus grupos: un \1 apuntaría a otro grupo
+        if any(rule.pattern and re.search(r'\\[1-9]', rule.pattern) for rule in rules):
+            return rules, None
+        alternatives = [f"(?P<r{i}>{rule.pattern or ''})" for i, rule in enumerate(rules)]
+        try:
+            combined = re.compile('|'.join(alternatives), re.IGNORECASE)
+        except re.error:
+            # Grupos con nombre repetidos u otras incompatibilidades: evaluación una a una
+            combined = None
+        return rules, combined
+    
+    def match(self, file_info: "FileInfo", file_date: datetime) -> Optional[DestinationRule]:
+        rules, combined = self._buckets.get(file_info.extension, self._generic_bucket)
+        start = 0
+        if combined is not None:
+            found = combined.match(file_info.name)
+            if found is None:
+                return None
+            start = int(found.lastgroup[1:])
+        for rule in rules[start:]:
+            if rule.matches(file_info, file_date):
+                return rule
+        return None
+    
+    @staticmethod
+    def render(rule: DestinationRule, values: dict) -> str:
+        """Rellena la plantilla sin permitir rutas absolutas ni '..'."""
+        rendered = rule.template.format_map(values)
+        parts = [part for part in re.split(r"[\\/]+", rendered) if part not in ("", ".", "..")]
+        return "/".join(parts)
+    
+    @classmethod
+    def parse(cls, text: str) -> "RuleEngine":
+        rules = []
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.strip()
+            if line and not line.startswith("#"):
+                rules.append(DestinationRule.parse(line, number))
+        return cls(rules)
+    
+    @classmethod
+    def load(cls, rules_file: Path) -> "RuleEngine":
+        with open(rules_file, 'r', encoding='utf-8') as f:
+            return cls.parse(f.read())
+
+
+class FolderAnalytics:
+    """
+    Agregación en una sola pasada: conteos y bytes por extensión, categoría,
+    tamaño, año y subcarpeta de primer nivel, más los N archivos más grandes y
+    más antiguos en montículos acotados. La memoria no depende del número de archivos.
+    """
+    
+    MAX_KEYS = 1000
+    OTHER_KEY = "(otros)"
+    
+    def __init__(self, root: Path, category_index: Dict[str, str] = None, top_n: int = 20):
+        self.root = str(root)
+        self.category_index = category_index if category_index is not None else EXTENSION_TO_CATEGORY
+        self.top_n = top_n
+        self.total_files = 0
+        self.total_bytes = 0
+        self.by_extension = {}
+        self.by_category = {}
+        self.by_size_bucket = {}
+        self.by_year = {}
+        self.by_folder = {}
+        self._largest = []
+        self._oldest = []
+        self._sequence = 0
+    
+    def _count(self, table: dict, key: str, size: int):
+        entry = table.get(key)
+        if entry is None:
+            if len(table) >= self.MAX_KEYS:
+                key = self.OTHER_KEY
+                entry = table.get(key)
+            if entry is None:
+                entry = table[key] = [0, 0]
+        entry[0] += 1
+        entry[1] += size
+    
+    def add(self, file_info: FileInfo):
+        size = file_info.size
+        self.total_files += 1
+        self.total_bytes += size
+        
+        self._count(self.by_extension, file_info.extension or "(sin extensión)", size)
+        self._count(self.by_category, self.category_index.get(file_info.extension, DEFAULT_CATEGORY), size)
+        self._count(self.by_size_bucket, file_info.size_category, size)
+        self._count(self.by_year, str(file_info.modified_date.year), size)
+        
+        relative = os.path.relpath(str(file_info.path.parent), str(file_info.root or self.root))
+        folder = "." if relative == "." else relative.split(os.sep, 1)[0]
+        self._count(self.by_folder, folder, size)
+        
+        # Min-heap de tamaños (los N mayores) y de -mtime (los N más antiguos)
+        self._sequence += 1
+        mtime = file_info.modified_date.timestamp()
+        largest = (size, self._sequence, str(file_info.path), mtime)
+        oldest = (-mtime, self._sequence, str(file_info.path), size)
+        if len(self._largest) < self.top_n:
+            heapq.heappush(self._largest, largest)
+        elif largest > self._largest[0]:
+            heapq.heapreplace(self._largest, largest)
+        if len(self._oldest) < self.top_n:
+            heapq.heappush(self._oldest, oldest)
+        elif oldest > self._oldest[0]:
+            heapq.heapreplace(self._oldest, oldest)
+    
+    @staticmethod
+    def _table(table: dict) -> List[dict]:
+        rows = [{"key": key, "count": count, "bytes": size} for key, (count, size) in table.items()]
+        rows.sort(key=lambda row: row["bytes"], reverse=True)
+        return rows
+    
+    def get_largest(self) -> List[dict]:
+        return [{"path": path, "size": size, "modified_date": datetime.fromtimestamp(mtime).isoformat()}
+                for size, _, path, mtime in sorted(self._largest, reverse=True)]
+    
+    def get_oldest(self) -> List[dict]:
+        return [{"path": path, "size": size, "modified_date": datetime.fromtimestamp(-neg_mtime).isoformat()}
+                for neg_mtime, _, path, size in sorted(self._oldest, reverse=True)]
+    
+    def to_dict(self) -> dict:
+        return {
+            "root": self.root,
+            "total_files": self.total_files,
+            "total_bytes": self.total_bytes,
+            "by_extension": self._table(self.by_extension),
+            "by_category": self._table(self.by_category),
+            "by_size_bucket": self._table(self.by_size_bucket),
+            "by_year": self._table(self.by_year),
+            "by_folder": self._table(self.by_folder),
+            "largest": self.get_largest(),
+            "oldest": self.get_oldest()
+        }
+    
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+
+EXPORT_FORMATS = ["csv", "ndjson"]
+SCAN_EXPORT_FIELDS = ["path", "name", "extension", "size", "modified_date", "size_category", "root"]
+DUPLICATE_EXPORT_FIELDS = ["hash", "copies", "group_bytes", "path", "size", "modified_date", "keep", "reclaimable_bytes"]
+HISTORY_EXPORT_FIELDS = ["batch", "timestamp", "type", "source", "destination", "action", "hash", "member"]
+
+# Presupuesto de la búsqueda de duplicados al exportar si no hay un límite configurado
+EXPORT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+
+class RowExporter:
+    """
+    Escribe filas en CSV o NDJSON a medida que llegan, sin acumularlas. El
+    formato se deduce de la extensión (.csv o cualquier otra para NDJSON) y
+    la salida se vuelca cada flush_every filas para que se pueda leer mientras crece.
+    """
+    
+    def __init__(self, output: Union[str, Path, io.TextIOBase], fields: List[str],
+                 fmt: Optional[str] = None, flush_every: int = 256):
+        if isinstance(output, (str, Path)):
+            if fmt is None:
+                fmt = "csv" if str(output).lower().endswith(".csv") else "ndjson"
+            self.stream = open(output, 'w', encoding='utf-8', newline='')
+            self._owns_stream = True
+        else:
+            self.stream = output
+            self._owns_stream = False
+        self.format = fmt or "ndjson"
+        if self.format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportación no soportado: {self.format}")
+        self.fields = fields
+        self.flush_every = flush_every
+        self.rows_written = 0
+        
+        self._writer = None
+        if self.format == "csv":
+            self._writer = csv.DictWriter(self.stream, fieldnames=fields, extrasaction='ignore')
+            self._writer.writeheader()
+            self.stream.flush()
+    
+    def write(self, row: dict):
+        if self._writer is not None:
+            self._writer.writerow(row)
+        else:
+            self.stream.write(json.dumps({key: row.get(key) for key in self.fields}, ensure_ascii=False))
+            self.stream.write("\n")
+        self.rows_written += 1
+        if self.rows_written == 1 or self.rows_written % self.flush_every == 0:
+            self.stream.flush()
+    
+    def close(self):
+        if self._owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+    
+    def __enter__(self) -> "RowExporter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def scan_row(file_info: FileInfo) -> dict:
+    return {
+        "path": str(file_info.path),
+        "name": file_info.name,
+        "extension": file_info.extension,
+        "size": file_info.size,
+        "modified_date": file_info.modified_date.isoformat(),
+        "size_category": file_info.size_category,
+        "root": str(file_info.root) if file_info.root is not None else ""
+    }
+
+
+def duplicate_rows(file_hash: str, files: List[FileInfo], keeper: Optional[FileInfo]) -> Iterator[dict]:
+    """Una fila por copia; solo las sobrantes fuera de zip/tar suman bytes recuperables."""
+    group_bytes = sum(f.size for f in files)
+    for file_info in files:
+        removable = file_info is not keeper and not isinstance(file_info, ArchiveMember)
+        yield {
+            "hash": file_hash,
+            "copies": len(files),
+            "group_bytes": group_bytes,
+            "path": str(file_info.path),
+            "size": file_info.size,
+            "modified_date": file_info.modified_date.isoformat(),
+            "keep": file_info is keeper,
+            "reclaimable_bytes": file_info.size if removable else 0
+        }
+
+
+def history_rows(batches: List[dict]) -> Iterator[dict]:
+    for number, batch in enumerate(batches, 1):
+        for op in batch["operations"]:
+            yield {
+                "batch": number,
+                "timestamp": batch["timestamp"],
+                "type": batch.get("type", ""),
+                "source": op["source"],
+                "destination": op["destination"],
+                "action": op.get("action", ""),
+                "hash": op.get("hash", ""),
+                "member": op.get("member", "")
+            }
+
+
+# Tabla gear de FastCDC: 256 valores de 64 bits pseudoaleatorios pero fijos
+_gear_random = random.Random(0x6F7267)
+CDC_GEAR = tuple(_gear_random.getrandbits(64) for _ in range(256))
+CDC_MASK64 = (1 << 64) - 1
+
+
+class ChunkAnalyzer:
+    """
+    Análisis de duplicados parciales: trocea los archivos en bloques definidos
+    por contenido (gear hash al estilo FastCDC con normalización) y construye
+    un índice de huellas de bloque. Informa de los pares de archivos que más
+    bloques comparten y de los bytes que ahorraría una deduplicación por bloques.
+    
+    La memoria está acotada por max_entries: al llenarse el índice se pasa a
+    muestrear solo las huellas con más bits bajos a cero y las cifras se
+    escalan por la tasa de muestreo en que se observaron (estimación).
+    
+    El gear hash avanza byte a byte en Python y es mucho más lento que el hash
+    de archivos completos, así que el análisis es opcional: solo se ejecuta al
+    pedirlo (analyze_chunks, botón de duplicados parciales), nunca al escanear
+    ni al buscar duplicados exactos.
+    """
+    
+    def __init__(self, min_size: int = 2048, avg_size: int = 8192, max_size: int = 65536,
+                 max_entries: int = 2000000, top_n: int = 20, read_size: int = 1024 * 1024):
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.top_n = top_n
+        self.read_size = read_size
+        
+        bits = max(avg_size.bit_length() - 1, 4)
+        # Máscara estricta antes del tamaño medio y laxa después (normalización nivel 2)
+        self.mask_strict = ((1 << (bits + 2)) - 1) << (64 - bits - 2)
+        self.mask_loose = ((1 << (bits - 2)) - 1) << (64 - bits + 2)
+        
+        self.index = {}
+        self.sample_bits = 0
+        self.paths = []
+        self.total_bytes = 0
+        self.total_chunks = 0
+        self.duplicate_bytes = 0.0
+        self._top_pairs = []
+    
+    def _cut_point(self, data, start: int, end: int) -> int:
+        """Longitud del siguiente bloque a partir de data[start:end]."""
+        length = end - start
+        if length <= self.min_size:
+            return length
+        if length > self.max_size:
+            length = self.max_size
+        normal = min(self.avg_size, length)
+        
+        gear = CDC_GEAR
+        mask64 = CDC_MASK64
+        # Recorrer un memoryview con enumerate evita indexar y comparar el contador en cada byte
+        view = memoryview(data)
+        h = 0
+        mask = self.mask_strict
+        for cut, byte in enumerate(view[start + self.min_size:start + normal], self.min_size + 1):
+            h = ((h << 1) + gear[byte]) & mask64
+            if not h & mask:
+                return cut
+        mask = self.mask_loose
+        normal = max(normal, self.min_size)
+        for cut, byte in enumerate(view[start + normal:start + length], normal + 1):
+            h = ((h << 1) + gear[byte]) & mask64
+            if not h & mask:
+                return cut
+        return length
+    
+    def iter_chunks(self, path) -> Iterator[Tuple[int, int]]:
+        """Genera (huella, tamaño) de cada bloque leyendo el archivo en streaming."""
+        buffer = bytearray()
+        position = 0
+        eof = False
+        with open(path, 'rb', buffering=0) as f:
+            st = os.fstat(f.fileno())
+            stream = _stream_file(f, st.st_size, st.st_dev, self.read_size)
+            while True:
+                while not eof and len(buffer) - position < self.max_size:
+                    block = next(stream, None)
+                    if block is None:
+                        eof = True
+                    else:
+                        if position:
+                            del buffer[:position]
+                            position = 0
+                        buffer += block
+                if position >= len(buffer):
+                    return
+                cut = self._cut_point(buffer, position, len(buffer))
+                chunk = bytes(buffer[position:position + cut])
+                position += cut
+                digest = hashlib.blake2b(chunk, digest_size=8).digest()
+                yield int.from_bytes(digest, "little"), cut
+    
+    def _shrink_index(self):
+        """Duplica el factor de muestreo y descarta las huellas que ya no entran."""
+        while len(self.index) > self.max_entries:
+            self.sample_bits += 1
+            sample_mask = (1 << self.sample_bits) - 1
+            self.index = {fp: owner for fp, owner in self.index.items() if not fp & sample_mask}
+    
+    def add_file(self, path):
+        file_id = len(self.paths)
+        self.paths.append(str(path))
+        shared = {}
+        
+        for fingerprint, size in self.iter_chunks(path):
+            self.total_bytes += size
+            self.total_chunks += 1
+            sample_mask = (1 << self.sample_bits) - 1
+            if fingerprint & sample_mask:
+                continue
+            
+            weight = size * (1 << self.sample_bits)
+            owner = self.index.get(fingerprint)
+            if owner is None:
+                self.index[fingerprint] = file_id
+                if len(self.index) > self.max_entries:
+                    self._shrink_index()
+                continue
+            
+            self.duplicate_bytes += weight
+            if owner != file_id:
+                shared[owner] = shared.get(owner, 0) + weight
+        
+        for owner, shared_bytes in shared.items():
+            pair = (shared_bytes, owner, file_id)
+            if len(self._top_pairs) < self.top_n:
+                heapq.heappush(self._top_pairs, pair)
+            elif pair > self._top_pairs[0]:
+                heapq.heapreplace(self._top_pairs, pair)
+    
+    def analyze(self, files: List[FileInfo], progress_callback=None):
+        total = len(files)
+        for i, file_info in enumerate(files):
+            try:
+                self.add_file(file_info.path)
+            except OSError:
+                pass
+            if progress_callback:
+                progress_callback(i + 1, total)
+        return self
+    
+    def get_top_pairs(self) -> List[dict]:
+        return [{"file_a": self.paths[owner], "file_b": self.paths[file_id], "shared_bytes": int(shared)}
+                for shared, owner, file_id in sorted(self._top_pairs, reverse=True)]
+    
+    def get_report(self) -> dict:
+        return {
+            "files": len(self.paths),
+            "total_bytes": self.total_bytes,
+            "total_chunks": self.total_chunks,
+            "average_chunk": self.total_bytes // self.total_chunks if self.total_chunks else 0,
+            "dedup_savings_bytes": int(self.duplicate_bytes),
+            "sample_rate": 1 / (1 << self.sample_bits),
+            "top_pairs": self.get_top_pairs()
+        }
+
+
+PACK_PREFIX = "paquete_"
+
+
+def read_packed_file(archive_path: Path, member: str) -> bytes:
+    """Lee un archivo empaquetado usando el índice JSON, sin recorrer el tar."""
+    with open(f"{archive_path}.json", 'r', encoding='utf-8') as f:
+        entry = json.load(f)["members"][member]
+    with open(archive_path, 'rb') as f:
+        f.seek(entry["offset"])
+        return f.read(entry["size"])
+
+
+def load_pack_index(archive_path: Path) -> Dict[str, dict]:
+    """Lee el índice JSON de un paquete: nombre → posición, tamaño y fecha."""
+    with open(f"{archive_path}.json", 'r', encoding='utf-8') as f:
+        return json.load(f)["members"]
+
+
+def extract_packed_file(archive_path: Path, member: str, destination: Path, members: Dict[str, dict] = None):
+    """Restaura un archivo empaquetado con su fecha de modificación. members evita releer el índice."""
+    if members is None:
+        members = load_pack_index(archive_path)
+    entry = members[member]
+    with open(archive_path, 'rb') as fsrc, open(destination, 'wb') as fdst:
+        fsrc.seek(entry["offset"])
+        fdst.write(fsrc.read(entry["size"]))
+    os.utime(destination, (entry["mtime"], entry["mtime"]))
+
+
+class SmallFilePacker:
+    """
+    Empaqueta archivos pequeños en tar sin comprimir, uno abierto por carpeta
+    destino y rotando al llenarse. Junto a cada paquete se escribe un índice
+    JSON con la posición de cada archivo para leerlo sin recorrer el tar.
+    """
+    
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, max_members: int = 10000):
+        self.max_bytes = max_bytes
+        self.max_members = max_members
+        self.packs = {}
+    
+    def _open(self, folder: Path) -> dict:
+        numbers = [int(name[len(PACK_PREFIX):-4]) for name in os.listdir(folder)
+                   if name.startswith(PACK_PREFIX) and name.endswith(".tar") and name[len(PACK_PREFIX):-4].isdigit()]
+        path = folder / f"{PACK_PREFIX}{max(numbers, default=0) + 1:06d}.tar"
+        pack = {
+            "path": path,
+            "tar": tarfile.open(path, "x", format=tarfile.PAX_FORMAT),
+            "members": {},
+            "pending": []
+        }
+        self.packs[folder] = pack
+        return pack
+    
+    def add(self, op: "PlannedOperation", operation: str) -> List[Tuple["PlannedOperation", str, Path, str]]:
+        """
+        Añade el archivo al paquete de su carpeta destino. Devuelve las entradas
+        (operación, tipo, paquete, nombre) de los paquetes que se han cerrado.
+        """
+        folder = op.destination.parent
+        pack = self.packs.get(folder) or self._open(folder)
+        
+        name = op.destination.name
+        counter = 1
+        while name in pack["members"]:
+            name = f"{op.destination.stem}_{counter}{op.destination.suffix}"
+            counter += 1
+        
+        tar = pack["tar"]
+        info = tar.gettarinfo(str(op.source), arcname=name)
+        with open(op.source, 'rb') as f:
+            tar.addfile(info, f)
+        io_options.throttle.consume_bytes(info.size)
+        # Los datos terminan donde acaba el relleno a bloques de 512 bytes
+        padded = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        pack["members"][name] = {
+            "offset": tar.offset - padded,
+            "size": info.size,
+            "mtime": info.mtime,
+            "source": str(op.source)
+        }
+        pack["pending"].append((op, operation, pack["path"], name))
+        
+        if len(pack["members"]) >= self.max_members or tar.offset >= self.max_bytes:
+            return self._close(folder)
+        return []
+    
+    def _close(self, folder: Path) -> List[Tuple["PlannedOperation", str, Path, str]]:
+        """Cierra el paquete y su índice y los vuelca a disco antes de devolver sus entradas."""
+        pack = self.packs.pop(folder)
+        tar = pack["tar"]
+        tar.fileobj.flush()
+        tar.close()
+        _fsync_path(pack["path"])
+        
+        index_path = Path(f"{pack['path']}.json")
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({"archive": pack["path"].name, "members": pack["members"]}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        # Sin el fsync de la carpeta, los nombres del paquete y su índice pueden perderse
+        _fsync_path(folder, directory=True)
+        return pack["pending"]
+    
+    def close_all(self) -> List[Tuple["PlannedOperation", str, Path, str]]:
+        closed = []
+        for folder in list(self.packs):
+            closed.extend(self._close(folder))
+        return closed
+
+
+class PlannedOperation:
+    """Una operación del plan: origen → destino final."""
+    
+    def __init__(self, source: Path, destination: Path, operation: str, size: int,
+                 inode: int = 0, device: int = 0, mtime: float = 0.0):
+        self.source = source
+        self.destination = destination
+        self.operation = operation
+        self.size = size
+        self.inode = inode
+        self.device = device
+        self.mtime = mtime
+    
+    def to_dict(self) -> dict:
+        return {
+            "source": str(self.source),
+            "destination": str(self.destination),
+            "operation": self.operation,
+            "size": self.size,
+            "inode": self.inode,
+            "device": self.device,
+            "mtime": self.mtime
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "PlannedOperation":
+        return cls(Path(data["source"]), Path(data["destination"]), data["operation"], data["size"],
+                   data.get("inode", 0), data.get("device", 0), data.get("mtime", 0.0))
+
+
+class OrganizePlan:
+    """Plan de organización serializable: se calcula una vez y se ejecuta después."""
+    
+    def __init__(self, operation: str = "copy", destination_folder: Path = None):
+        self.operation = operation
+        self.destination_folder = destination_folder
+        self.created = datetime.now().isoformat()
+        self.operations = []
+        # Archivos sin destino calculable, como "nombre: error"
+        self.errors = []
+    
+    def add(self, operation: PlannedOperation):
+        self.operations.append(operation)
+    
+    def get_total_bytes(self) -> int:
+        return sum(op.size for op in self.operations)
+    
+    def ordered(self, scheduler: Optional[IOScheduler] = None) -> List[PlannedOperation]:
+        """
+        Ordena las operaciones por localidad: los renombrados dentro del mismo
+        dispositivo se agrupan por carpeta destino y las copias por carpeta e
+        inodo de origen, para reducir saltos del disco y bloqueos de carpetas.
+        Con un IOScheduler, las copias desde discos rotacionales siguen la
+        posición física de los datos.
+        """
+        try:
+            dest_device = os.stat(self.destination_folder).st_dev
+        except (OSError, TypeError):
+            dest_device = None
+        
+        def locality_key(op: PlannedOperation):
+            if op.operation == "move" and op.device == dest_device:
+                return (0, str(op.destination.parent), str(op.source.parent), op.inode)
+            if scheduler is not None and scheduler.is_rotational(op.device):
+                return (1, str(op.device), scheduler.physical_offset(op.source, op.inode), "")
+            return (2, str(op.source.parent), op.inode, str(op.destination.parent))
+        
+        return sorted(self.operations, key=locality_key)
+    
+    def diff(self, files: List[FileInfo]) -> Dict[str, list]:
+        """Compara el plan con un escaneo posterior."""
+        current = {str(f.path): f for f in files}
+        planned = set()
+        result = {"missing": [], "changed": [], "new": []}
+        
+        for op in self.operations:
+            key = str(op.source)
+            planned.add(key)
+            file_info = current.get(key)
+            if file_info is None:
+                result["missing"].append(op)
+            elif file_info.size != op.size or file_info.modified_date.timestamp() != op.mtime:
+                result["changed"].append(op)
+        
+        result["new"] = [f for key, f in current.items() if key not in planned]
+        return result
+    
+    def to_dict(self) -> dict:
+        return {
+            "operation": self.operation,
+            "destination_folder": str(self.destination_folder) if self.destination_folder else None,
+            "created": self.created,
+            "operations": [op.to_dict() for op in self.operations]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "OrganizePlan":
+        destination = data.get("destination_folder")
+        plan = cls(data.get("operation", "copy"), Path(destination) if destination else None)
+        plan.created = data.get("created", plan.created)
+        plan.operations = [PlannedOperation.from_dict(op) for op in data.get("operations", [])]
+        return plan
+    
+    def save(self, plan_file: Path):
+        with open(plan_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+    
+    @classmethod
+    def load(cls, plan_file: Path) -> "OrganizePlan":
+        with open(plan_file, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+COLLISION_POLICIES = ["rename", "skip_identical"]
+ORGANIZED_MARKER = ".organizado"
+
+# Ajustes que get_config copia tal cual; el resto de objetos se reconstruye en apply_config
+CONFIG_ATTRIBUTES = [
+    "source_folder", "source_folders", "destination_folder", "mirror_folders", "rules", "operation",
+    "recursive", "max_depth", "excluded_dirs", "follow_symlinks", "incremental", "scan_archives",
+    "duplicate_memory_limit", "collision_policy", "verify_copies", "durable_moves",
+    "durable_window_files", "durable_window_bytes", "pack_threshold", "pack_max_bytes",
+    "skip_organized", "organize_by", "date_granularity", "date_source", "name_filter",
+    "exclude_filter", "min_size", "max_size", "min_date", "max_date", "custom_destinations",
+    "category_index", "rule_engine", "priority"
+]
+
+
 class FileOrganizer:
     def __init__(self):
         self.source_folder = None
+        self.source_folders = []
         self.destination_folder = None
+        self.mirror_folders = []
         self.rules = []
         self.operation = "copy"
         self.recursive = False
+        self.max_depth = None
+        self.excluded_dirs = list(DEFAULT_EXCLUDED_DIRS)
+        self.follow_symlinks = False
+        self.incremental = False
+        self.scan_archives = False
+        self.duplicate_memory_limit = None
+        self.collision_policy = "rename"
+        self.verify_copies = False
+        self.durable_moves = False
+        self.durable_window_files = 256
+        self.durable_window_bytes = 256 * 1024 * 1024
+        self.pack_threshold = None
+        self.pack_max_bytes = 256 * 1024 * 1024
+        self.skip_organized = True
+        self.priority = None
         self.organize_by = "extension"
+        self.date_granularity = "month"
+        self.date_source = "modified"
         self.name_filter = ""
         self.exclude_filter = ""
         self.min_size = 0
         self.max_size = float('inf')
+        self.min_date = None
+        self.max_date = None
         self.custom_destinations = {}
+        self.category_index = EXTENSION_TO_CATEGORY
+        self.rule_engine = None
         
         self.history = OrganizationHistory()
-        self.duplicate_finder = DuplicateFinder()
+        self.io_scheduler = IOScheduler()
+        self.duplicate_finder = DuplicateFinder(self.io_scheduler)
+        self.scan_index = None
+        self.scan_delta = ScanDelta()
+        self._delta_states = {}
         
         self.results = {
             "moved": [],
@@ -243,16 +2585,75 @@ class FileOrganizer:
             "errors": [],
             "skipped": []
         }
+        self.destination_results = {}
         
         self._preview_files = []
+        self._preview_pruned = False
+        self._outcome_callback = None
+        self.plan = None
+        self.analytics = None
+        self.chunk_analyzer = None
+    
+    def get_config(self) -> dict:
+        """Copia serializable (pickle) de la configuración, para reproducirla en otro proceso."""
+        config = {name: getattr(self, name) for name in CONFIG_ATTRIBUTES}
+        config["history_file"] = self.history.history_file
+        config["index_file"] = self.scan_index.index_file if self.scan_index is not None else None
+        config["spill_dir"] = getattr(self.duplicate_finder, "spill_dir", None)
+        config["locality"] = None if self.io_scheduler is None else self.io_scheduler.use_fiemap
+        config["io"] = {
+            "drop_cache": io_options.drop_cache,
+            "memory_limit": io_options.memory_limit,
+            "bytes_per_second": io_options.throttle.bandwidth.rate,
+            "files_per_second": io_options.throttle.operations.rate
+        }
+        return config
+    
+    def apply_config(self, config: dict) -> None:
+        for name in CONFIG_ATTRIBUTES:
+            if name in config:
+                setattr(self, name, config[name])
+        
+        if config.get("history_file") is not None:
+            self.history = OrganizationHistory(config["history_file"])
+        if self.incremental:
+            self.scan_index = None
+            self.set_incremental(True, config.get("index_file"))
+        if "locality" in config:
+            self.set_locality_scheduling(config["locality"] is not None, bool(config["locality"]))
+        self.set_duplicate_memory_limit(self.duplicate_memory_limit, config.get("spill_dir"))
+        
+        io = config.get("io")
+        if io:
+            set_cache_friendly(io["drop_cache"])
+            set_io_memory_limit(io["memory_limit"])
+            set_io_limits(io["bytes_per_second"], io["files_per_second"])
     
     def set_source_folder(self, folder_path: str) -> bool:
         path = Path(folder_path)
         if path.exists() and path.is_dir():
             self.source_folder = path
+            self.source_folders = [path]
             return True
         return False
     
+    def set_source_folders(self, folder_paths: List[str]) -> bool:
+        """
+        Varias carpetas de origen (NAS, discos externos, home...) escaneadas a la vez.
+        Las que están dentro de otra de la lista se descartan para no contar dos veces.
+        """
+        paths = []
+        for folder_path in folder_paths:
+            path = Path(folder_path).resolve()
+            if path.is_dir() and path not in paths:
+                paths.append(path)
+        paths = [p for p in paths if not any(other in p.parents for other in paths)]
+        if not paths:
+            return False
+        self.source_folder = paths[0]
+        self.source_folders = paths
+        return True
+    
     def set_destination_folder(self, folder_path: str) -> bool:
         path = Path(folder_path)
         if path.exists() and path.is_dir():
@@ -260,6 +2661,29 @@ class FileOrganizer:
             return True
         return False
     
+    def set_skip_organized(self, skip: bool) -> None:
+        """Al organizar dentro del propio origen, no recorre las carpetas creadas por organizaciones anteriores."""
+        self.skip_organized = skip
+    
+    def is_in_place(self) -> bool:
+        """True si el destino es una carpeta de origen o está dentro de una."""
+        if self.destination_folder is None:
+            return False
+        destination = self.destination_folder.resolve()
+        return any(destination == root.resolve() or root.resolve() in destination.parents
+                   for root in self.source_folders)
+    
+    def set_mirror_folders(self, folder_paths: List[str]) -> None:
+        """
+        Destinos adicionales que reciben una copia de cada archivo. Cada origen se
+        lee una sola vez y se escribe en todos los destinos (solo al copiar).
+        """
+        self.mirror_folders = []
+        for folder_path in folder_paths:
+            path = Path(folder_path)
+            if path.is_dir() and path != self.destination_folder and path not in self.mirror_folders:
+                self.mirror_folders.append(path)
+    
     def set_rules(self, rules: List[str]) -> None:
         self.rules = [rule if rule.startswith('.') else f'.{rule}' for rule in rules]
     
@@ -270,107 +2694,823 @@ class FileOrganizer:
     def set_recursive(self, recursive: bool) -> None:
         self.recursive = recursive
     
+    def set_max_depth(self, depth: Optional[int]) -> None:
+        """Niveles de subcarpetas a recorrer en modo recursivo (None = sin límite)."""
+        self.max_depth = depth if depth is not None and depth >= 0 else None
+    
+    def set_excluded_dirs(self, patterns: Union[str, List[str]]) -> None:
+        """Carpetas que se podan del recorrido (nombre exacto, glob o re:)."""
+        if isinstance(patterns, str):
+            patterns = split_patterns(patterns)
+        self.excluded_dirs = [p.strip() for p in patterns if p.strip()]
+        # La papelera de duplicados nunca se recorre: sus copias volverían a salir como duplicadas
+        if TRASH_FOLDER_NAME not in self.excluded_dirs:
+            self.excluded_dirs.append(TRASH_FOLDER_NAME)
+    
+    def set_follow_symlinks(self, follow: bool) -> None:
+        self.follow_symlinks = follow
+    
+    def set_locality_scheduling(self, enabled: bool, use_fiemap: bool = True) -> None:
+        """Ordena lecturas por posición física en discos rotacionales."""
+        self.io_scheduler = IOScheduler(use_fiemap) if enabled else None
+        self.duplicate_finder.scheduler = self.io_scheduler
+    
+    def set_priority(self, nice: Optional[int] = None, io_class: Optional[str] = None) -> None:
+        """Prioridad (nice, clase de ionice) con la que se ejecutan las operaciones; ver apply_priority."""
+        self.priority = (nice, io_class) if nice is not None or io_class is not None else None
+    
+    def apply_priority(self, whole_process: bool = False) -> bool:
+        """
+        Aplica la prioridad al hilo actual, desde el que se lanzan las
+        operaciones (sus hilos auxiliares la heredan), o a todo el proceso
+        cuando este solo trabaja para el organizador.
+        """
+        if self.priority is None:
+            return True
+        nice, io_class = self.priority
+        return set_process_priority(nice, io_class, thread_only=not whole_process)
+    
+    def set_incremental(self, incremental: bool, index_file: Path = None) -> None:
+        """Reutiliza el índice de escaneo para listar solo las carpetas modificadas."""
+        self.incremental = incremental
+        if incremental and (self.scan_index is None or index_file is not None):
+            self.scan_index = ScanIndex(index_file)
+    
+    def set_scan_archives(self, enabled: bool) -> None:
+        """Incluye el contenido de los zip/tar como entradas virtuales al buscar duplicados."""
+        self.scan_archives = enabled
+    
+    def set_duplicate_memory_limit(self, limit: Optional[int], spill_dir: Optional[str] = None) -> None:
+        """
+        Con un límite en bytes, find_duplicates recorre la carpeta sin acumular los
+        archivos y vuelca a disco los tamaños que no caben (None = todo en memoria).
+        """
+        self.duplicate_memory_limit = limit if limit else None
+        if self.duplicate_memory_limit:
+            self.duplicate_finder = ExternalDuplicateFinder(
+                self.io_scheduler, self.duplicate_memory_limit, spill_dir,
+                file_factory=self._load_file_info, group_callback=self._record_group_metadata
+            )
+        else:
+            self.duplicate_finder = DuplicateFinder(self.io_scheduler)
+    
+    def set_durable_moves(self, enabled: bool, window_files: int = 256, window_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Al mover entre discos, copia por ventanas, las hace duraderas con un syncfs
+        por sistema de archivos y solo después borra los orígenes.
+        """
+        self.durable_moves = enabled
+        self.durable_window_files = max(1, window_files)
+        self.durable_window_bytes = max(1, window_bytes)
+    
+    def set_small_file_packing(self, threshold: Optional[int], max_archive_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Los archivos menores que threshold bytes se guardan dentro de paquetes
+        .tar por carpeta destino en lugar de como archivos sueltos (None = desactivado).
+        """
+        self.pack_threshold = threshold if threshold else None
+        self.pack_max_bytes = max_archive_bytes
+    
+    def set_verify_copies(self, verify: bool) -> None:
+        """Calcula el hash durante la copia y comprueba el destino; el hash queda en el historial y el índice."""
+        self.verify_copies = verify
+    
+    def set_collision_policy(self, policy: str) -> None:
+        """'rename' añade un sufijo _N; 'skip_identical' omite los archivos idénticos al que ya está en el destino."""
+        if policy in COLLISION_POLICIES:
+            self.collision_policy = policy
+    
     def set_organize_by(self, method: str) -> None:
-        if method in ["extension", "date", "size"]:
+        if method in ["extension", "category", "date", "size"]:
             self.organize_by = method
     
+    def set_date_granularity(self, granularity: str) -> None:
+        if granularity in DATE_GRANULARITY_FORMATS:
+            self.date_granularity = granularity
+    
+    def set_date_source(self, source: str) -> None:
+        """'modified' usa la fecha de modificación; 'capture' la fecha EXIF/MP4 si existe."""
+        if source in ["modified", "capture"]:
+            self.date_source = source
+    
+    def extract_capture_dates(self, files: List[FileInfo], progress_callback=None) -> int:
+        """Lee en paralelo las fechas de captura pendientes y las guarda en el índice de escaneo."""
+        pending = [f for f in files if not f._capture_checked and f.extension in CAPTURE_DATE_EXTENSIONS]
+        if not pending:
+            return 0
+        
+        total = len(pending)
+        workers = min(16, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for i, (file_info, date) in enumerate(zip(pending, pool.map(lambda f: read_capture_date(f.path), pending))):
+                file_info.capture_date = date
+                file_info._capture_checked = True
+                if progress_callback:
+                    progress_callback(i + 1, total)
+        
+        if self.incremental:
+            self.scan_index.record_metadata(pending)
+            self.scan_index.save_index()
+        return total
+    
+    def _get_file_date(self, file_info: FileInfo) -> datetime:
+        if self.date_source == "capture" and file_info.capture_date is not None:
+            return file_info.capture_date
+        return file_info.modified_date
+    
+    def load_categories(self, table_file: Path, replace: bool = False) -> int:
+        """
+        Carga una tabla de categorías de usuario. Por defecto se combina con las
+        predefinidas (las extensiones del usuario tienen prioridad).
+        """
+        table = load_category_table(Path(table_file))
+        index = {} if replace else dict(EXTENSION_TO_CATEGORY)
+        index.update(build_category_index(table))
+        self.category_index = index
+        return len(table)
+    
+    def set_destination_rules(self, text: str) -> int:
+        """Compila reglas de destino (una por línea); texto vacío las desactiva."""
+        engine = RuleEngine.parse(text)
+        self.rule_engine = engine if engine.rules else None
+        return len(engine.rules)
+    
+    def load_destination_rules(self, rules_file: Path) -> int:
+        with open(rules_file, 'r', encoding='utf-8') as f:
+            return self.set_destination_rules(f.read())
+    
+    def get_category(self, extension: str) -> str:
+        return self.category_index.get(extension, DEFAULT_CATEGORY)
+    
     def set_name_filter(self, pattern: str) -> None:
-        self.name_filter = pattern.lower()
+        """Patrones de inclusión separados por comas (texto, glob o re:)."""
+        self.name_filter = pattern
     
     def set_exclude_filter(self, pattern: str) -> None:
-        self.exclude_filter = pattern.lower()
+        """Patrones de exclusión separados por comas (texto, glob o re:)."""
+        self.exclude_filter = pattern
     
     def set_size_filter(self, min_size: int = 0, max_size: int = None) -> None:
         self.min_size = min_size
         self.max_size = max_size if max_size else float('inf')
     
+    def set_date_filter(self, min_date: Optional[datetime] = None, max_date: Optional[datetime] = None) -> None:
+        self.min_date = min_date
+        self.max_date = max_date
+    
     def set_custom_destination(self, extension: str, folder_name: str) -> None:
         ext = extension if extension.startswith('.') else f'.{extension}'
         self.custom_destinations[ext] = folder_name
     
-    def _matches_filters(self, file_info: FileInfo) -> bool:
-        if self.rules and file_info.extension not in self.rules:
-            return False
+    def compile_filter(self) -> FileFilter:
+        """Compila la configuración actual de filtros en un FileFilter."""
+        return FileFilter(
+            extensions=self.rules,
+            include=self.name_filter,
+            exclude=self.exclude_filter,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            min_date=self.min_date,
+            max_date=self.max_date,
+            exclude_dirs=self.excluded_dirs
+        )
+    
+    def _list_folder(self, folder: str, folder_stat, file_filter: FileFilter, descend: bool,
+                     snapshot: dict, new_snapshot: dict) -> Tuple[list, list]:
+        """Devuelve (subcarpetas, archivos) de una carpeta, usando el índice si no ha cambiado."""
+        subdirs = []
+        files = []
+        cached = snapshot.get(folder) if snapshot is not None else None
         
-        if self.name_filter and self.name_filter not in file_info.name.lower():
-            return False
+        if cached is not None and cached["mtime_ns"] == folder_stat.st_mtime_ns:
+            new_snapshot[folder] = cached
+            if descend:
+                for name in cached["dirs"]:
+                    if file_filter.match_dir(name):
+                        path = os.path.join(folder, name)
+                        try:
+                            subdirs.append((path, os.stat(path, follow_symlinks=self.follow_symlinks)))
+                        except OSError:
+                            continue
+            # Solo se reutiliza el listado: editar un archivo no cambia la fecha de su carpeta
+            for name, record in cached["files"].items():
+                if name == ORGANIZED_MARKER or not file_filter.match_name(name):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if (record is None or record["size"] != st.st_size
+                        or record["mtime_ns"] != st.st_mtime_ns or record["ino"] != st.st_ino):
+                    if record is not None and not record.get("added"):
+                        self._delta_states[path] = "modified"
+                    record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+                    cached["files"][name] = record
+                elif record.pop("added", False):
+                    self._delta_states[path] = "added"
+                files.append(IndexedEntry(folder, name, st))
+            return subdirs, files
+        
+        dir_names = []
+        file_records = {}
+        count = 0
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                count += 1
+                try:
+                    if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                        dir_names.append(entry.name)
+                        if descend and file_filter.match_dir(entry.name):
+                            subdirs.append((entry.path, entry.stat(follow_symlinks=self.follow_symlinks)))
+                    elif entry.is_file():
+                        file_records[entry.name] = None
+                        if entry.name != ORGANIZED_MARKER and file_filter.match_name(entry.name):
+                            files.append(entry)
+                except OSError:
+                    continue
         
-        if self.exclude_filter and self.exclude_filter in file_info.name.lower():
+        if new_snapshot is None:
+            return subdirs, files
+        
+        old_files = cached["files"] if cached is not None else {}
+        for entry in files:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+            old = old_files.get(entry.name)
+            # Lo que anotó el propio organizador al copiar sigue contando como nuevo
+            if entry.name not in old_files or (old is not None and old.get("added")):
+                self._delta_states[entry.path] = "added"
+            if old is not None:
+                if old["size"] != st.st_size or old["mtime_ns"] != st.st_mtime_ns:
+                    if not old.get("added"):
+                        self._delta_states[entry.path] = "modified"
+                else:
+                    for key in ScanIndex.METADATA_KEYS:
+                        if key in old:
+                            record[key] = old[key]
+            file_records[entry.name] = record
+        
+        for name in old_files:
+            if name not in file_records and file_filter.match_name(name):
+                self.scan_delta.removed.append(os.path.join(folder, name))
+        
+        mtime_ns = folder_stat.st_mtime_ns
+        if time.time_ns() - mtime_ns < ScanIndex.RACY_WINDOW_NS:
+            mtime_ns = -1
+        new_snapshot[folder] = {
+            "mtime_ns": mtime_ns,
+            "dev": folder_stat.st_dev,
+            "count": count,
+            "dirs": dir_names,
+            "files": file_records
+        }
+        return subdirs, files
+    
+    def _scan_entries(self, file_filter: FileFilter, root: Path, cancel_event: Optional[threading.Event] = None,
+                      prune_organized: bool = False) -> Iterator[os.DirEntry]:
+        """
+        Recorre una carpeta origen devolviendo las entradas que pasan el filtro por
+        nombre. Un recorrido cancelado no actualiza la instantánea del índice.
+        """
+        root_stat = root.stat()
+        visited = {(root_stat.st_dev, root_stat.st_ino)}
+        pending = [(str(root), 0, root_stat)]
+        
+        snapshot = None
+        new_snapshot = None
+        if self.incremental:
+            snapshot = self.scan_index.get_snapshot(root, self.follow_symlinks)
+            new_snapshot = {}
+        
+        # Organizando en el propio origen se podan el destino y las carpetas ya organizadas
+        pruned_folder = None
+        prune = prune_organized and self.skip_organized and self.is_in_place()
+        if prune:
+            destination = self.destination_folder.resolve()
+            if destination != root.resolve() and root.resolve() in destination.parents:
+                pruned_folder = os.path.join(str(root), str(destination.relative_to(root.resolve())))
+        
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            folder, depth, folder_stat = pending.pop()
+            if prune and depth > 0 and (folder == pruned_folder
+                                        or self._is_organized_folder(folder, folder_stat, snapshot, new_snapshot)):
+                continue
+            descend = self.recursive and (self.max_depth is None or depth < self.max_depth)
+            try:
+                subdirs, entries = self._list_folder(folder, folder_stat, file_filter, descend,
+                                                     snapshot, new_snapshot)
+            except OSError:
+                continue
+            
+            for path, dir_stat in subdirs:
+                # (dev, inodo) evita bucles de enlaces y montajes repetidos
+                key = (dir_stat.st_dev, dir_stat.st_ino)
+                if key not in visited:
+                    visited.add(key)
+                    pending.append((path, depth + 1, dir_stat))
+            
+            yield from entries
+        
+        if self.incremental:
+            for folder, record in snapshot.items():
+                if folder not in new_snapshot and not os.path.isdir(folder):
+                    for name in record["files"]:
+                        if file_filter.match_name(name):
+                            self.scan_delta.removed.append(os.path.join(folder, name))
+            self.scan_index.set_snapshot(root, new_snapshot, self.follow_symlinks)
+    
+    def _is_organized_folder(self, folder: str, folder_stat, snapshot: dict, new_snapshot: dict) -> bool:
+        """Comprueba la marca de carpeta organizada, sin tocar el disco si el índice sigue siendo válido."""
+        cached = snapshot.get(folder) if snapshot is not None else None
+        if cached is not None and cached["mtime_ns"] == folder_stat.st_mtime_ns:
+            if ORGANIZED_MARKER in cached["files"]:
+                new_snapshot[folder] = cached
+                return True
             return False
+        return os.path.exists(os.path.join(folder, ORGANIZED_MARKER))
+    
+    def _scan_root(self, root: Path, file_filter: FileFilter, cancel_event: Optional[threading.Event] = None,
+                   prune_organized: bool = False) -> Iterator[FileInfo]:
+        for entry in self._scan_entries(file_filter, root, cancel_event, prune_organized):
+            try:
+                file_info = self._make_file_info(entry, file_filter)
+            except (OSError, ValueError, OverflowError):
+                continue
+            if file_info is not None:
+                file_info.root = root
+                yield file_info
+    
+    def _scan_files(self, file_filter: FileFilter, cancel_event: Optional[threading.Event] = None,
+                    prune_organized: bool = False) -> Iterator[FileInfo]:
+        """
+        Recorre todas las carpetas de origen. Con varias, lanza un hilo por
+        dispositivo (las carpetas de un mismo disco se leen una tras otra para no
+        competir por el cabezal) y mezcla los resultados en un único flujo.
+        """
+        if len(self.source_folders) == 1:
+            yield from self._scan_root(self.source_folders[0], file_filter, cancel_event, prune_organized)
+            return
         
-        if not (self.min_size <= file_info.size <= self.max_size):
+        devices = {}
+        for root in self.source_folders:
+            try:
+                devices.setdefault(root.stat().st_dev, []).append(root)
+            except OSError:
+                continue
+        
+        results = queue.Queue(maxsize=64)
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
             return False
         
-        return True
+        def scan_device(roots: List[Path]):
+            try:
+                for root in roots:
+                    batch = []
+                    for file_info in self._scan_root(root, file_filter, cancel_event, prune_organized):
+                        batch.append(file_info)
+                        if len(batch) >= 256:
+                            if not put(batch):
+                                return
+                            batch = []
+                    if batch and not put(batch):
+                        return
+            finally:
+                put(None)
+        
+        threads = [threading.Thread(target=scan_device, args=(roots,), daemon=True) for roots in devices.values()]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            finished = 0
+            while finished < len(threads):
+                batch = results.get()
+                if batch is None:
+                    finished += 1
+                    continue
+                yield from batch
+        finally:
+            stop.set()
+    
+    def _make_file_info(self, entry, file_filter: FileFilter) -> Optional[FileInfo]:
+        """Hace el único stat de la entrada y construye el FileInfo si pasa los filtros."""
+        stat_result = entry.stat()
+        if not file_filter.match_stat(stat_result.st_size, stat_result.st_mtime):
+            return None
+        file_info = FileInfo(Path(entry.path), stat_result)
+        if self.incremental:
+            self._apply_index_record(file_info, stat_result)
+        return file_info
     
-    def get_files(self, progress_callback=None) -> List[FileInfo]:
-        if not self.source_folder:
+    def get_files(self, progress_callback=None, cancel_event: Optional[threading.Event] = None,
+                  prune_organized: bool = False) -> List[FileInfo]:
+        """
+        Escanea el origen y guarda la lista para la vista previa. prune_organized,
+        solo para organizar, salta las carpetas ya organizadas del propio origen.
+        """
+        if not self.source_folders:
             return []
         
         files = []
-        pattern = self.source_folder.rglob('*') if self.recursive else self.source_folder.glob('*')
+        file_filter = self.compile_filter()
+        self.scan_delta = ScanDelta()
+        self._delta_states = {}
         
-        all_files = [f for f in pattern if f.is_file()]
-        total = len(all_files)
+        for file_info in self._scan_files(file_filter, cancel_event, prune_organized):
+            files.append(file_info)
+            if progress_callback and len(files) % 500 == 0:
+                progress_callback(len(files), 0)
+        if progress_callback:
+            progress_callback(len(files), 0)
         
-        for i, file_path in enumerate(all_files):
-            try:
-                file_info = FileInfo(file_path)
-                if self._matches_filters(file_info):
-                    files.append(file_info)
-                
-                if progress_callback:
-                    progress_callback(i + 1, total)
-            except Exception:
-                continue
+        if self.incremental:
+            self.scan_index.save_index()
         
         self._preview_files = files
+        self._preview_pruned = prune_organized
         return files
     
+    def iter_files(self, cancel_event: Optional[threading.Event] = None) -> Iterator[FileInfo]:
+        """
+        Genera los archivos que pasan los filtros a medida que se recorren, sin
+        acumularlos. Si se activa cancel_event el recorrido termina en la siguiente carpeta.
+        """
+        if not self.source_folders:
+            return
+        
+        file_filter = self.compile_filter()
+        self.scan_delta = ScanDelta()
+        self._delta_states = {}
+        
+        yield from self._scan_files(file_filter, cancel_event)
+        
+        if self.incremental:
+            self.scan_index.save_index()
+    
+    def _apply_index_record(self, file_info: FileInfo, stat_result):
+        """Recupera del índice los datos ya calculados y anota el archivo en el delta."""
+        record = self.scan_index.valid_record(str(file_info.path), stat_result)
+        if record is not None:
+            if "hash" in record:
+                file_info._hash = record["hash"]
+            if "capture" in record:
+                file_info._capture_checked = True
+                file_info.capture_date = datetime.fromisoformat(record["capture"]) if record["capture"] else None
+        
+        state = self._delta_states.get(str(file_info.path))
+        if state == "added":
+            self.scan_delta.added.append(file_info)
+        elif state == "modified":
+            self.scan_delta.modified.append(file_info)
+    
+    def get_scan_delta(self) -> ScanDelta:
+        """Archivos añadidos, modificados y eliminados desde el escaneo anterior."""
+        return self.scan_delta
+    
+    def analyze(self, progress_callback=None, top_n: int = 20) -> FolderAnalytics:
+        """Informe de ocupación en una sola pasada de escaneo y memoria constante."""
+        analytics = FolderAnalytics(self.source_folder, self.category_index, top_n)
+        for file_info in self.iter_files():
+            analytics.add(file_info)
+            if progress_callback and analytics.total_files % 500 == 0:
+                progress_callback(analytics.total_files, 0)
+        if progress_callback:
+            progress_callback(analytics.total_files, 0)
+        self.analytics = analytics
+        return analytics
+    
+    def analyze_chunks(self, progress_callback=None, files: List[FileInfo] = None, **options) -> ChunkAnalyzer:
+        """Busca duplicados parciales comparando bloques definidos por contenido."""
+        if files is None:
+            if not self._preview_files or self._preview_pruned:
+                self.get_files()
+            files = self._preview_files
+        self.chunk_analyzer = ChunkAnalyzer(**options).analyze(files, progress_callback)
+        return self.chunk_analyzer
+    
     def get_preview(self) -> List[dict]:
-        return [f.to_dict() for f in self._preview_files]
+        preview = [f.to_dict() for f in self._preview_files]
+        if self.destination_folder and self._preview_files:
+            self.plan = self.build_plan(self._preview_files)
+            destinations = {str(op.source): op for op in self.plan.operations}
+            for item in preview:
+                op = destinations.get(item["path"])
+                item["destination"] = str(op.destination) if op else ""
+                item["skip"] = op is not None and op.operation == "skip"
+        return preview
+    
+    def expand_archives(self, files: List[FileInfo]) -> List[FileInfo]:
+        """Añade a la lista los miembros de los zip/tar que pasan los filtros de nombre, tamaño y fecha."""
+        file_filter = self.compile_filter()
+        expanded = list(files)
+        for file_info in files:
+            if archive_kind(file_info.name) is None:
+                continue
+            for member in iter_archive_members(file_info):
+                if file_filter.matches(member):
+                    expanded.append(member)
+        return expanded
+    
+    def _load_file_info(self, path: str) -> FileInfo:
+        """FileInfo de una ruta volcada a disco, con el hash del índice si sigue siendo válido."""
+        stat_result = os.stat(path)
+        file_info = FileInfo(Path(path), stat_result)
+        if self.incremental:
+            record = self.scan_index.valid_record(path, stat_result)
+            if record is not None and "hash" in record:
+                file_info._hash = record["hash"]
+        return file_info
+    
+    def _record_group_metadata(self, group: List[FileInfo]):
+        if self.incremental:
+            self.scan_index.record_metadata(group)
+    
+    def find_duplicates(self, progress_callback=None, files: List[FileInfo] = None, duplicate_callback=None,
+                        cancel_event: Optional[threading.Event] = None) -> Dict[str, List[FileInfo]]:
+        if self.duplicate_memory_limit and files is None:
+            duplicates = self.duplicate_finder.find_duplicates(self.iter_files(cancel_event), progress_callback,
+                                                               duplicate_callback, cancel_event)
+            if self.incremental:
+                self.scan_index.save_index()
+            return duplicates
+        if files is None:
+            if not self._preview_files or self._preview_pruned:
+                self.get_files(cancel_event=cancel_event)
+            files = self._preview_files
+        if self.scan_archives and not self.duplicate_memory_limit:
+            files = self.expand_archives(files)
+        duplicates = self.duplicate_finder.find_duplicates(files, progress_callback, duplicate_callback, cancel_event)
+        if self.incremental:
+            self.scan_index.record_metadata(files)
+            self.scan_index.save_index()
+        return duplicates
+    
+    def export_scan(self, output, fmt: Optional[str] = None, progress_callback=None) -> int:
+        """Escanea el origen escribiendo cada archivo en cuanto se encuentra. Devuelve las filas escritas."""
+        with RowExporter(output, SCAN_EXPORT_FIELDS, fmt) as exporter:
+            for file_info in self.iter_files():
+                exporter.write(scan_row(file_info))
+                if progress_callback and exporter.rows_written % 500 == 0:
+                    progress_callback(exporter.rows_written, 0)
+            return exporter.rows_written
     
-    def find_duplicates(self, progress_callback=None) -> Dict[str, List[FileInfo]]:
-        if not self._preview_files:
-            self.get_files()
-        return self.duplicate_finder.find_duplicates(self._preview_files, progress_callback)
+    def export_duplicates(self, output, fmt: Optional[str] = None, policy: str = "oldest",
+                          preferred_root: Optional[Path] = None, progress_callback=None) -> int:
+        """
+        Busca duplicados escribiendo cada grupo en cuanto se confirma, con la
+        copia que conservaría la política indicada y los bytes recuperables.
+        Siempre recorre el origen con memoria acotada, así que no incluye el
+        contenido de los zip/tar ni cambia los duplicados ya encontrados.
+        """
+        finder = ExternalDuplicateFinder(
+            self.io_scheduler, self.duplicate_memory_limit or EXPORT_MEMORY_LIMIT,
+            getattr(self.duplicate_finder, "spill_dir", None), file_factory=self._load_file_info,
+            group_callback=self._record_group_metadata, keep_groups=False
+        )
+        resolver = DuplicateResolver({}, policy, preferred_root)
+        with RowExporter(output, DUPLICATE_EXPORT_FIELDS, fmt) as exporter:
+            def write_group(file_hash: str, files: List[FileInfo]):
+                loose = [f for f in files if not isinstance(f, ArchiveMember)]
+                keeper = resolver.choose_keeper(loose) if loose else None
+                for row in duplicate_rows(file_hash, files, keeper):
+                    exporter.write(row)
+            
+            finder.find_duplicates(self.iter_files(), progress_callback, write_group)
+            if self.incremental:
+                self.scan_index.save_index()
+            return exporter.rows_written
+    
+    def export_history(self, output, fmt: Optional[str] = None) -> int:
+        """Una fila por operación de cada lote del historial, del más antiguo al más reciente."""
+        with RowExporter(output, HISTORY_EXPORT_FIELDS, fmt) as exporter:
+            for row in history_rows(self.history.batches):
+                exporter.write(row)
+            return exporter.rows_written
+    
+    def resolve_duplicates(self, policy: str = "oldest", use_trash: bool = True,
+                           preferred_root: Optional[Path] = None, progress_callback=None) -> dict:
+        """
+        Aplica una política de conservación a los duplicados encontrados. Con
+        use_trash, las copias sobrantes se renombran a una papelera dentro de su carpeta de origen.
+        """
+        resolver = DuplicateResolver(self.duplicate_finder.duplicates, policy, preferred_root)
+        trash_folder = None
+        if use_trash:
+            trash_folder = Path(TRASH_FOLDER_NAME, datetime.now().strftime("%Y%m%d_%H%M%S"))
+        results = resolver.resolve(self.history, trash_folder, progress_callback=progress_callback)
+        
+        # Los grupos que ya no tienen copias sobrantes desaparecen del resultado
+        removed = set(results["removed"])
+        remaining = {}
+        for file_hash, files in self.duplicate_finder.duplicates.items():
+            files = [f for f in files if str(f.path) not in removed]
+            if len(files) > 1:
+                remaining[file_hash] = files
+        self.duplicate_finder.duplicates = remaining
+        return results
     
     def _get_destination_folder_name(self, file_info: FileInfo) -> str:
+        if self.rule_engine is not None:
+            file_date = self._get_file_date(file_info)
+            rule = self.rule_engine.match(file_info, file_date)
+            if rule is not None:
+                return RuleEngine.render(rule, {
+                    "ext": file_info.extension.lstrip('.'),
+                    "category": self.category_index.get(file_info.extension, DEFAULT_CATEGORY),
+                    "year": file_date.strftime("%Y"),
+                    "month": file_date.strftime("%m"),
+                    "day": file_date.strftime("%d"),
+                    "size_bucket": file_info.size_category
+                })
+        
         if file_info.extension in self.custom_destinations:
             return self.custom_destinations[file_info.extension]
         
         if self.organize_by == "extension":
             return file_info.extension.lstrip('.')
+        elif self.organize_by == "category":
+            return self.category_index.get(file_info.extension, DEFAULT_CATEGORY)
         elif self.organize_by == "date":
-            return file_info.modified_date.strftime("%Y/%m")
+            return self._get_file_date(file_info).strftime(DATE_GRANULARITY_FORMATS[self.date_granularity])
         elif self.organize_by == "size":
             return file_info.size_category
         
         return file_info.extension.lstrip('.')
     
-    def organize(self, progress_callback=None) -> Tuple[bool, str]:
+    def build_plan(self, files: List[FileInfo] = None, destination_folder: Path = None) -> OrganizePlan:
+        """Decide el destino final de cada archivo, incluidas las colisiones, sin tocar nada."""
+        if files is None:
+            if not self._preview_files:
+                self.get_files(prune_organized=True)
+            files = self._preview_files
+        
+        if self.date_source == "capture" and (self.organize_by == "date" or self.rule_engine is not None):
+            self.extract_capture_dates(files)
+        
+        destination_folder = destination_folder or self.destination_folder
+        plan = OrganizePlan(self.operation, destination_folder)
+        taken = {}
+        planned = set()
+        in_place = self.is_in_place()
+        
+        for file_info in files:
+            try:
+                dest_folder = destination_folder / self._get_destination_folder_name(file_info)
+            except (ValueError, KeyError, IndexError, AttributeError, TypeError) as e:
+                plan.errors.append(f"{file_info.name}: no se pudo calcular el destino ({e})")
+                continue
+            if in_place and os.path.abspath(dest_folder / file_info.name) == os.path.abspath(file_info.path):
+                # Ya está donde le corresponde
+                continue
+            names = taken.get(dest_folder)
+            if names is None:
+                try:
+                    names = set(os.listdir(dest_folder))
+                except OSError:
+                    names = set()
+                taken[dest_folder] = names
+            
+            name = file_info.name
+            operation = self.operation
+            if name in names:
+                existing = dest_folder / name
+                if (self.collision_policy == "skip_identical" and existing not in planned
+                        and self._is_identical(file_info, existing)):
+                    operation = "skip"
+                else:
+                    base = Path(name).stem
+                    ext = Path(name).suffix
+                    counter = 1
+                    while f"{base}_{counter}{ext}" in names:
+                        counter += 1
+                    name = f"{base}_{counter}{ext}"
+            names.add(name)
+            planned.add(dest_folder / name)
+            
+            plan.add(PlannedOperation(
+                file_info.path, dest_folder / name, operation, file_info.size,
+                file_info.inode, file_info.device, file_info.modified_date.timestamp()
+            ))
+        
+        return plan
+    
+    def _is_identical(self, file_info: FileInfo, existing: Path) -> bool:
+        """Compara con el archivo ya existente: tamaño, luego hash parcial y por último el hash completo."""
+        try:
+            st = existing.stat()
+            if st.st_size != file_info.size:
+                return False
+            if existing.samefile(file_info.path):
+                return False
+            if get_partial_hash(existing, st.st_size) != get_partial_hash(file_info.path, file_info.size):
+                return False
+            if file_info.size <= 2 * PARTIAL_HASH_SAMPLE:
+                return True
+            
+            existing_hash = None
+            if self.incremental:
+                record = self.scan_index.valid_record(str(existing), st)
+                if record is not None:
+                    existing_hash = record.get("hash")
+            return (existing_hash or get_file_hash(existing)) == file_info.hash
+        except OSError:
+            return False
+    
+    def organize(self, progress_callback=None, files: List[FileInfo] = None,
+                 outcome_callback=None, cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
         if not self.source_folder or not self.destination_folder:
             return False, "Error: Carpeta origen y destino son requeridas"
         
         self.results = {"moved": [], "copied": [], "errors": [], "skipped": []}
         
-        if not self._preview_files:
-            self.get_files()
+        if files is None:
+            if not self._preview_files:
+                self.get_files(prune_organized=True)
+            files = self._preview_files
         
-        if not self._preview_files:
+        if not files:
             return False, "No se encontraron archivos que coincidan con los filtros"
         
-        total = len(self._preview_files)
-        self.history.start_batch(self.operation)
+        self.plan = self.build_plan(files)
+        if not self.plan.operations:
+            if self.plan.errors:
+                self.results["errors"] = list(self.plan.errors)
+                return False, f"No se pudo calcular el destino | Errores: {len(self.plan.errors)}"
+            return False, "Todos los archivos ya están en su carpeta de destino"
+        if self.mirror_folders and self.operation == "copy":
+            mirror_plans = [self.build_plan(files, folder) for folder in self.mirror_folders]
+            return self.execute_mirrored([self.plan] + mirror_plans, progress_callback, outcome_callback, cancel_event)
+        return self.execute_plan(self.plan, progress_callback, outcome_callback, cancel_event)
+    
+    def execute_plan(self, plan: OrganizePlan, progress_callback=None, outcome_callback=None,
+                     cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
+        """
+        Ejecuta un plan (recién calculado o cargado de disco) en orden de localidad.
+        outcome_callback recibe un diccionario por archivo procesado; si se activa
+        cancel_event se termina entre dos operaciones, dejando el historial completo.
+        """
+        self.results = {"moved": [], "copied": [], "errors": [], "skipped": []}
+        self.destination_results = {str(plan.destination_folder): self.results}
+        self._outcome_callback = outcome_callback
+        self.results["errors"].extend(plan.errors)
+        
+        if not plan.operations:
+            return False, "El plan no contiene operaciones"
+        
+        total = len(plan.operations)
+        self.history.start_batch(plan.operation)
+        created_folders = {}
+        window = []
+        window_bytes = 0
+        packer = SmallFilePacker(self.pack_max_bytes) if self.pack_threshold else None
+        in_place = self.is_in_place() and plan.destination_folder == self.destination_folder
         
-        for i, file_info in enumerate(self._preview_files):
+        for i, op in enumerate(plan.ordered(self.io_scheduler)):
+            if cancel_event is not None and cancel_event.is_set():
+                break
             try:
-                folder_name = self._get_destination_folder_name(file_info)
-                dest_folder = self.destination_folder / folder_name
-                dest_folder.mkdir(parents=True, exist_ok=True)
+                if not op.source.exists():
+                    raise FileNotFoundError("el archivo de origen ya no existe")
+                
+                operation = op.operation
+                if operation == "skip":
+                    if self._skip_identical(op, plan.operation):
+                        if progress_callback:
+                            progress_callback(i + 1, total)
+                        continue
+                    operation = plan.operation
+                
+                dest_folder = op.destination.parent
+                if dest_folder not in created_folders:
+                    # Solo se marcan las carpetas que crea esta organización, nunca las del usuario
+                    created = not dest_folder.exists()
+                    dest_folder.mkdir(parents=True, exist_ok=True)
+                    created_folders[dest_folder] = dest_folder.stat().st_dev
+                    if in_place and created:
+                        self._mark_organized(dest_folder)
                 
-                destination_path = dest_folder / file_info.name
+                if packer is not None and op.size < self.pack_threshold:
+                    io_options.throttle.consume_operation()
+                    self._finish_packed(packer.add(op, operation))
+                    if progress_callback:
+                        progress_callback(i + 1, total)
+                    continue
                 
+                destination_path = op.destination
                 if destination_path.exists():
                     base = destination_path.stem
                     ext = destination_path.suffix
@@ -379,30 +3519,264 @@ class FileOrganizer:
                         destination_path = dest_folder / f"{base}_{counter}{ext}"
                         counter += 1
                 
-                if self.operation == "move":
-                    shutil.move(str(file_info.path), str(destination_path))
-                    self.results["moved"].append(str(file_info.path))
-                    self.history.add_to_batch(str(file_info.path), str(destination_path))
+                io_options.throttle.consume_operation()
+                verified = []
+                if self.verify_copies:
+                    copy_function = lambda src, dst: verified.append(copy_file_verified(src, dst))
                 else:
-                    shutil.copy2(str(file_info.path), str(destination_path))
-                    self.results["copied"].append(str(file_info.path))
+                    copy_function = copy_file
+                
+                if (operation == "move" and self.durable_moves
+                        and os.stat(op.source).st_dev != created_folders[dest_folder]):
+                    try:
+                        copy_function(str(op.source), str(destination_path))
+                    except Exception:
+                        if destination_path.exists():
+                            destination_path.unlink()
+                        raise
+                    window.append((op, destination_path, verified[0] if verified else None))
+                    window_bytes += op.size
+                    if len(window) >= self.durable_window_files or window_bytes >= self.durable_window_bytes:
+                        self._commit_move_window(window)
+                        window = []
+                        window_bytes = 0
+                elif operation == "move":
+                    # Un renombrado dentro del mismo disco no copia datos ni produce hash:
+                    # el que ya tuviera el índice para el origen pasa al destino
+                    known = self.scan_index.valid_record(str(op.source), os.stat(op.source)) if self.incremental else None
+                    shutil.move(str(op.source), str(destination_path), copy_function=copy_function)
+                    self._record_outcome("moved", op, destination_path)
+                    self.history.add_to_batch(str(op.source), str(destination_path),
+                                              file_hash=verified[0] if verified else None)
+                    if not verified and known is not None and "hash" in known:
+                        self.scan_index.record_hash(str(destination_path), known["hash"])
+                else:
+                    copy_function(str(op.source), str(destination_path))
+                    self._record_outcome("copied", op, destination_path)
+                    if verified:
+                        self.history.add_to_batch(str(op.source), str(destination_path), file_hash=verified[0])
+                
+                if verified and self.incremental:
+                    if operation != "move":
+                        self.scan_index.record_hash(str(op.source), verified[0])
+                    self.scan_index.record_hash(str(destination_path), verified[0])
                 
                 if progress_callback:
                     progress_callback(i + 1, total)
             
             except Exception as e:
-                self.results["errors"].append(f"{file_info.name}: {str(e)}")
+                self._record_outcome("errors", op, error=str(e))
         
+        if window:
+            self._commit_move_window(window)
+        if packer is not None:
+            self._finish_packed(packer.close_all())
         self.history.finish_batch()
+        self._outcome_callback = None
+        if self.incremental:
+            self.scan_index.save_index()
         
         total_processed = len(self.results["moved"]) + len(self.results["copied"])
+        total_skipped = len(self.results["skipped"])
         total_errors = len(self.results["errors"])
         
         message = f"Procesados: {total_processed} archivos"
+        if total_skipped > 0:
+            message += f" | Omitidos (idénticos): {total_skipped}"
         if total_errors > 0:
             message += f" | Errores: {total_errors}"
         
-        return total_processed > 0, message
+        return total_processed + total_skipped > 0, message
+    
+    def execute_mirrored(self, plans: List[OrganizePlan], progress_callback=None, outcome_callback=None,
+                         cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
+        """
+        Ejecuta varios planes de copia del mismo conjunto de archivos (destino
+        principal y espejos) leyendo cada origen una vez. Cada destino resuelve sus
+        colisiones y tiene sus propios resultados en destination_results.
+        """
+        self.destination_results = {
+            str(plan.destination_folder): {"moved": [], "copied": [], "errors": [], "skipped": []} for plan in plans
+        }
+        for plan in plans:
+            self.destination_results[str(plan.destination_folder)]["errors"].extend(plan.errors)
+        self.results = self.destination_results[str(plans[0].destination_folder)]
+        self._outcome_callback = outcome_callback
+        
+        if not any(plan.operations for plan in plans):
+            return False, "El plan no contiene operaciones"
+        
+        # Cada plan descarta sus propios archivos (los que ya están en su sitio, los
+        # que fallan): las operaciones se emparejan por origen, nunca por posición
+        by_source = [{str(op.source): op for op in plan.operations} for plan in plans]
+        order = list(plans[0].ordered(self.io_scheduler))
+        seen = set(by_source[0])
+        for plan in plans[1:]:
+            for op in plan.operations:
+                if str(op.source) not in seen:
+                    seen.add(str(op.source))
+                    order.append(op)
+        total = len(order)
+        self.history.start_batch("copy")
+        created_folders = set()
+        
+        with ThreadPoolExecutor(max_workers=len(plans)) as executor:
+            for processed, primary in enumerate(order, 1):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                
+                targets = []
+                for plan, operations in zip(plans, by_source):
+                    op = operations.get(str(primary.source))
+                    if op is None:
+                        continue
+                    results = self.destination_results[str(plan.destination_folder)]
+                    try:
+                        if not op.source.exists():
+                            raise FileNotFoundError("el archivo de origen ya no existe")
+                        if op.operation == "skip" and op.destination.exists() and _same_content(op.source, op.destination):
+                            self._record_outcome("skipped", op, op.destination, results=results)
+                            continue
+                        
+                        dest_folder = op.destination.parent
+                        if dest_folder not in created_folders:
+                            dest_folder.mkdir(parents=True, exist_ok=True)
+                            created_folders.add(dest_folder)
+                        destination_path = op.destination
+                        counter = 1
+                        while destination_path.exists():
+                            destination_path = dest_folder / f"{op.destination.stem}_{counter}{op.destination.suffix}"
+                            counter += 1
+                        targets.append((op, destination_path, results))
+                    except Exception as e:
+                        self._record_outcome("errors", op, error=str(e), results=results)
+                
+                if targets:
+                    io_options.throttle.consume_operation()
+                    try:
+                        file_hash, errors = copy_file_fanout(
+                            str(primary.source), [str(path) for _, path, _ in targets],
+                            compute_hash=self.verify_copies, verify=self.verify_copies, executor=executor
+                        )
+                    except Exception as e:
+                        file_hash, errors = None, {str(path): e for _, path, _ in targets}
+                    
+                    for op, destination_path, results in targets:
+                        error = errors.get(str(destination_path))
+                        if error is not None:
+                            self._record_outcome("errors", op, error=str(error), results=results)
+                            continue
+                        self._record_outcome("copied", op, destination_path, results=results)
+                        self.history.add_to_batch(str(op.source), str(destination_path), file_hash=file_hash)
+                        if file_hash and self.incremental:
+                            self.scan_index.record_hash(str(destination_path), file_hash)
+                    if file_hash and self.incremental:
+                        self.scan_index.record_hash(str(primary.source), file_hash)
+                
+                if progress_callback:
+                    progress_callback(processed, total)
+        
+        self.history.finish_batch()
+        self._outcome_callback = None
+        if self.verify_copies and self.incremental:
+            self.scan_index.save_index()
+        
+        message_parts = []
+        for folder, results in self.destination_results.items():
+            part = f"{Path(folder).name}: {len(results['copied'])} copiados"
+            if results["skipped"]:
+                part += f", {len(results['skipped'])} omitidos"
+            if results["errors"]:
+                part += f", {len(results['errors'])} errores"
+            message_parts.append(part)
+        
+        copied = sum(len(r["copied"]) + len(r["skipped"]) for r in self.destination_results.values())
+        return copied > 0, " | ".join(message_parts)
+    
+    def _mark_organized(self, folder: Path):
+        """Deja la marca que poda la carpeta en los siguientes escaneos del origen."""
+        if folder == self.destination_folder or folder in self.source_folders:
+            return
+        marker = folder / ORGANIZED_MARKER
+        try:
+            marker.touch()
+        except OSError:
+            return
+        self.history.add_marker(str(marker))
+    
+    def _finish_packed(self, entries: List[Tuple[PlannedOperation, str, Path, str]]):
+        """Anota los archivos de un paquete ya cerrado en disco; al mover, borra entonces los orígenes."""
+        for op, operation, archive, member in entries:
+            if operation == "move":
+                try:
+                    op.source.unlink()
+                except OSError as e:
+                    self._record_outcome("errors", op, archive, f"empaquetado pero no se pudo borrar el origen ({e})")
+                    continue
+            self._record_outcome("moved" if operation == "move" else "copied", op, archive)
+            self.history.add_to_batch(str(op.source), str(archive), "packed", member=member)
+    
+    def _commit_move_window(self, window: List[Tuple[PlannedOperation, Path, Optional[str]]]):
+        """
+        Cierra una ventana de movimientos entre discos: sincroniza los destinos,
+        borra los orígenes y la anota en el historial. Si la sincronización falla
+        se descartan las copias y los orígenes quedan intactos.
+        """
+        try:
+            sync_paths([destination for _, destination, _ in window])
+        except OSError as e:
+            for op, destination, _ in window:
+                try:
+                    destination.unlink()
+                except OSError:
+                    pass
+                self._record_outcome("errors", op, error=f"no se pudo sincronizar el destino ({e})")
+            return
+        
+        for op, destination, file_hash in window:
+            try:
+                op.source.unlink()
+            except OSError as e:
+                self._record_outcome("errors", op, destination, f"copiado pero no se pudo borrar el origen ({e})")
+                continue
+            self._record_outcome("moved", op, destination)
+            self.history.add_to_batch(str(op.source), str(destination), file_hash=file_hash)
+        self.history.save_history()
+    
+    def _skip_identical(self, op: PlannedOperation, operation: str) -> bool:
+        """
+        Aplica una operación 'skip' del plan: si el destino sigue ahí con el mismo
+        contenido no se copia nada y, al mover, se borra el origen. Devuelve False si
+        el destino ha cambiado y hay que procesar el archivo con normalidad.
+        """
+        try:
+            if not _same_content(op.source, op.destination):
+                return False
+        except OSError:
+            return False
+        
+        if operation == "move":
+            op.source.unlink()
+            self.history.add_to_batch(str(op.source), str(op.destination), "removed")
+        self._record_outcome("skipped", op, op.destination)
+        return True
+    
+    def _record_outcome(self, status: str, op: PlannedOperation, destination: Path = None, error: str = None,
+                        results: dict = None):
+        """Anota el resultado de una operación en self.results (o results) y lo notifica a outcome_callback."""
+        if results is None:
+            results = self.results
+        if status == "errors":
+            results["errors"].append(f"{op.source.name}: {error}")
+        else:
+            results[status].append(str(op.source))
+        if self._outcome_callback:
+            self._outcome_callback({
+                "status": status,
+                "source": str(op.source),
+                "destination": str(destination) if destination else None,
+                "error": error
+            })
     
     def undo_last(self, progress_callback=None) -> Tuple[bool, str]:
         return self.history.undo_last_batch(progress_callback)
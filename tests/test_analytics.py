@@ -0,0 +1,60 @@
+import os
+import random
+from datetime import datetime
+
+from organizer import FileInfo, FileOrganizer, FolderAnalytics
+
+
+def _write(path, size, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_top_n_heaps_match_a_full_sort(tmp_path):
+    rng = random.Random(7)
+    files = []
+    for i in range(60):
+        path = _write(tmp_path / f"f{i}.bin", rng.randrange(1, 5000), rng.randrange(1_000_000, 2_000_000_000))
+        files.append(FileInfo(path))
+    
+    analytics = FolderAnalytics(tmp_path, top_n=5)
+    for file_info in files:
+        analytics.add(file_info)
+    
+    by_size = sorted(files, key=lambda f: f.size, reverse=True)[:5]
+    by_age = sorted(files, key=lambda f: f.modified_date)[:5]
+    assert [row["size"] for row in analytics.get_largest()] == [f.size for f in by_size]
+    assert [row["path"] for row in analytics.get_oldest()] == [str(f.path) for f in by_age]
+    assert analytics.total_files == 60
+    assert analytics.total_bytes == sum(f.size for f in files)
+
+
+def test_tables_aggregate_counts_and_bytes(tmp_path):
+    mtime = datetime(2020, 6, 1).timestamp()
+    _write(tmp_path / "a.txt", 10, mtime)
+    _write(tmp_path / "fotos" / "b.jpg", 30, mtime)
+    _write(tmp_path / "fotos" / "viaje" / "c.jpg", 20, datetime(2022, 1, 1).timestamp())
+    
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(tmp_path))
+    organizer.set_recursive(True)
+    report = organizer.analyze(top_n=2).to_dict()
+    
+    assert report["by_extension"] == [{"key": ".jpg", "count": 2, "bytes": 50},
+                                      {"key": ".txt", "count": 1, "bytes": 10}]
+    assert report["by_folder"] == [{"key": "fotos", "count": 2, "bytes": 50},
+                                   {"key": ".", "count": 1, "bytes": 10}]
+    assert {row["key"]: row["count"] for row in report["by_year"]} == {"2020": 2, "2022": 1}
+    assert [row["size"] for row in report["largest"]] == [30, 20]
+
+
+def test_tables_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(FolderAnalytics, "MAX_KEYS", 3)
+    analytics = FolderAnalytics(tmp_path)
+    for i in range(10):
+        analytics.add(FileInfo(_write(tmp_path / f"f.e{i}", 1, 1_000_000)))
+    
+    assert len(analytics.by_extension) == 4
+    assert analytics.by_extension[FolderAnalytics.OTHER_KEY] == [7, 7]
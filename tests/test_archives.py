@@ -0,0 +1,51 @@
+import warnings
+import zipfile
+
+from organizer import FileInfo, iter_archive_members, hash_archive_members, FileOrganizer
+
+
+def _zip_with_repeated_name(path):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("a.txt", "primero")
+            archive.writestr("a.txt", "segundo")
+
+
+def test_repeated_member_names_are_hashed_separately(tmp_path):
+    path = tmp_path / "x.zip"
+    _zip_with_repeated_name(path)
+    members = list(iter_archive_members(FileInfo(path)))
+    assert len(members) == 2
+    hash_archive_members(path, members)
+    assert members[0].hash != members[1].hash
+
+
+def test_invalid_member_date_keeps_the_archive(tmp_path):
+    path = tmp_path / "y.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("ok.txt", "ok")
+        archive.writestr("mal.txt", "mal")
+    # date_time con mes 0: datetime() lanza ValueError
+    data = bytearray(path.read_bytes())
+    offset = data.rfind(b"PK\x01\x02")
+    data[offset + 14:offset + 16] = (0).to_bytes(2, "little")
+    path.write_bytes(bytes(data))
+
+    names = sorted(member.member for member in iter_archive_members(FileInfo(path)))
+    assert names == ["mal.txt", "ok.txt"]
+
+
+def test_duplicate_of_second_repeated_member(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    _zip_with_repeated_name(source / "x.zip")
+    (source / "suelto.txt").write_text("segundo")
+
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    organizer.set_scan_archives(True)
+    duplicates = organizer.find_duplicates()
+    assert len(duplicates) == 1
+    (group,) = duplicates.values()
+    assert sorted(f.name for f in group) == ["a.txt", "suelto.txt"]
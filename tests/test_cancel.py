@@ -0,0 +1,43 @@
+import threading
+
+from organizer import FileOrganizer
+
+
+def _tree(tmp_path, folders=5):
+    for i in range(folders):
+        folder = tmp_path / f"carpeta{i}"
+        folder.mkdir()
+        (folder / "a.txt").write_text("igual")
+        (folder / "b.txt").write_text(f"distinto {i}")
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(tmp_path))
+    organizer.set_recursive(True)
+    return organizer
+
+
+def test_scan_stops_when_cancelled(tmp_path):
+    organizer = _tree(tmp_path)
+    cancel_event = threading.Event()
+    seen = []
+    for file_info in organizer.iter_files(cancel_event):
+        seen.append(file_info)
+        cancel_event.set()
+    assert 0 < len(seen) < 10
+
+
+def test_find_duplicates_stops_when_cancelled(tmp_path):
+    organizer = _tree(tmp_path)
+    files = organizer.get_files()
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert organizer.find_duplicates(files=files, cancel_event=cancel_event) == {}
+    assert len(organizer.find_duplicates(files=files)) == 1
+
+
+def test_external_finder_stops_when_cancelled(tmp_path):
+    organizer = _tree(tmp_path)
+    organizer.set_duplicate_memory_limit(1024 * 1024)
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert organizer.find_duplicates(cancel_event=cancel_event) == {}
+    assert len(organizer.find_duplicates()) == 1
@@ -0,0 +1,81 @@
+import os
+import struct
+from datetime import datetime
+
+from organizer import FileOrganizer, QUICKTIME_EPOCH_OFFSET, read_capture_date
+
+CAPTURED = datetime(2021, 5, 6, 7, 8, 9)
+
+
+def _exif_jpeg() -> bytes:
+    date = CAPTURED.strftime("%Y:%m:%d %H:%M:%S").encode() + b"\0"
+    # IFD0 con un puntero al IFD Exif, que guarda DateTimeOriginal fuera de la entrada
+    tiff = b"II*\0" + struct.pack("<I", 8)
+    tiff += struct.pack("<H", 1) + struct.pack("<HHII", 0x8769, 4, 1, 26) + struct.pack("<I", 0)
+    tiff += struct.pack("<H", 1) + struct.pack("<HHII", 0x9003, 2, len(date), 44) + struct.pack("<I", 0)
+    tiff += date
+    app1 = b"Exif\0\0" + tiff
+    return b"\xff\xd8" + b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1 + b"\xff\xd9"
+
+
+def _box(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I4s", len(body) + 8, kind) + body
+
+
+def _mp4(version: int = 0) -> bytes:
+    created = int(CAPTURED.timestamp()) + QUICKTIME_EPOCH_OFFSET
+    if version == 1:
+        mvhd = bytes([1, 0, 0, 0]) + struct.pack(">QQ", created, created) + bytes(88)
+    else:
+        mvhd = bytes(4) + struct.pack(">II", created, created) + bytes(88)
+    return _box(b"ftyp", b"isom" + bytes(4)) + _box(b"free", bytes(32)) + _box(b"moov", _box(b"mvhd", mvhd))
+
+
+def test_jpeg_exif_date(tmp_path):
+    path = tmp_path / "foto.jpg"
+    path.write_bytes(_exif_jpeg())
+    assert read_capture_date(path) == CAPTURED
+
+
+def test_mp4_creation_date(tmp_path):
+    for version in (0, 1):
+        path = tmp_path / f"video{version}.mp4"
+        path.write_bytes(_mp4(version))
+        assert read_capture_date(path) == CAPTURED
+
+
+def test_truncated_headers_never_raise(tmp_path):
+    for name, data in (("foto.jpg", _exif_jpeg()), ("video.mp4", _mp4()), ("video.mov", _mp4(1))):
+        path = tmp_path / name
+        for length in range(len(data)):
+            path.write_bytes(data[:length])
+            assert read_capture_date(path) in (None, CAPTURED)
+
+
+def test_files_without_metadata(tmp_path):
+    (tmp_path / "vacio.jpg").write_bytes(b"")
+    (tmp_path / "texto.jpg").write_bytes(b"no es una imagen")
+    (tmp_path / "otro.mp4").write_bytes(_box(b"ftyp", b"isom"))
+    for name in ("vacio.jpg", "texto.jpg", "otro.mp4", "no_existe.jpg"):
+        assert read_capture_date(tmp_path / name) is None
+
+
+def test_organize_by_capture_date(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "foto.jpg").write_bytes(_exif_jpeg())
+    (source / "video.mp4").write_bytes(_mp4())
+    os.utime(source / "foto.jpg", (0, 0))
+    destination = tmp_path / "dst"
+    destination.mkdir()
+    
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    organizer.set_destination_folder(str(destination))
+    organizer.set_organize_by("date")
+    organizer.set_date_granularity("month")
+    organizer.set_date_source("capture")
+    success, _ = organizer.organize()
+    assert success
+    assert (destination / "2021" / "05" / "foto.jpg").exists()
+    assert (destination / "2021" / "05" / "video.mp4").exists()
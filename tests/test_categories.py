@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from organizer import EXTENSION_TO_CATEGORY, FileOrganizer, build_category_index
+
+
+def test_index_normalizes_extensions():
+    index = build_category_index({"Fotos": ["JPG", ".Png"], "Notas": ["md"]})
+    assert index == {".jpg": "Fotos", ".png": "Fotos", ".md": "Notas"}
+    assert EXTENSION_TO_CATEGORY[".pdf"] == "Documentos"
+
+
+def test_user_table_overrides_and_extends(tmp_path):
+    table = tmp_path / "categorias.json"
+    table.write_text(json.dumps({"Lecturas": [".pdf", ".md"]}), encoding="utf-8")
+    organizer = FileOrganizer()
+    assert organizer.load_categories(table) == 1
+    assert organizer.get_category(".pdf") == "Lecturas"
+    assert organizer.get_category(".md") == "Lecturas"
+    assert organizer.get_category(".mp3") == "Audio"
+    assert organizer.get_category(".xyz") == "Otros"
+    
+    organizer.load_categories(table, replace=True)
+    assert organizer.get_category(".mp3") == "Otros"
+
+
+def test_invalid_table_is_rejected(tmp_path):
+    table = tmp_path / "categorias.json"
+    table.write_text(json.dumps({"Lecturas": ".pdf"}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        FileOrganizer().load_categories(table)
+
+
+def test_organize_by_category(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    for name in ("foto.JPG", "nota.txt", "raro.xyz"):
+        (source / name).write_text(name)
+    destination = tmp_path / "dst"
+    destination.mkdir()
+    
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    organizer.set_destination_folder(str(destination))
+    organizer.set_organize_by("category")
+    success, _ = organizer.organize()
+    assert success
+    assert (destination / "Imágenes" / "foto.JPG").exists()
+    assert (destination / "Documentos" / "nota.txt").exists()
+    assert (destination / "Otros" / "raro.xyz").exists()
@@ -0,0 +1,75 @@
+import random
+
+from organizer import CDC_GEAR, CDC_MASK64, ChunkAnalyzer, FileInfo
+
+
+def _reference_cut(analyzer, data, start, end):
+    """Gear hash de FastCDC byte a byte, tal como lo describe el algoritmo."""
+    length = min(end - start, analyzer.max_size)
+    if end - start <= analyzer.min_size:
+        return end - start
+    normal = min(analyzer.avg_size, length)
+    h = 0
+    for i in range(analyzer.min_size, length):
+        h = ((h << 1) + CDC_GEAR[data[start + i]]) & CDC_MASK64
+        mask = analyzer.mask_strict if i < normal else analyzer.mask_loose
+        if not h & mask:
+            return i + 1
+    return length
+
+
+def _cuts(analyzer, data, cut_point):
+    cuts = []
+    position = 0
+    while position < len(data):
+        cut = cut_point(analyzer, data, position, len(data))
+        cuts.append(cut)
+        position += cut
+    return cuts
+
+
+def test_cut_points_match_the_reference():
+    data = bytearray(random.Random(1).randbytes(200_000))
+    for options in ({}, {"min_size": 64, "avg_size": 256, "max_size": 1024},
+                    {"min_size": 512, "avg_size": 256, "max_size": 4096}):
+        analyzer = ChunkAnalyzer(**options)
+        assert _cuts(analyzer, data, ChunkAnalyzer._cut_point) == _cuts(analyzer, data, _reference_cut)
+
+
+def test_chunk_sizes_are_bounded(tmp_path):
+    path = tmp_path / "datos.bin"
+    path.write_bytes(random.Random(2).randbytes(300_000))
+    analyzer = ChunkAnalyzer(min_size=256, avg_size=1024, max_size=4096, read_size=5000)
+    sizes = [size for _, size in analyzer.iter_chunks(path)]
+    assert sum(sizes) == 300_000
+    assert all(256 < size <= 4096 for size in sizes[:-1])
+    
+    zeros = tmp_path / "ceros.bin"
+    zeros.write_bytes(bytes(20_000))
+    assert {size for _, size in analyzer.iter_chunks(zeros)} <= {4096, 20_000 % 4096}
+
+
+def test_boundaries_resynchronize_after_an_insertion(tmp_path):
+    data = random.Random(3).randbytes(200_000)
+    (tmp_path / "a.bin").write_bytes(data)
+    (tmp_path / "b.bin").write_bytes(data[:50_000] + b"insertado" + data[50_000:])
+    analyzer = ChunkAnalyzer(min_size=512, avg_size=2048, max_size=8192)
+    
+    first = {fp for fp, _ in analyzer.iter_chunks(tmp_path / "a.bin")}
+    second = {fp for fp, _ in analyzer.iter_chunks(tmp_path / "b.bin")}
+    assert len(first & second) >= len(first) - 3
+    
+    analyzer.analyze([FileInfo(tmp_path / "a.bin"), FileInfo(tmp_path / "b.bin")])
+    report = analyzer.get_report()
+    assert report["top_pairs"][0]["file_a"].endswith("a.bin")
+    assert report["top_pairs"][0]["shared_bytes"] > 180_000
+    assert report["sample_rate"] == 1
+
+
+def test_full_index_switches_to_sampling(tmp_path):
+    path = tmp_path / "datos.bin"
+    path.write_bytes(random.Random(4).randbytes(100_000))
+    analyzer = ChunkAnalyzer(min_size=64, avg_size=256, max_size=1024, max_entries=50)
+    analyzer.add_file(path)
+    assert len(analyzer.index) <= 50
+    assert analyzer.get_report()["sample_rate"] < 1
@@ -0,0 +1,86 @@
+from organizer import FileOrganizer
+
+
+def _organizer(source, destination):
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    organizer.set_destination_folder(str(destination))
+    organizer.set_destination_rules("*.txt -> Textos")
+    organizer.set_operation("move")
+    organizer.set_collision_policy("skip_identical")
+    return organizer
+
+
+def test_stale_skip_does_not_delete_source(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("uno")
+    destination = tmp_path / "dst"
+    (destination / "Textos").mkdir(parents=True)
+    (destination / "Textos" / "a.txt").write_text("uno")
+    
+    organizer = _organizer(source, destination)
+    plan = organizer.build_plan(organizer.get_files())
+    assert plan.operations[0].operation == "skip"
+    
+    (destination / "Textos" / "a.txt").write_text("dos")
+    organizer.execute_plan(plan)
+    assert not (source / "a.txt").exists()
+    assert (destination / "Textos" / "a.txt").read_text() == "dos"
+    assert (destination / "Textos" / "a_1.txt").read_text() == "uno"
+
+
+def test_identical_skip_removes_source(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("uno")
+    destination = tmp_path / "dst"
+    (destination / "Textos").mkdir(parents=True)
+    (destination / "Textos" / "a.txt").write_text("uno")
+    
+    organizer = _organizer(source, destination)
+    organizer.execute_plan(organizer.build_plan(organizer.get_files()))
+    assert not (source / "a.txt").exists()
+    assert not (destination / "Textos" / "a_1.txt").exists()
+
+
+def test_copy_skip_rechecks_content(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("uno")
+    destination = tmp_path / "dst"
+    (destination / "Textos").mkdir(parents=True)
+    (destination / "Textos" / "a.txt").write_text("uno")
+    
+    organizer = _organizer(source, destination)
+    organizer.set_operation("copy")
+    plan = organizer.build_plan(organizer.get_files())
+    assert plan.operations[0].operation == "skip"
+    
+    (destination / "Textos" / "a.txt").write_text("dos")
+    organizer.execute_plan(plan)
+    assert (destination / "Textos" / "a.txt").read_text() == "dos"
+    assert (destination / "Textos" / "a_1.txt").read_text() == "uno"
+
+
+def test_mirror_skip_rechecks_content(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("uno")
+    destination = tmp_path / "dst"
+    mirror = tmp_path / "espejo"
+    for folder in (destination, mirror):
+        (folder / "Textos").mkdir(parents=True)
+        (folder / "Textos" / "a.txt").write_text("uno")
+    
+    organizer = _organizer(source, destination)
+    organizer.set_operation("copy")
+    files = organizer.get_files()
+    plans = [organizer.build_plan(files), organizer.build_plan(files, mirror)]
+    assert [plan.operations[0].operation for plan in plans] == ["skip", "skip"]
+    
+    (mirror / "Textos" / "a.txt").write_text("dos")
+    organizer.execute_mirrored(plans)
+    assert (mirror / "Textos" / "a.txt").read_text() == "dos"
+    assert (mirror / "Textos" / "a_1.txt").read_text() == "uno"
+    assert not (destination / "Textos" / "a_1.txt").exists()
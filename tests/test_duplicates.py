@@ -0,0 +1,85 @@
+import os
+
+from organizer import DuplicateResolver, FileInfo, FileOrganizer, OrganizationHistory
+
+
+def _resolve(paths, tmp_path, policy="oldest", trash_folder=None):
+    files = [FileInfo(path) for path in paths]
+    resolver = DuplicateResolver({"grupo": files}, policy)
+    return resolver.resolve(OrganizationHistory(tmp_path / "historial.json"), trash_folder)
+
+
+def test_symlink_is_not_a_duplicate(tmp_path):
+    data = tmp_path / "data.txt"
+    data.write_text("contenido")
+    (tmp_path / "l").symlink_to(data)
+    
+    results = _resolve([data, tmp_path / "l"], tmp_path, policy="shortest_path")
+    assert results["removed"] == []
+    assert data.read_text() == "contenido"
+
+
+def test_hard_links_are_collapsed(tmp_path):
+    data = tmp_path / "data.txt"
+    data.write_text("contenido")
+    os.link(data, tmp_path / "enlace.txt")
+    
+    results = _resolve([data, tmp_path / "enlace.txt"], tmp_path)
+    assert results["removed"] == []
+    assert data.exists() and (tmp_path / "enlace.txt").exists()
+
+
+def test_changed_keeper_skips_removal(tmp_path):
+    keeper = tmp_path / "a.txt"
+    copy = tmp_path / "b.txt"
+    keeper.write_text("igual")
+    copy.write_text("igual")
+    os.utime(keeper, (1_000_000, 1_000_000))
+    files = [FileInfo(keeper), FileInfo(copy)]
+    keeper.write_text("otro!")
+    os.utime(keeper, (1_000_000, 1_000_000))
+    
+    resolver = DuplicateResolver({"grupo": files}, "oldest")
+    results = resolver.resolve(OrganizationHistory(tmp_path / "historial.json"))
+    assert results["removed"] == []
+    assert copy.read_text() == "igual"
+
+
+def test_identical_copy_is_removed(tmp_path):
+    keeper = tmp_path / "a.txt"
+    copy = tmp_path / "b.txt"
+    keeper.write_text("igual")
+    copy.write_text("igual")
+    os.utime(keeper, (1_000_000, 1_000_000))
+    
+    results = _resolve([keeper, copy], tmp_path)
+    assert results["removed"] == [str(copy)]
+    assert keeper.exists() and not copy.exists()
+
+
+def test_preferred_root_through_a_symlink(tmp_path):
+    real = tmp_path / "real"
+    real.mkdir()
+    keeper = real / "foto.jpg"
+    keeper.write_text("igual")
+    copy = tmp_path / "copia.jpg"
+    copy.write_text("igual")
+    os.utime(copy, (1_000_000, 1_000_000))
+    (tmp_path / "enlace").symlink_to(real)
+    
+    resolver = DuplicateResolver({}, "preferred_root", tmp_path / "enlace")
+    assert resolver.choose_keeper([FileInfo(copy), FileInfo(keeper)]).path == keeper
+
+
+def test_custom_excluded_dirs_still_skip_the_trash(tmp_path):
+    (tmp_path / "a.txt").write_text("igual")
+    (tmp_path / "b.txt").write_text("igual")
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(tmp_path))
+    organizer.set_recursive(True)
+    organizer.set_excluded_dirs("node_modules")
+    organizer.find_duplicates()
+    organizer.resolve_duplicates(use_trash=True)
+    
+    assert (tmp_path / ".papelera_duplicados").is_dir()
+    assert organizer.find_duplicates(files=organizer.get_files()) == {}
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import organizer
+from organizer import FileOrganizer, sync_paths
+
+
+@pytest.fixture
+def other_device(tmp_path):
+    """Carpeta en otro sistema de archivos (/dev/shm) para forzar movimientos entre discos."""
+    if not os.path.isdir("/dev/shm") or os.stat("/dev/shm").st_dev == os.stat(tmp_path).st_dev:
+        pytest.skip("no hay un segundo sistema de archivos disponible")
+    folder = Path(tempfile.mkdtemp(dir="/dev/shm"))
+    yield folder
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+def _organizer(source, destination, window_files):
+    file_organizer = FileOrganizer()
+    file_organizer.set_source_folder(str(source))
+    file_organizer.set_destination_folder(str(destination))
+    file_organizer.set_operation("move")
+    file_organizer.set_destination_rules("*.txt -> Textos")
+    file_organizer.set_durable_moves(True, window_files=window_files)
+    return file_organizer
+
+
+def _sources(tmp_path, count):
+    source = tmp_path / "src"
+    source.mkdir()
+    for i in range(count):
+        (source / f"f{i}.txt").write_text(f"archivo {i}")
+    return source
+
+
+def test_moves_commit_in_windows(tmp_path, other_device, monkeypatch):
+    source = _sources(tmp_path, 5)
+    file_organizer = _organizer(source, other_device, window_files=2)
+    windows = []
+    commit = file_organizer._commit_move_window
+    monkeypatch.setattr(file_organizer, "_commit_move_window",
+                        lambda window: (windows.append(len(window)), commit(window)))
+    
+    success, _ = file_organizer.organize()
+    assert success
+    assert windows == [2, 2, 1]
+    assert list(source.iterdir()) == []
+    assert sorted(p.read_text() for p in (other_device / "Textos").iterdir()) == [
+        f"archivo {i}" for i in range(5)]
+    assert len(file_organizer.history.batches[-1]["operations"]) == 5
+
+
+def test_failed_sync_keeps_the_sources(tmp_path, other_device, monkeypatch):
+    source = _sources(tmp_path, 3)
+    
+    def failing_sync(paths):
+        raise OSError("disco lleno")
+    
+    monkeypatch.setattr(organizer, "sync_paths", failing_sync)
+    file_organizer = _organizer(source, other_device, window_files=10)
+    file_organizer.organize()
+    assert len(list(source.iterdir())) == 3
+    assert list((other_device / "Textos").iterdir()) == []
+    assert len(file_organizer.results["errors"]) == 3
+
+
+def test_sync_falls_back_to_fsync(tmp_path, monkeypatch):
+    monkeypatch.setattr(organizer, "sync_filesystem", lambda path: False)
+    synced = []
+    monkeypatch.setattr(organizer, "_fsync_path", lambda path, directory=False: synced.append((path, directory)))
+    (tmp_path / "a").mkdir()
+    paths = [tmp_path / "a" / "1.txt", tmp_path / "a" / "2.txt", tmp_path / "3.txt"]
+    for path in paths:
+        path.write_text("x")
+    
+    sync_paths(paths)
+    assert [path for path, directory in synced if not directory] == paths
+    assert sorted(path for path, directory in synced if directory) == [tmp_path, tmp_path / "a"]
+
+
+def test_syncfs_is_linux_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(organizer.sys, "platform", "win32")
+    assert organizer.sync_filesystem(tmp_path) is False
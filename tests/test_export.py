@@ -0,0 +1,21 @@
+import csv
+
+from organizer import FileOrganizer
+
+
+def test_export_duplicates_streams_groups(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("igual")
+    (source / "b.txt").write_text("igual")
+    (source / "c.txt").write_text("otro")
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    organizer.duplicate_finder.duplicates = {"previo": []}
+    
+    output = tmp_path / "duplicados.csv"
+    assert organizer.export_duplicates(output) == 2
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(row["path"].rsplit("/", 1)[-1] for row in rows) == ["a.txt", "b.txt"]
+    assert organizer.duplicate_finder.duplicates == {"previo": []}
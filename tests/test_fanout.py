@@ -0,0 +1,31 @@
+import pytest
+
+import organizer
+from organizer import copy_file_fanout
+
+
+def test_source_error_removes_every_destination(tmp_path, monkeypatch):
+    source = tmp_path / "origen.bin"
+    source.write_bytes(b"x" * 4096)
+    destinations = [str(tmp_path / "a.bin"), str(tmp_path / "b.bin")]
+    
+    def failing_stream(*args, **kwargs):
+        yield b"x" * 1024
+        raise OSError("error de lectura")
+    
+    monkeypatch.setattr(organizer, "_stream_file", failing_stream)
+    with pytest.raises(OSError):
+        copy_file_fanout(str(source), destinations)
+    assert not any((tmp_path / name).exists() for name in ("a.bin", "b.bin"))
+
+
+def test_copies_to_every_destination(tmp_path):
+    source = tmp_path / "origen.bin"
+    source.write_bytes(b"datos" * 1000)
+    destinations = [str(tmp_path / "a.bin"), str(tmp_path / "b.bin")]
+    
+    file_hash, errors = copy_file_fanout(str(source), destinations, verify=True)
+    assert errors == {}
+    assert file_hash is not None
+    assert (tmp_path / "a.bin").read_bytes() == source.read_bytes()
+    assert (tmp_path / "b.bin").read_bytes() == source.read_bytes()
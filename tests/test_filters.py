@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from organizer import compile_patterns, split_patterns, FileFilter, FileInfo, PatternSet, RuleEngine
+
+
+def test_regex_quantifier_keeps_its_comma():
+    assert split_patterns(r"re:^\d{1,3}\.log$, *.bak") == [r"re:^\d{1,3}\.log$", " *.bak"]
+    pattern = compile_patterns(r"re:^\d{1,3}\.log$, *.bak")
+    assert pattern.search("12.log")
+    assert pattern.search("copia.bak")
+    assert not pattern.search("1234.log")
+
+
+def test_plain_patterns_still_split_on_commas():
+    pattern = compile_patterns("informe, *.tmp")
+    assert pattern.search("Informe_2024.pdf")
+    assert pattern.search("x.tmp")
+    assert not pattern.search("notas.txt")
+
+
+def test_uncombinable_regexes_fall_back_to_one_by_one():
+    # Un flag en medio de la alternativa es un error en Python 3.11+
+    pattern = compile_patterns(["re:foo", "re:(?i)bar"])
+    assert pattern.search("xbar")
+    assert pattern.search("foo")
+
+
+def test_numbered_backreference_is_not_shifted():
+    pattern = compile_patterns([r"re:(a)x", r"re:(b)\1"])
+    assert isinstance(pattern, PatternSet)
+    assert pattern.search("bb")
+    assert not pattern.search("ba")
+
+
+def test_file_filter_with_bad_combination_does_not_raise():
+    file_filter = FileFilter(include=["re:a", "re:(?i)b"])
+    assert file_filter.match_name("b.txt")
+
+
+def test_numbered_backreference_is_not_shifted(tmp_path):
+    engine = RuleEngine.parse("re:(q) -> A\nre:(\\w)\\1 -> B\n* -> C")
+    path = tmp_path / "aa.txt"
+    path.write_text("x")
+    assert engine.match(FileInfo(path), datetime.now()).template == "B"
@@ -0,0 +1,67 @@
+from organizer import FileOrganizer
+
+
+def _organizer(folder):
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(folder))
+    organizer.set_destination_folder(str(folder))
+    organizer.set_recursive(True)
+    organizer.set_operation("move")
+    organizer.set_destination_rules("*.txt -> Textos\n*.pdf -> Docs")
+    return organizer
+
+
+def _names(files, folder):
+    return sorted(str(f.path.relative_to(folder)) for f in files)
+
+
+def test_rerun_only_walks_new_files(tmp_path):
+    (tmp_path / "a.txt").write_text("igual")
+    (tmp_path / "b.pdf").write_text("pdf")
+    success, _ = _organizer(tmp_path).organize()
+    assert success
+    assert (tmp_path / "Textos" / "a.txt").exists()
+    
+    (tmp_path / "c.txt").write_text("igual")
+    organizer = _organizer(tmp_path)
+    plan = organizer.build_plan()
+    assert [op.source.name for op in plan.operations] == ["c.txt"]
+    
+    organizer = _organizer(tmp_path)
+    assert _names(organizer.get_files(), tmp_path) == ["Docs/b.pdf", "Textos/a.txt", "c.txt"]
+    duplicates = _organizer(tmp_path).find_duplicates()
+    assert [_names(group, tmp_path) for group in duplicates.values()] == [["Textos/a.txt", "c.txt"]]
+
+
+def test_duplicates_after_preview_see_organized_folders(tmp_path):
+    (tmp_path / "a.txt").write_text("igual")
+    _organizer(tmp_path).organize()
+    (tmp_path / "c.txt").write_text("igual")
+    
+    organizer = _organizer(tmp_path)
+    assert _names(organizer.get_files(prune_organized=True), tmp_path) == ["c.txt"]
+    assert len(organizer.find_duplicates()) == 1
+
+
+def test_existing_user_folders_are_not_marked(tmp_path):
+    (tmp_path / "Docs").mkdir()
+    (tmp_path / "Docs" / "viejo.pdf").write_text("pdf")
+    (tmp_path / "a.txt").write_text("texto")
+    (tmp_path / "b.pdf").write_text("nuevo")
+    _organizer(tmp_path).organize()
+    assert (tmp_path / "Docs" / "b.pdf").exists()
+    assert (tmp_path / "Textos" / ".organizado").exists()
+    assert not (tmp_path / "Docs" / ".organizado").exists()
+
+
+def test_undo_removes_the_markers(tmp_path):
+    (tmp_path / "a.txt").write_text("texto")
+    organizer = _organizer(tmp_path)
+    organizer.organize()
+    assert (tmp_path / "Textos" / ".organizado").exists()
+    organizer.undo_last()
+    assert not (tmp_path / "Textos" / ".organizado").exists()
+    
+    (tmp_path / "Textos" / "b.txt").write_text("otro")
+    rescanned = _organizer(tmp_path)
+    assert _names(rescanned.get_files(prune_organized=True), tmp_path) == ["Textos/b.txt", "a.txt"]
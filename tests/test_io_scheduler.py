@@ -0,0 +1,51 @@
+import os
+from types import SimpleNamespace
+
+from organizer import IOScheduler
+
+
+def _item(path, device, inode):
+    return SimpleNamespace(path=path, device=device, inode=inode)
+
+
+def _scheduler(monkeypatch, rotational):
+    scheduler = IOScheduler(use_fiemap=False)
+    monkeypatch.setattr(scheduler, "is_rotational", lambda device: device in rotational)
+    return scheduler
+
+
+def test_solid_state_keeps_the_original_order(monkeypatch):
+    items = [_item("c", 1, 30), _item("a", 1, 10), _item("b", 1, 20)]
+    assert _scheduler(monkeypatch, set()).order(items) == items
+
+
+def test_rotational_reads_follow_the_inode(monkeypatch):
+    items = [_item("c", 1, 30), _item("a", 1, 10), _item("b", 1, 20)]
+    ordered = _scheduler(monkeypatch, {1}).order(items)
+    assert [item.path for item in ordered] == ["a", "b", "c"]
+
+
+def test_devices_are_grouped_and_solid_state_keeps_its_order(monkeypatch):
+    items = [_item("ssd2", 2, 5), _item("hdd2", 1, 20), _item("ssd1", 2, 1), _item("hdd1", 1, 10)]
+    ordered = _scheduler(monkeypatch, {1}).order(items)
+    assert [item.path for item in ordered] == ["hdd1", "hdd2", "ssd2", "ssd1"]
+
+
+def test_custom_location(monkeypatch):
+    items = [("b", 2), ("a", 1)]
+    ordered = _scheduler(monkeypatch, {7}).order(items, location=lambda item: (item[0], 7, item[1]))
+    assert ordered == [("a", 1), ("b", 2)]
+
+
+def test_physical_offset_falls_back_to_the_inode(tmp_path):
+    data = tmp_path / "data.bin"
+    data.write_bytes(b"x" * 4096)
+    assert IOScheduler(use_fiemap=False).physical_offset(data, 42) == 42
+    assert IOScheduler().physical_offset(tmp_path / "no_existe", 42) == 42
+
+
+def test_unknown_device_is_not_rotational():
+    device = os.makedev(4095, 4095)
+    scheduler = IOScheduler()
+    assert scheduler.is_rotational(device) is False
+    assert scheduler._rotational == {device: False}
@@ -0,0 +1,26 @@
+from organizer import FileOrganizer
+
+
+def test_in_place_primary_keeps_mirror_names(tmp_path):
+    source = tmp_path / "S"
+    (source / "pdf").mkdir(parents=True)
+    (source / "in").mkdir()
+    (source / "pdf" / "a.pdf").write_text("contenido de a")
+    (source / "in" / "b.txt").write_text("contenido de b")
+    mirror = tmp_path / "M"
+    mirror.mkdir()
+    
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    organizer.set_destination_folder(str(source))
+    organizer.set_mirror_folders([str(mirror)])
+    organizer.set_recursive(True)
+    organizer.set_operation("copy")
+    organizer.set_destination_rules("*.pdf -> pdf\n*.txt -> txt")
+    success, _ = organizer.organize()
+    assert success
+    
+    assert (mirror / "pdf" / "a.pdf").read_text() == "contenido de a"
+    assert (mirror / "txt" / "b.txt").read_text() == "contenido de b"
+    assert (source / "txt" / "b.txt").read_text() == "contenido de b"
+    assert not (source / "pdf" / "a_1.pdf").exists()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from organizer import FileOrganizer
+
+
+def _roots(tmp_path, *names):
+    roots = []
+    for name in names:
+        root = tmp_path / name
+        root.mkdir(parents=True)
+        roots.append(root)
+    return roots
+
+
+def _spy_threads(file_organizer, monkeypatch):
+    """Anota en qué hilo se recorre cada carpeta de origen."""
+    threads = {}
+    scan_root = file_organizer._scan_root
+    
+    def spy(root, *args):
+        threads[root.name] = threading.current_thread().ident
+        yield from scan_root(root, *args)
+    
+    monkeypatch.setattr(file_organizer, "_scan_root", spy)
+    return threads
+
+
+def test_nested_and_repeated_roots_are_dropped(tmp_path):
+    a, b = _roots(tmp_path, "a", "b")
+    (a / "sub").mkdir()
+    file_organizer = FileOrganizer()
+    assert file_organizer.set_source_folders([str(a), str(a / "sub"), str(b), str(b), str(tmp_path / "no_existe")])
+    assert file_organizer.source_folders == [a.resolve(), b.resolve()]
+    assert not file_organizer.set_source_folders([str(tmp_path / "no_existe")])
+
+
+def test_duplicates_across_roots(tmp_path):
+    a, b = _roots(tmp_path, "a", "b")
+    (a / "foto.jpg").write_text("igual")
+    (b / "copia.jpg").write_text("igual")
+    (b / "otra.jpg").write_text("distinta")
+    file_organizer = FileOrganizer()
+    file_organizer.set_source_folders([str(a), str(b)])
+    
+    files = file_organizer.get_files()
+    assert sorted((f.root.name, f.name) for f in files) == [("a", "foto.jpg"), ("b", "copia.jpg"), ("b", "otra.jpg")]
+    groups = list(file_organizer.find_duplicates().values())
+    assert len(groups) == 1
+    assert sorted(f.name for f in groups[0]) == ["copia.jpg", "foto.jpg"]
+
+
+def test_roots_on_one_device_share_a_scanner(tmp_path, monkeypatch):
+    roots = _roots(tmp_path, "a", "b", "c")
+    for root in roots:
+        (root / f"{root.name}.txt").write_text(root.name)
+    file_organizer = FileOrganizer()
+    file_organizer.set_source_folders([str(root) for root in roots])
+    threads = _spy_threads(file_organizer, monkeypatch)
+    
+    assert len(file_organizer.get_files()) == 3
+    assert len(set(threads.values())) == 1
+    assert threading.get_ident() not in threads.values()
+
+
+def test_each_device_gets_its_own_scanner(tmp_path, monkeypatch):
+    if not os.path.isdir("/dev/shm") or os.stat("/dev/shm").st_dev == os.stat(tmp_path).st_dev:
+        pytest.skip("no hay un segundo sistema de archivos disponible")
+    other = Path(tempfile.mkdtemp(dir="/dev/shm"))
+    try:
+        (a,) = _roots(tmp_path, "a")
+        (a / "uno.txt").write_text("1")
+        (other / "dos.txt").write_text("2")
+        file_organizer = FileOrganizer()
+        file_organizer.set_source_folders([str(a), str(other)])
+        threads = _spy_threads(file_organizer, monkeypatch)
+        
+        assert sorted(f.name for f in file_organizer.get_files()) == ["dos.txt", "uno.txt"]
+        assert len(set(threads.values())) == 2
+    finally:
+        shutil.rmtree(other, ignore_errors=True)
+
+
+def test_stopping_early_releases_the_scanners(tmp_path):
+    roots = _roots(tmp_path, "a", "b")
+    for root in roots:
+        for i in range(300):
+            (root / f"{i}.txt").write_text("x")
+    file_organizer = FileOrganizer()
+    file_organizer.set_source_folders([str(root) for root in roots])
+    before = threading.active_count()
+    
+    files = file_organizer.iter_files()
+    next(files)
+    files.close()
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread() and thread.daemon:
+            thread.join(timeout=2)
+    assert threading.active_count() == before
@@ -0,0 +1,33 @@
+import os
+
+import organizer
+from organizer import FileOrganizer, OrganizationHistory
+
+
+def test_undo_reads_each_pack_index_once(tmp_path, monkeypatch):
+    source = tmp_path / "src"
+    source.mkdir()
+    for i in range(5):
+        (source / f"nota{i}.txt").write_text(f"nota {i}")
+    destination = tmp_path / "dst"
+    destination.mkdir()
+    
+    file_organizer = FileOrganizer()
+    file_organizer.history = OrganizationHistory(tmp_path / "historial.json")
+    file_organizer.set_source_folder(str(source))
+    file_organizer.set_destination_folder(str(destination))
+    file_organizer.set_destination_rules("*.txt -> Textos")
+    file_organizer.set_operation("move")
+    file_organizer.set_small_file_packing(1024)
+    success, _ = file_organizer.organize()
+    assert success
+    assert not any(name.endswith(".txt") for name in os.listdir(source))
+    
+    loads = []
+    original = organizer.load_pack_index
+    monkeypatch.setattr(organizer, "load_pack_index", lambda path: loads.append(path) or original(path))
+    file_organizer.undo_last()
+    assert len(loads) == 1
+    assert sorted(os.listdir(source)) == [f"nota{i}.txt" for i in range(5)]
+    assert (source / "nota3.txt").read_text() == "nota 3"
+    assert os.listdir(destination / "Textos") == []
@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+
+from organizer import FileOrganizer, OrganizePlan, PlannedOperation
+
+
+def _organizer(source, destination):
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    organizer.set_destination_folder(str(destination))
+    organizer.set_operation("copy")
+    organizer.set_destination_rules("*.txt -> Textos\n*.pdf -> Docs")
+    return organizer
+
+
+def _setup(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("uno")
+    (source / "b.pdf").write_text("dos")
+    destination = tmp_path / "dst"
+    destination.mkdir()
+    return source, destination
+
+
+def test_saved_plan_round_trips(tmp_path):
+    source, destination = _setup(tmp_path)
+    organizer = _organizer(source, destination)
+    plan = organizer.build_plan(organizer.get_files())
+    plan.save(tmp_path / "plan.json")
+    
+    loaded = OrganizePlan.load(tmp_path / "plan.json")
+    assert loaded.to_dict() == plan.to_dict()
+    assert loaded.destination_folder == destination
+    assert all(isinstance(op.source, Path) for op in loaded.operations)
+
+
+def test_loaded_plan_executes(tmp_path):
+    source, destination = _setup(tmp_path)
+    organizer = _organizer(source, destination)
+    organizer.build_plan(organizer.get_files()).save(tmp_path / "plan.json")
+    
+    success, _ = _organizer(source, destination).execute_plan(OrganizePlan.load(tmp_path / "plan.json"))
+    assert success
+    assert (destination / "Textos" / "a.txt").read_text() == "uno"
+    assert (destination / "Docs" / "b.pdf").read_text() == "dos"
+
+
+def test_diff_reports_missing_changed_and_new(tmp_path):
+    source, destination = _setup(tmp_path)
+    organizer = _organizer(source, destination)
+    plan = organizer.build_plan(organizer.get_files())
+    
+    (source / "a.txt").unlink()
+    (source / "b.pdf").write_text("dos, pero más largo")
+    (source / "c.txt").write_text("nuevo")
+    diff = plan.diff(_organizer(source, destination).get_files())
+    assert [op.source.name for op in diff["missing"]] == ["a.txt"]
+    assert [op.source.name for op in diff["changed"]] == ["b.pdf"]
+    assert [f.name for f in diff["new"]] == ["c.txt"]
+
+
+def test_same_device_moves_are_grouped_by_destination(tmp_path):
+    device = os.stat(tmp_path).st_dev
+    plan = OrganizePlan("move", tmp_path)
+    for source, folder in (("x/1", "B"), ("y/2", "A"), ("x/3", "B"), ("y/4", "A")):
+        plan.add(PlannedOperation(tmp_path / source, tmp_path / folder / "f", "move", 1, device=device))
+    
+    ordered = [op.destination.parent.name for op in plan.ordered()]
+    assert ordered == ["A", "A", "B", "B"]
@@ -0,0 +1,27 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from organizer import FileOrganizer
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="prioridad por hilo solo en Linux")
+def test_priority_applies_to_worker_thread_only():
+    main_nice = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+    organizer = FileOrganizer()
+    organizer.set_priority(main_nice + 5, None)
+    seen = {}
+
+    def work():
+        seen["ok"] = organizer.apply_priority()
+        seen["nice"] = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+
+    assert seen["ok"]
+    assert seen["nice"] == main_nice + 5
+    assert os.getpriority(os.PRIO_PROCESS, threading.get_native_id()) == main_nice
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+from organizer import DestinationRule, RuleEngine, FileOrganizer, FileInfo
+
+
+def test_glob_starting_with_size_is_a_name_pattern():
+    rule = DestinationRule.parse("sizes*.log -> Logs")
+    assert rule.regex.match("sizes_2024.log")
+    assert rule.min_size == 0
+
+
+def test_size_condition_still_parsed():
+    rule = DestinationRule.parse("*.iso size>1GB -> Imagenes")
+    assert rule.min_size == 1024 ** 3 + 1
+
+
+def test_strict_size_bounds_exclude_the_limit(tmp_path):
+    exact = tmp_path / "exacto.bin"
+    exact.write_bytes(b"x" * 1024)
+    file_info = FileInfo(exact)
+    now = datetime.now()
+    assert not DestinationRule.parse("* size<1KB -> Menores").matches(file_info, now)
+    assert not DestinationRule.parse("* size>1KB -> Mayores").matches(file_info, now)
+    assert DestinationRule.parse("* size<=1KB -> Hasta").matches(file_info, now)
+    assert DestinationRule.parse("* size>=1KB -> Desde").matches(file_info, now)
+
+
+def test_strict_size_bounds_keep_neighbours(tmp_path):
+    smaller = tmp_path / "menor.bin"
+    smaller.write_bytes(b"x" * 1023)
+    larger = tmp_path / "mayor.bin"
+    larger.write_bytes(b"x" * 1025)
+    now = datetime.now()
+    assert DestinationRule.parse("* size<1KB -> Menores").matches(FileInfo(smaller), now)
+    assert DestinationRule.parse("* size>1KB -> Mayores").matches(FileInfo(larger), now)
+
+
+def test_regex_with_spaces_stays_one_token():
+    rule = DestinationRule.parse(r"re:^informe \d+ final size<1MB -> Informes")
+    assert rule.regex.match("informe 12 final.pdf")
+    assert rule.max_size == 1024 ** 2 - 1
+
+
+def test_bad_format_spec_fails_when_parsing():
+    with pytest.raises(ValueError):
+        DestinationRule.parse("*.pdf -> Docs/{year:d}")
+    with pytest.raises(ValueError):
+        RuleEngine.parse("*.pdf -> Docs/{year")
+
+
+def test_render_error_only_skips_that_file(tmp_path, monkeypatch):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.pdf").write_text("a")
+    (source / "b.txt").write_text("b")
+    destination = tmp_path / "dst"
+    destination.mkdir()
+    
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    organizer.set_destination_folder(str(destination))
+    organizer.set_destination_rules("*.pdf -> Docs/{ext}")
+    original = RuleEngine.render
+    
+    def failing_render(rule, values):
+        if values["ext"] == "pdf":
+            raise ValueError("formato")
+        return original(rule, values)
+    
+    monkeypatch.setattr(RuleEngine, "render", staticmethod(failing_render))
+    plan = organizer.build_plan(organizer.get_files())
+    assert [op.source.name for op in plan.operations] == ["b.txt"]
+    assert len(plan.errors) == 1 and plan.errors[0].startswith("a.pdf")
@@ -0,0 +1,51 @@
+import os
+
+from organizer import FileOrganizer, ScanIndex
+
+
+def _old_folder(folder):
+    # Fuera de la ventana "racy" para que el índice reutilice el listado
+    os.utime(folder, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+
+
+def _organizer(tmp_path, source):
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    organizer.set_incremental(True, tmp_path / "index.json")
+    return organizer
+
+
+def test_same_size_edit_invalidates_cached_hash(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("aaaa")
+    (source / "b.txt").write_text("aaaa")
+    _old_folder(source)
+
+    organizer = _organizer(tmp_path, source)
+    assert len(organizer.find_duplicates()) == 1
+
+    # Edición en el sitio con el mismo tamaño: la carpeta no cambia de fecha
+    with open(source / "b.txt", "r+") as f:
+        f.write("bbbb")
+    os.utime(source / "b.txt", ns=(2_000_000_000_000_000_000, 2_000_000_000_000_000_000))
+    _old_folder(source)
+
+    organizer = _organizer(tmp_path, source)
+    assert organizer.find_duplicates() == {}
+    results = organizer.resolve_duplicates(policy="oldest", use_trash=False)
+    assert results["removed"] == []
+    assert (source / "b.txt").read_text() == "bbbb"
+    assert str(source / "b.txt") in [str(f.path) for f in organizer.get_scan_delta().modified]
+
+
+def test_valid_record_requires_matching_mtime(tmp_path):
+    path = tmp_path / "x.bin"
+    path.write_bytes(b"123")
+    index = ScanIndex(tmp_path / "index.json")
+    st = path.stat()
+    index.set_snapshot(tmp_path, {str(tmp_path): {
+        "mtime_ns": 0, "dev": st.st_dev, "count": 1, "dirs": [],
+        "files": {"x.bin": {"size": 3, "mtime_ns": st.st_mtime_ns - 1, "ino": st.st_ino, "hash": "viejo"}}
+    }}, False)
+    assert index.valid_record(str(path), st) is None
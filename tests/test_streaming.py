@@ -0,0 +1,69 @@
+import hashlib
+
+import organizer
+from organizer import choose_chunk_size, copy_file, get_file_hash, io_options
+
+
+def _record_advice(monkeypatch):
+    calls = []
+    monkeypatch.setattr(organizer, "_fadvise", lambda fd, offset, length, advice: calls.append(
+        (offset, length, advice)))
+    return calls
+
+
+def test_chunk_size_grows_with_the_file(monkeypatch):
+    monkeypatch.setattr(io_options, "memory_limit", None)
+    assert choose_chunk_size(1000) == 64 * 1024
+    assert choose_chunk_size(10 * 1024 * 1024) == 1024 * 1024
+    assert choose_chunk_size(1024 ** 3) == 4 * 1024 * 1024
+    
+    monkeypatch.setattr(io_options, "memory_limit", 100 * 1024)
+    assert choose_chunk_size(1024 ** 3) == 100 * 1024
+    monkeypatch.setattr(io_options, "memory_limit", 10)
+    assert choose_chunk_size(1024 ** 3) == 4096
+
+
+def test_large_reads_drop_the_cache_in_windows(tmp_path, monkeypatch):
+    monkeypatch.setattr(io_options, "drop_cache", True)
+    monkeypatch.setattr(io_options, "drop_window", 64 * 1024)
+    calls = _record_advice(monkeypatch)
+    data = bytes(range(256)) * 1024
+    path = tmp_path / "grande.bin"
+    path.write_bytes(data)
+    
+    assert get_file_hash(path, chunk_size=32 * 1024) == hashlib.md5(data).hexdigest()
+    assert calls[0] == (0, 0, "POSIX_FADV_SEQUENTIAL")
+    dropped = [(offset, length) for offset, length, advice in calls if advice == "POSIX_FADV_DONTNEED"]
+    assert dropped == [(0, 64 * 1024), (64 * 1024, 64 * 1024), (128 * 1024, 64 * 1024),
+                       (192 * 1024, 64 * 1024)]
+
+
+def test_small_files_and_disabled_option_give_no_advice(tmp_path, monkeypatch):
+    calls = _record_advice(monkeypatch)
+    small = tmp_path / "pequeño.txt"
+    small.write_bytes(b"hola")
+    monkeypatch.setattr(io_options, "drop_cache", True)
+    get_file_hash(small)
+    assert calls == []
+    
+    large = tmp_path / "grande.bin"
+    large.write_bytes(b"x" * (io_options.small_file + 1))
+    organizer.set_cache_friendly(False)
+    try:
+        get_file_hash(large)
+        copy_file(large, tmp_path / "copia.bin")
+    finally:
+        organizer.set_cache_friendly(True)
+    assert calls == []
+    assert (tmp_path / "copia.bin").read_bytes() == large.read_bytes()
+
+
+def test_copy_drops_written_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(io_options, "drop_cache", True)
+    calls = _record_advice(monkeypatch)
+    data = b"y" * (io_options.small_file * 2)
+    (tmp_path / "origen.bin").write_bytes(data)
+    
+    copy_file(tmp_path / "origen.bin", tmp_path / "destino.bin")
+    assert (tmp_path / "destino.bin").read_bytes() == data
+    assert (0, 0, "POSIX_FADV_DONTNEED") in calls
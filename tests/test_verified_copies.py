@@ -0,0 +1,105 @@
+import errno
+import os
+
+import pytest
+
+import organizer
+from organizer import FileOrganizer, copy_file_verified, get_file_hash
+
+
+class FailingIoctl:
+    @staticmethod
+    def ioctl(fd, request, arg):
+        raise OSError(errno.EOPNOTSUPP, "sin reflink")
+
+
+class CloningIoctl:
+    @staticmethod
+    def ioctl(fd, request, arg):
+        os.lseek(arg, 0, os.SEEK_SET)
+        os.write(fd, os.read(arg, 1 << 20))
+        os.lseek(arg, 0, os.SEEK_SET)
+
+
+def test_falls_back_to_copying_without_reflink(tmp_path, monkeypatch):
+    source = tmp_path / "origen.bin"
+    source.write_bytes(os.urandom(200_000))
+    monkeypatch.setattr(organizer, "fcntl", FailingIoctl)
+    file_hash = copy_file_verified(str(source), str(tmp_path / "copia.bin"))
+    assert (tmp_path / "copia.bin").read_bytes() == source.read_bytes()
+    assert file_hash == get_file_hash(source)
+
+
+def test_trusts_the_clone_and_hashes_the_source(tmp_path, monkeypatch):
+    source = tmp_path / "origen.bin"
+    source.write_bytes(b"clonado" * 1000)
+    monkeypatch.setattr(organizer, "fcntl", CloningIoctl)
+    monkeypatch.setattr(organizer, "get_file_hash", lambda *args: pytest.fail("no debe releer el clon"))
+    file_hash = copy_file_verified(str(source), str(tmp_path / "copia.bin"))
+    assert (tmp_path / "copia.bin").read_bytes() == source.read_bytes()
+    assert file_hash == organizer.hashlib.md5(source.read_bytes()).hexdigest()
+
+
+def test_mismatch_removes_the_copy(tmp_path, monkeypatch):
+    source = tmp_path / "origen.bin"
+    source.write_bytes(b"datos")
+    monkeypatch.setattr(organizer, "fcntl", FailingIoctl)
+    monkeypatch.setattr(organizer, "get_file_hash", lambda *args: "otro")
+    with pytest.raises(OSError):
+        copy_file_verified(str(source), str(tmp_path / "copia.bin"))
+    assert not (tmp_path / "copia.bin").exists()
+
+
+def _indexed_organizer(source, index_file, operation="copy"):
+    file_organizer = FileOrganizer()
+    file_organizer.set_source_folder(str(source))
+    file_organizer.set_destination_folder(str(source / "out"))
+    file_organizer.set_recursive(True)
+    file_organizer.set_incremental(True, index_file)
+    file_organizer.set_operation(operation)
+    file_organizer.set_destination_rules("*.txt -> txt")
+    return file_organizer
+
+
+def _rescan(source, index_file, monkeypatch):
+    monkeypatch.setattr(organizer, "get_file_hash", lambda *args: pytest.fail("no debe volver a hashear"))
+    rescanned = _indexed_organizer(source, index_file)
+    files = {str(f.path.relative_to(source)): f for f in rescanned.get_files()}
+    return files, rescanned.get_scan_delta()
+
+
+def test_rescan_reuses_the_verified_hash(tmp_path, monkeypatch):
+    source = tmp_path / "S"
+    (source / "out").mkdir(parents=True)
+    (source / "a.txt").write_text("contenido")
+    index_file = tmp_path / "indice.json"
+    
+    file_organizer = _indexed_organizer(source, index_file)
+    file_organizer.set_verify_copies(True)
+    success, _ = file_organizer.organize()
+    assert success
+    
+    files, delta = _rescan(source, index_file, monkeypatch)
+    expected = organizer.hashlib.md5(b"contenido").hexdigest()
+    assert files["out/txt/a.txt"].hash == expected
+    assert files["a.txt"].hash == expected
+    assert [str(f.path.relative_to(source)) for f in delta.added] == ["out/txt/a.txt"]
+
+
+def test_rename_keeps_the_indexed_hash(tmp_path, monkeypatch):
+    source = tmp_path / "S"
+    (source / "out").mkdir(parents=True)
+    (source / "a.txt").write_text("igual")
+    (source / "b.txt").write_text("igual")
+    index_file = tmp_path / "indice.json"
+    
+    file_organizer = _indexed_organizer(source, index_file, "move")
+    assert len(file_organizer.find_duplicates()) == 1
+    file_organizer._preview_files = []
+    success, _ = file_organizer.organize()
+    assert success
+    
+    files, _ = _rescan(source, index_file, monkeypatch)
+    expected = organizer.hashlib.md5(b"igual").hexdigest()
+    assert files["out/txt/a.txt"].hash == expected
+    assert files["out/txt/b.txt"].hash == expected
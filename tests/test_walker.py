@@ -0,0 +1,52 @@
+from organizer import FileOrganizer
+
+
+def _organizer(folder, **options):
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(folder))
+    organizer.set_recursive(True)
+    for name, value in options.items():
+        getattr(organizer, f"set_{name}")(value)
+    return organizer
+
+
+def _names(files, folder):
+    return sorted(f.path.relative_to(folder).as_posix() for f in files)
+
+
+def _tree(folder):
+    (folder / "a" / "b" / "c").mkdir(parents=True)
+    (folder / "raiz.txt").write_text("0")
+    (folder / "a" / "uno.txt").write_text("1")
+    (folder / "a" / "b" / "dos.txt").write_text("2")
+    (folder / "a" / "b" / "c" / "tres.txt").write_text("3")
+
+
+def test_max_depth_limits_the_walk(tmp_path):
+    _tree(tmp_path)
+    assert _names(_organizer(tmp_path, max_depth=0).get_files(), tmp_path) == ["raiz.txt"]
+    assert _names(_organizer(tmp_path, max_depth=2).get_files(), tmp_path) == [
+        "a/b/dos.txt", "a/uno.txt", "raiz.txt"]
+    assert len(_organizer(tmp_path, max_depth=None).get_files()) == 4
+
+
+def test_excluded_dirs_are_pruned(tmp_path):
+    _tree(tmp_path)
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.txt").write_text("x")
+    assert "node_modules/dep.txt" not in _names(_organizer(tmp_path).get_files(), tmp_path)
+    
+    files = _organizer(tmp_path, excluded_dirs="b").get_files()
+    assert _names(files, tmp_path) == ["a/uno.txt", "node_modules/dep.txt", "raiz.txt"]
+
+
+def test_symlink_loop_is_walked_once(tmp_path):
+    _tree(tmp_path)
+    (tmp_path / "a" / "b" / "c" / "bucle").symlink_to(tmp_path / "a")
+    (tmp_path / "otra").symlink_to(tmp_path / "a" / "b")
+    
+    files = _organizer(tmp_path, follow_symlinks=True).get_files()
+    assert len(files) == 4
+    
+    assert _names(_organizer(tmp_path).get_files(), tmp_path) == [
+        "a/b/c/tres.txt", "a/b/dos.txt", "a/uno.txt", "raiz.txt"]
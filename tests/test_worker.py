@@ -0,0 +1,98 @@
+import sys
+import time
+
+import organizer as organizer_module
+import worker
+from organizer import FileOrganizer
+from worker import WorkerClient, start_job
+
+
+def _organizer(source):
+    for i in range(5):
+        (source / f"archivo{i}.txt").write_text(f"contenido {i}")
+    organizer = FileOrganizer()
+    organizer.set_source_folder(str(source))
+    return organizer
+
+
+def test_frozen_build_relaunches_itself(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    assert worker.worker_command(tmp_path) == [sys.executable, worker.WORKER_FLAG, str(tmp_path)]
+
+
+def test_result_file_is_read_in_batches(tmp_path, monkeypatch):
+    source = tmp_path / "src"
+    source.mkdir()
+    organizer = _organizer(source)
+    organizer.get_files()
+    monkeypatch.setattr(worker, "RESULT_BATCH", 2)
+    records = worker._result_records(organizer)
+    assert [kind for name, kind, _ in records if name == "_preview_files"] == ["set", "extend", "extend", "extend"]
+    
+    worker._write_records(tmp_path / worker.RESULT_FILE, records)
+    target = FileOrganizer()
+    WorkerClient(tmp_path, {"operation": "scan"}).load_results(target)
+    assert sorted(f.name for f in target._preview_files) == [f"archivo{i}.txt" for i in range(5)]
+
+
+def test_scan_in_worker_process(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    organizer = _organizer(source)
+    client = start_job(organizer, "scan", job_dir=tmp_path / "trabajo")
+    events = list(client.messages())
+    assert events[-1][:2] == ("finished", True)
+    client.load_results(organizer)
+    client.discard()
+    assert len(organizer._preview_files) == 5
+
+
+def test_limit_changes_reach_the_running_job(tmp_path):
+    server = worker.JobServer(tmp_path, {"authkey": "00" * 16, "operation": "organize"})
+    server.start()
+    client = WorkerClient.attach(tmp_path)
+    assert client.connect()
+    try:
+        client.set_io_limits(1024 * 1024, 5)
+        deadline = time.monotonic() + 5
+        while organizer_module.io_options.throttle.operations.rate != 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert organizer_module.io_options.throttle.bandwidth.rate == 1024 * 1024
+        assert organizer_module.io_options.throttle.operations.rate == 5
+    finally:
+        organizer_module.set_io_limits(None, None)
+        server.finish(True, "")
+        client.close()
+
+
+def test_connected_client_receives_results_over_the_socket(tmp_path, monkeypatch):
+    source = tmp_path / "src"
+    source.mkdir()
+    organizer = _organizer(source)
+    organizer.get_files()
+    monkeypatch.setattr(worker, "RESULT_BATCH", 2)
+    server = worker.JobServer(tmp_path, {"authkey": "00" * 16, "operation": "scan"})
+    server.start()
+    client = WorkerClient.attach(tmp_path)
+    assert client.connect()
+    
+    server.finish(True, "hecho", worker._result_records(organizer))
+    assert list(client.messages())[-1] == ("finished", True, "hecho")
+    target = FileOrganizer()
+    client.load_results(target)
+    assert len(target._preview_files) == 5
+    assert not (tmp_path / worker.RESULT_FILE).exists()
+
+
+def test_job_file_is_private_from_the_start(tmp_path, monkeypatch):
+    modes = []
+    original = worker.os.open
+    
+    def recording_open(path, flags, mode=0o777, *args, **kwargs):
+        modes.append((str(path), flags & worker.os.O_EXCL, mode))
+        return original(path, flags, mode, *args, **kwargs)
+    
+    monkeypatch.setattr(worker.os, "open", recording_open)
+    worker._write_pickle(tmp_path / worker.JOB_FILE, {"authkey": "00" * 16})
+    assert modes == [(str(tmp_path / "job.tmp"), worker.os.O_EXCL, 0o600)]
+    assert (tmp_path / worker.JOB_FILE).stat().st_mode & 0o777 == 0o600
@@ -4,12 +4,19 @@ from PySide6.QtWidgets import (
     QComboBox, QGroupBox, QMessageBox, QCheckBox, QGridLayout,
     QTableWidget, QTableWidgetItem, QHeaderView, QProgressBar, 
     QDialog, QDialogButtonBox, QSpinBox, QStackedWidget, QFrame,
-    QSizePolicy, QScrollArea
+    QSizePolicy, QScrollArea, QDateEdit, QPlainTextEdit, QTabWidget
 )
-from PySide6.QtCore import Qt, QThread, Signal, QSize
+from PySide6.QtCore import Qt, QThread, Signal, QSize, QDate, QTimer
 from PySide6.QtGui import QColor, QFont, QIcon
 from pathlib import Path
-from organizer import FileOrganizer, EXTENSION_CATEGORIES
+from datetime import datetime, time
+import threading
+from organizer import (
+    FileOrganizer, OrganizePlan, DuplicateResolver, ArchiveMember,
+    EXTENSION_CATEGORIES, DEFAULT_EXCLUDED_DIRS, UNDOABLE_BATCH_TYPES,
+    set_cache_friendly, set_io_memory_limit, set_io_limits
+)
+from worker import run_operation, start_job, WorkerClient
 
 
 DARK_STYLE = """
@@ -194,27 +201,65 @@ class WorkerThread(QThread):
     progress = Signal(int, int)
     finished = Signal(bool, str)
     
-    def __init__(self, organizer, operation="organize"):
+    def __init__(self, organizer, operation="organize", **options):
         super().__init__()
         self.organizer = organizer
         self.operation = operation
+        self.options = options
+        self.cancel_event = threading.Event()
     
     def run(self):
-        if self.operation == "organize":
-            success, message = self.organizer.organize(self.progress.emit)
-        elif self.operation == "scan":
-            self.organizer.get_files(self.progress.emit)
-            success, message = True, f"Encontrados {len(self.organizer._preview_files)} archivos"
-        elif self.operation == "duplicates":
-            self.organizer.find_duplicates(self.progress.emit)
-            count = self.organizer.duplicate_finder.get_duplicate_count()
-            success, message = True, f"Encontrados {count} archivos duplicados"
-        elif self.operation == "undo":
-            success, message = self.organizer.undo_last(self.progress.emit)
-        else:
-            success, message = False, "Operación desconocida"
-        
+        self.organizer.apply_priority()
+        success, message = run_operation(self.organizer, self.operation, self.progress.emit,
+                                         self.cancel_event, **self.options)
+        self.finished.emit(success, message)
+    
+    def cancel(self):
+        self.cancel_event.set()
+    
+    def set_io_limits(self, bytes_per_second, files_per_second):
+        pass  # Comparte io_options con la ventana: ya se han aplicado
+
+
+class ProcessWorker(QThread):
+    """Como WorkerThread, pero la operación se ejecuta en un proceso aparte (worker.py)."""
+    progress = Signal(int, int)
+    finished = Signal(bool, str)
+    
+    def __init__(self, organizer, operation="organize", client=None, **options):
+        super().__init__()
+        self.organizer = organizer
+        self.operation = operation
+        self.options = options
+        self.client = client
+    
+    def run(self):
+        # Cualquier fallo (también al lanzar el proceso) termina con finished para no dejar la ventana esperando
+        try:
+            if self.client is None:
+                self.client = start_job(self.organizer, self.operation, **self.options)
+            
+            success, message = False, "El proceso de trabajo terminó inesperadamente"
+            for event in self.client.messages():
+                if event[0] == "progress":
+                    self.progress.emit(event[1], event[2])
+                elif event[0] == "finished":
+                    success, message = event[1], event[2]
+            
+            self.client.load_results(self.organizer)
+            self.client.discard()
+        except Exception as e:
+            success, message = False, f"Error en el proceso de trabajo: {e}"
         self.finished.emit(success, message)
+    
+    def cancel(self):
+        if self.client is not None:
+            self.client.cancel()
+    
+    def set_io_limits(self, bytes_per_second, files_per_second):
+        """Reenvía al proceso los límites de E/S cambiados mientras trabaja."""
+        if self.client is not None:
+            self.client.set_io_limits(bytes_per_second, files_per_second)
 
 
 class PreviewDialog(QDialog):
@@ -236,9 +281,10 @@ class PreviewDialog(QDialog):
         layout.addWidget(info_label)
         
         self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Nombre", "Tipo", "Tamaño", "Modificado"])
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["Nombre", "Tipo", "Tamaño", "Modificado", "Destino"])
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
         self.table.setRowCount(len(self.files))
         self.table.setAlternatingRowColors(True)
         
@@ -247,6 +293,10 @@ class PreviewDialog(QDialog):
             self.table.setItem(i, 1, QTableWidgetItem(file["extension"]))
             self.table.setItem(i, 2, QTableWidgetItem(file["size_formatted"]))
             self.table.setItem(i, 3, QTableWidgetItem(file["modified_date"][:10]))
+            destination = file.get("destination", "")
+            if file.get("skip"):
+                destination += " (idéntico, se omite)"
+            self.table.setItem(i, 4, QTableWidgetItem(destination))
         
         layout.addWidget(self.table)
         
@@ -256,13 +306,17 @@ class PreviewDialog(QDialog):
 
 
 class DuplicatesDialog(QDialog):
-    """Diálogo para mostrar archivos duplicados."""
+    """Diálogo para mostrar y resolver archivos duplicados."""
+    
+    POLICIES = [("oldest", "Conservar el más antiguo"), ("newest", "Conservar el más reciente"),
+                ("shortest_path", "Conservar la ruta más corta"), ("preferred_root", "Conservar el de una carpeta preferida")]
     
     def __init__(self, duplicates: dict, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Archivos Duplicados")
         self.setMinimumSize(800, 500)
         self.duplicates = duplicates
+        self.resolution = None
         self.init_ui()
     
     def init_ui(self):
@@ -277,27 +331,222 @@ class DuplicatesDialog(QDialog):
         info_label.setStyleSheet("font-size: 14px; font-weight: bold;")
         layout.addWidget(info_label)
         
+        # Política de resolución
+        policy_layout = QHBoxLayout()
+        self.policy_combo = QComboBox()
+        self.policy_combo.addItems([label for _, label in self.POLICIES])
+        self.policy_combo.currentIndexChanged.connect(self.update_status)
+        policy_layout.addWidget(self.policy_combo)
+        
+        self.preferred_root_input = QLineEdit()
+        self.preferred_root_input.setPlaceholderText("Carpeta preferida...")
+        self.preferred_root_input.editingFinished.connect(self.update_status)
+        policy_layout.addWidget(self.preferred_root_input)
+        
+        browse_btn = QPushButton("📂")
+        browse_btn.setFixedWidth(40)
+        browse_btn.clicked.connect(self.browse_preferred_root)
+        policy_layout.addWidget(browse_btn)
+        layout.addLayout(policy_layout)
+        
         self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Archivo", "Ubicación", "Tamaño", "Estado"])
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["Archivo", "Ubicación", "Origen", "Tamaño", "Estado"])
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         
-        rows = []
-        for hash_val, files in self.duplicates.items():
-            for i, file in enumerate(files):
-                rows.append((file.name, str(file.path.parent), file.get_size_formatted(), 
-                           "Original" if i == 0 else "Duplicado"))
-        
-        self.table.setRowCount(len(rows))
-        for i, (name, path, size, status) in enumerate(rows):
-            self.table.setItem(i, 0, QTableWidgetItem(name))
-            self.table.setItem(i, 1, QTableWidgetItem(path))
-            self.table.setItem(i, 2, QTableWidgetItem(size))
-            status_item = QTableWidgetItem(status)
-            if status == "Duplicado":
+        self.rows = [file for files in self.duplicates.values() for file in files]
+        self.table.setRowCount(len(self.rows))
+        for i, file in enumerate(self.rows):
+            self.table.setItem(i, 0, QTableWidgetItem(file.name))
+            self.table.setItem(i, 1, QTableWidgetItem(str(file.path.parent)))
+            self.table.setItem(i, 2, QTableWidgetItem(str(file.root) if file.root else ""))
+            self.table.setItem(i, 3, QTableWidgetItem(file.get_size_formatted()))
+        
+        layout.addWidget(self.table)
+        self.update_status()
+        
+        resolve_layout = QHBoxLayout()
+        self.trash_checkbox = QCheckBox("Mover a la papelera (.papelera_duplicados) en lugar de borrar")
+        self.trash_checkbox.setChecked(True)
+        resolve_layout.addWidget(self.trash_checkbox)
+        resolve_layout.addStretch()
+        
+        resolve_btn = QPushButton("🧹 Resolver Duplicados")
+        resolve_btn.clicked.connect(self.resolve)
+        resolve_layout.addWidget(resolve_btn)
+        layout.addLayout(resolve_layout)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok)
+        buttons.accepted.connect(self.accept)
+        layout.addWidget(buttons)
+    
+    def browse_preferred_root(self):
+        folder = QFileDialog.getExistingDirectory(self, "Seleccionar carpeta preferida")
+        if folder:
+            self.preferred_root_input.setText(folder)
+            self.policy_combo.setCurrentIndex(3)
+            self.update_status()
+    
+    def current_policy(self) -> str:
+        return self.POLICIES[self.policy_combo.currentIndex()][0]
+    
+    def update_status(self):
+        """Marca qué copia se conserva con la política elegida."""
+        preferred_root = self.preferred_root_input.text() or None
+        resolver = DuplicateResolver(self.duplicates, self.current_policy(), preferred_root)
+        keepers = {id(keeper) for keeper, _ in resolver.plan()}
+        
+        for i, file in enumerate(self.rows):
+            if id(file) in keepers:
+                status_item = QTableWidgetItem("Conservar")
+            elif isinstance(file, ArchiveMember):
+                status_item = QTableWidgetItem("Dentro de archivo")
+            else:
+                status_item = QTableWidgetItem("Eliminar")
                 status_item.setForeground(QColor("#ff9800"))
-            self.table.setItem(i, 3, status_item)
+            self.table.setItem(i, 4, status_item)
+    
+    def resolve(self):
+        use_trash = self.trash_checkbox.isChecked()
+        action = "mover a la papelera" if use_trash else "borrar definitivamente"
+        reply = QMessageBox.question(
+            self, "Confirmar",
+            f"¿Deseas {action} las copias marcadas como 'Eliminar'?\nPodrás deshacerlo desde el historial.",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        
+        self.resolution = {
+            "policy": self.current_policy(),
+            "use_trash": use_trash,
+            "preferred_root": self.preferred_root_input.text() or None,
+        }
+        self.accept()
+    
+    def _format_size(self, size):
+        if size < 1024:
+            return f"{size} B"
+        elif size < 1024 * 1024:
+            return f"{size / 1024:.1f} KB"
+        elif size < 1024 * 1024 * 1024:
+            return f"{size / (1024 * 1024):.1f} MB"
+        else:
+            return f"{size / (1024 * 1024 * 1024):.2f} GB"
+
+
+class AnalyticsDialog(QDialog):
+    """Diálogo con el informe de ocupación de la carpeta."""
+    
+    def __init__(self, analytics, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Análisis de Carpeta")
+        self.setMinimumSize(750, 500)
+        self.analytics = analytics
+        self.report = analytics.to_dict()
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        
+        info_label = QLabel(f"📊 {self.report['total_files']} archivos | 💾 {self._format_size(self.report['total_bytes'])}")
+        info_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        layout.addWidget(info_label)
         
+        tabs = QTabWidget()
+        tabs.addTab(self._summary_table(self.report["by_category"], "Categoría"), "Categorías")
+        tabs.addTab(self._summary_table(self.report["by_extension"], "Extensión"), "Extensiones")
+        tabs.addTab(self._summary_table(self.report["by_size_bucket"], "Tamaño"), "Tamaños")
+        tabs.addTab(self._summary_table(self.report["by_year"], "Año"), "Años")
+        tabs.addTab(self._summary_table(self.report["by_folder"], "Subcarpeta"), "Subcarpetas")
+        tabs.addTab(self._files_table(self.report["largest"]), "Más grandes")
+        tabs.addTab(self._files_table(self.report["oldest"]), "Más antiguos")
+        layout.addWidget(tabs)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok)
+        export_btn = buttons.addButton("💾 Exportar JSON", QDialogButtonBox.ActionRole)
+        export_btn.clicked.connect(self.export_json)
+        buttons.accepted.connect(self.accept)
+        layout.addWidget(buttons)
+    
+    def _summary_table(self, rows, label):
+        table = QTableWidget()
+        table.setColumnCount(4)
+        table.setHorizontalHeaderLabels([label, "Archivos", "Tamaño", "% del total"])
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        table.setRowCount(len(rows))
+        total = self.report["total_bytes"] or 1
+        for i, row in enumerate(rows):
+            table.setItem(i, 0, QTableWidgetItem(row["key"]))
+            table.setItem(i, 1, QTableWidgetItem(str(row["count"])))
+            table.setItem(i, 2, QTableWidgetItem(self._format_size(row["bytes"])))
+            table.setItem(i, 3, QTableWidgetItem(f"{row['bytes'] * 100 / total:.1f}%"))
+        return table
+    
+    def _files_table(self, rows):
+        table = QTableWidget()
+        table.setColumnCount(3)
+        table.setHorizontalHeaderLabels(["Archivo", "Tamaño", "Modificado"])
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            table.setItem(i, 0, QTableWidgetItem(row["path"]))
+            table.setItem(i, 1, QTableWidgetItem(self._format_size(row["size"])))
+            table.setItem(i, 2, QTableWidgetItem(row["modified_date"][:10]))
+        return table
+    
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar análisis", "analisis.json", "JSON (*.json)")
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.analytics.to_json())
+    
+    def _format_size(self, size):
+        if size < 1024:
+            return f"{size} B"
+        elif size < 1024 * 1024:
+            return f"{size / 1024:.1f} KB"
+        elif size < 1024 * 1024 * 1024:
+            return f"{size / (1024 * 1024):.1f} MB"
+        else:
+            return f"{size / (1024 * 1024 * 1024):.2f} GB"
+
+
+class ChunkReportDialog(QDialog):
+    """Diálogo con los pares de archivos que comparten más bloques."""
+    
+    def __init__(self, report: dict, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Duplicados Parciales")
+        self.setMinimumSize(800, 450)
+        self.report = report
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        
+        estimate = " (estimado)" if self.report["sample_rate"] < 1 else ""
+        info_label = QLabel(
+            f"🧩 {self.report['total_chunks']} bloques en {self.report['files']} archivos | "
+            f"💾 Ahorro con deduplicación por bloques: {self._format_size(self.report['dedup_savings_bytes'])}{estimate}"
+        )
+        info_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+        
+        pairs = self.report["top_pairs"]
+        self.table = QTableWidget()
+        self.table.setColumnCount(3)
+        self.table.setHorizontalHeaderLabels(["Archivo A", "Archivo B", "Compartido"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.setRowCount(len(pairs))
+        for i, pair in enumerate(pairs):
+            self.table.setItem(i, 0, QTableWidgetItem(pair["file_a"]))
+            self.table.setItem(i, 1, QTableWidgetItem(pair["file_b"]))
+            self.table.setItem(i, 2, QTableWidgetItem(self._format_size(pair["shared_bytes"])))
         layout.addWidget(self.table)
         
         buttons = QDialogButtonBox(QDialogButtonBox.Ok)
@@ -337,7 +586,7 @@ class HistoryDialog(QDialog):
         
         for i, batch in enumerate(self.history):
             self.table.setItem(i, 0, QTableWidgetItem(batch["timestamp"][:19].replace("T", " ")))
-            op_type = "Movido" if batch["type"] == "move" else "Copiado"
+            op_type = {"move": "Movido", "duplicates": "Duplicados eliminados"}.get(batch["type"], "Copiado")
             self.table.setItem(i, 1, QTableWidgetItem(op_type))
             self.table.setItem(i, 2, QTableWidgetItem(str(len(batch.get("operations", [])))))
         
@@ -354,10 +603,12 @@ class OrganizerWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.organizer = FileOrganizer()
+        self.worker = None
         self.setWindowTitle("📁 Organizador de Carpetas")
         self.setMinimumSize(900, 650)
         self.setStyleSheet(DARK_STYLE)
         self.init_ui()
+        QTimer.singleShot(0, self.resume_worker)
     
     def create_scroll_page(self, page_widget):
         """Envuelve un widget de página en un QScrollArea."""
@@ -467,6 +718,13 @@ class OrganizerWindow(QMainWindow):
         self.status_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         progress_layout.addWidget(self.status_label)
         
+        self.cancel_btn = QPushButton("⏹ Cancelar")
+        self.cancel_btn.setObjectName("dangerBtn")
+        self.cancel_btn.setToolTip("Detiene la operación en curso; al organizar, entre dos archivos y con el historial guardado")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_operation)
+        progress_layout.addWidget(self.cancel_btn)
+        
         bottom_layout.addLayout(progress_layout)
         
         # Botones de acción principales
@@ -510,8 +768,13 @@ class OrganizerWindow(QMainWindow):
         source_btn = QPushButton("📁 Seleccionar")
         source_btn.setFixedWidth(120)
         source_btn.clicked.connect(self.select_source_folder)
+        add_source_btn = QPushButton("➕")
+        add_source_btn.setFixedWidth(40)
+        add_source_btn.setToolTip("Añadir otra carpeta de origen (por ejemplo, otro disco o una unidad de red)\npara buscar duplicados entre todas en una sola pasada")
+        add_source_btn.clicked.connect(self.add_source_folder)
         source_layout.addWidget(self.source_path_input)
         source_layout.addWidget(source_btn)
+        source_layout.addWidget(add_source_btn)
         source_group.setLayout(source_layout)
         layout.addWidget(source_group)
         
@@ -571,7 +834,25 @@ class OrganizerWindow(QMainWindow):
         dest_btn.clicked.connect(self.select_destination_folder)
         dest_layout.addWidget(self.dest_path_input)
         dest_layout.addWidget(dest_btn)
-        dest_group.setLayout(dest_layout)
+        
+        mirror_layout = QHBoxLayout()
+        self.mirror_path_input = QLineEdit()
+        self.mirror_path_input.setPlaceholderText("Carpetas espejo (opcional): reciben otra copia leyendo cada archivo una sola vez")
+        self.mirror_path_input.setReadOnly(True)
+        add_mirror_btn = QPushButton("➕ Espejo")
+        add_mirror_btn.setFixedWidth(120)
+        add_mirror_btn.clicked.connect(self.add_mirror_folder)
+        clear_mirror_btn = QPushButton("✖")
+        clear_mirror_btn.setFixedWidth(40)
+        clear_mirror_btn.clicked.connect(self.clear_mirror_folders)
+        mirror_layout.addWidget(self.mirror_path_input)
+        mirror_layout.addWidget(add_mirror_btn)
+        mirror_layout.addWidget(clear_mirror_btn)
+        
+        dest_group_layout = QVBoxLayout()
+        dest_group_layout.addLayout(dest_layout)
+        dest_group_layout.addLayout(mirror_layout)
+        dest_group.setLayout(dest_group_layout)
         layout.addWidget(dest_group)
         
         # Opciones
@@ -593,21 +874,89 @@ class OrganizerWindow(QMainWindow):
         org_layout = QHBoxLayout()
         org_layout.addWidget(QLabel("Organizar por:"))
         self.organize_by_combo = QComboBox()
-        self.organize_by_combo.addItems(["Extensión", "Fecha", "Tamaño"])
+        self.organize_by_combo.addItems(["Extensión", "Categoría", "Fecha", "Tamaño"])
         self.organize_by_combo.currentIndexChanged.connect(self.update_organize_by)
         self.organize_by_combo.setFixedWidth(120)
         org_layout.addWidget(self.organize_by_combo)
         options_layout.addLayout(org_layout)
         
+        # Colisiones
+        collision_layout = QHBoxLayout()
+        collision_layout.addWidget(QLabel("Si ya existe:"))
+        self.collision_combo = QComboBox()
+        self.collision_combo.addItems(["Renombrar", "Omitir si es idéntico"])
+        self.collision_combo.setToolTip("Omitir compara tamaño y contenido con el archivo del destino;\nal mover, el origen idéntico se elimina.")
+        self.collision_combo.currentIndexChanged.connect(self.update_collision_policy)
+        collision_layout.addWidget(self.collision_combo)
+        options_layout.addLayout(collision_layout)
+        
+        # Verificación
+        self.verify_copies_checkbox = QCheckBox("Verificar copias")
+        self.verify_copies_checkbox.setToolTip("Calcula el hash durante la copia y comprueba el destino en disco.\nEl hash se guarda en el historial y en el índice de escaneo.")
+        self.verify_copies_checkbox.stateChanged.connect(self.update_verify_copies)
+        options_layout.addWidget(self.verify_copies_checkbox)
+        
+        # Movimientos duraderos
+        self.durable_moves_checkbox = QCheckBox("Mover con seguridad entre discos")
+        self.durable_moves_checkbox.setToolTip("Copia por tandas, sincroniza el disco destino y solo entonces borra los originales.\nEvita perder archivos si se corta la luz a mitad de la operación.")
+        self.durable_moves_checkbox.stateChanged.connect(self.update_durable_moves)
+        options_layout.addWidget(self.durable_moves_checkbox)
+        
+        # Empaquetado de archivos pequeños
+        pack_layout = QHBoxLayout()
+        pack_layout.addWidget(QLabel("Empaquetar archivos menores de (KB):"))
+        self.pack_threshold_spin = QSpinBox()
+        self.pack_threshold_spin.setRange(0, 1024 * 1024)
+        self.pack_threshold_spin.setSpecialValueText("No empaquetar")
+        self.pack_threshold_spin.setToolTip("Los archivos pequeños se guardan en paquetes .tar por carpeta destino,\ncon un índice .json para leerlos uno a uno. Deshacer los extrae de nuevo.")
+        self.pack_threshold_spin.valueChanged.connect(self.update_pack_threshold)
+        pack_layout.addWidget(self.pack_threshold_spin)
+        pack_layout.addStretch()
+        options_layout.addLayout(pack_layout)
+        
         # Recursivo
         self.recursive_checkbox = QCheckBox("Incluir subcarpetas")
         self.recursive_checkbox.stateChanged.connect(self.update_recursive)
         options_layout.addWidget(self.recursive_checkbox)
         
+        # Profundidad
+        depth_layout = QHBoxLayout()
+        depth_layout.addWidget(QLabel("Profundidad:"))
+        self.max_depth_spin = QSpinBox()
+        self.max_depth_spin.setRange(0, 100)
+        self.max_depth_spin.setSpecialValueText("Sin límite")
+        self.max_depth_spin.setFixedWidth(120)
+        self.max_depth_spin.valueChanged.connect(self.update_max_depth)
+        depth_layout.addWidget(self.max_depth_spin)
+        options_layout.addLayout(depth_layout)
+        
         options_layout.addStretch()
         options_group.setLayout(options_layout)
         layout.addWidget(options_group)
         
+        # Organización por fecha
+        date_options_group = QGroupBox("Organización por Fecha")
+        date_options_layout = QHBoxLayout()
+        date_options_layout.setSpacing(30)
+        
+        granularity_layout = QHBoxLayout()
+        granularity_layout.addWidget(QLabel("Carpetas por:"))
+        self.date_granularity_combo = QComboBox()
+        self.date_granularity_combo.addItems(["Año", "Año/Mes", "Año/Mes/Día"])
+        self.date_granularity_combo.setCurrentIndex(1)
+        self.date_granularity_combo.currentIndexChanged.connect(self.update_date_options)
+        self.date_granularity_combo.setFixedWidth(140)
+        granularity_layout.addWidget(self.date_granularity_combo)
+        date_options_layout.addLayout(granularity_layout)
+        
+        self.capture_date_checkbox = QCheckBox("Usar fecha de captura (EXIF / MP4) cuando exista")
+        self.capture_date_checkbox.stateChanged.connect(self.update_date_options)
+        date_options_layout.addWidget(self.capture_date_checkbox)
+        
+        date_options_layout.addStretch()
+        date_options_group.setLayout(date_options_layout)
+        layout.addWidget(date_options_group)
+        
         layout.addStretch()
         return page
     
@@ -629,7 +978,7 @@ class OrganizerWindow(QMainWindow):
         include_layout = QHBoxLayout()
         include_layout.addWidget(QLabel("Incluir si contiene:"))
         self.name_filter_input = QLineEdit()
-        self.name_filter_input.setPlaceholderText("Ej: IMG_, documento, backup")
+        self.name_filter_input.setPlaceholderText("Ej: IMG_*, documento, re:^backup_\\d+")
         self.name_filter_input.textChanged.connect(self.update_name_filter)
         include_layout.addWidget(self.name_filter_input)
         name_layout.addLayout(include_layout)
@@ -637,7 +986,7 @@ class OrganizerWindow(QMainWindow):
         exclude_layout = QHBoxLayout()
         exclude_layout.addWidget(QLabel("Excluir si contiene:"))
         self.exclude_filter_input = QLineEdit()
-        self.exclude_filter_input.setPlaceholderText("Ej: temp, cache, .bak")
+        self.exclude_filter_input.setPlaceholderText("Ej: temp, cache, *.bak")
         self.exclude_filter_input.textChanged.connect(self.update_exclude_filter)
         exclude_layout.addWidget(self.exclude_filter_input)
         name_layout.addLayout(exclude_layout)
@@ -645,6 +994,36 @@ class OrganizerWindow(QMainWindow):
         name_group.setLayout(name_layout)
         layout.addWidget(name_group)
         
+        # Carpetas excluidas
+        dirs_group = QGroupBox("Carpetas Excluidas")
+        dirs_layout = QVBoxLayout()
+        dirs_layout.setSpacing(15)
+        
+        excluded_layout = QHBoxLayout()
+        excluded_layout.addWidget(QLabel("No entrar en:"))
+        self.excluded_dirs_input = QLineEdit(", ".join(DEFAULT_EXCLUDED_DIRS))
+        self.excluded_dirs_input.setPlaceholderText("Ej: .git, node_modules, backup-*")
+        self.excluded_dirs_input.textChanged.connect(self.update_excluded_dirs)
+        excluded_layout.addWidget(self.excluded_dirs_input)
+        dirs_layout.addLayout(excluded_layout)
+        
+        self.follow_symlinks_checkbox = QCheckBox("Seguir enlaces simbólicos a carpetas")
+        self.follow_symlinks_checkbox.stateChanged.connect(self.update_follow_symlinks)
+        dirs_layout.addWidget(self.follow_symlinks_checkbox)
+        
+        self.incremental_checkbox = QCheckBox("Escaneo incremental (solo vuelve a leer las carpetas modificadas)")
+        self.incremental_checkbox.stateChanged.connect(self.update_incremental)
+        dirs_layout.addWidget(self.incremental_checkbox)
+        
+        self.skip_organized_checkbox = QCheckBox("Omitir carpetas ya organizadas (si el destino está dentro del origen)")
+        self.skip_organized_checkbox.setToolTip("Las carpetas creadas al organizar llevan un archivo .organizado y no se vuelven a recorrer;\nlos archivos que ya están en su carpeta de destino no se tocan.")
+        self.skip_organized_checkbox.setChecked(True)
+        self.skip_organized_checkbox.stateChanged.connect(self.update_skip_organized)
+        dirs_layout.addWidget(self.skip_organized_checkbox)
+        
+        dirs_group.setLayout(dirs_layout)
+        layout.addWidget(dirs_group)
+        
         # Filtro por tamaño
         size_group = QGroupBox("Filtrar por Tamaño")
         size_layout = QHBoxLayout()
@@ -675,6 +1054,33 @@ class OrganizerWindow(QMainWindow):
         size_group.setLayout(size_layout)
         layout.addWidget(size_group)
         
+        # Filtro por fecha
+        date_group = QGroupBox("Filtrar por Fecha de Modificación")
+        date_layout = QHBoxLayout()
+        date_layout.setSpacing(20)
+        
+        self.min_date_checkbox = QCheckBox("Desde:")
+        self.min_date_checkbox.stateChanged.connect(self.update_date_filter)
+        date_layout.addWidget(self.min_date_checkbox)
+        self.min_date_edit = QDateEdit(QDate.currentDate().addYears(-1))
+        self.min_date_edit.setCalendarPopup(True)
+        self.min_date_edit.setFixedWidth(130)
+        self.min_date_edit.dateChanged.connect(self.update_date_filter)
+        date_layout.addWidget(self.min_date_edit)
+        
+        self.max_date_checkbox = QCheckBox("Hasta:")
+        self.max_date_checkbox.stateChanged.connect(self.update_date_filter)
+        date_layout.addWidget(self.max_date_checkbox)
+        self.max_date_edit = QDateEdit(QDate.currentDate())
+        self.max_date_edit.setCalendarPopup(True)
+        self.max_date_edit.setFixedWidth(130)
+        self.max_date_edit.dateChanged.connect(self.update_date_filter)
+        date_layout.addWidget(self.max_date_edit)
+        
+        date_layout.addStretch()
+        date_group.setLayout(date_layout)
+        layout.addWidget(date_group)
+        
         # Destinos personalizados
         custom_group = QGroupBox("Carpetas Personalizadas por Extensión")
         custom_layout = QVBoxLayout()
@@ -705,6 +1111,57 @@ class OrganizerWindow(QMainWindow):
         custom_group.setLayout(custom_layout)
         layout.addWidget(custom_group)
         
+        # Reglas de destino
+        rules_group = QGroupBox("Reglas de Destino")
+        rules_layout = QVBoxLayout()
+        
+        rules_info = QLabel("Una regla por línea, se aplica la primera que coincida. Campos: {ext}, {category}, {year}, {month}, {day}, {size_bucket}")
+        rules_info.setWordWrap(True)
+        rules_info.setStyleSheet("color: #8a8aaa;")
+        rules_layout.addWidget(rules_info)
+        
+        self.destination_rules_input = QPlainTextEdit()
+        self.destination_rules_input.setPlaceholderText("*.pdf size>10MB year=2023 -> Docs/{year}/{month}/large\next=jpg,png name=IMG_* -> Fotos/{year}/{month}")
+        self.destination_rules_input.setMaximumHeight(110)
+        self.destination_rules_input.setStyleSheet("background-color: #16213e; border: 1px solid #3a3a5a; border-radius: 6px;")
+        rules_layout.addWidget(self.destination_rules_input)
+        
+        rules_btns = QHBoxLayout()
+        self.destination_rules_label = QLabel("Sin reglas")
+        self.destination_rules_label.setStyleSheet("color: #8a8aaa;")
+        rules_btns.addWidget(self.destination_rules_label)
+        rules_btns.addStretch()
+        
+        load_rules_btn = QPushButton("📂 Cargar")
+        load_rules_btn.setFixedWidth(110)
+        load_rules_btn.clicked.connect(self.load_destination_rules)
+        rules_btns.addWidget(load_rules_btn)
+        
+        apply_rules_btn = QPushButton("✔️ Aplicar")
+        apply_rules_btn.setFixedWidth(110)
+        apply_rules_btn.clicked.connect(self.apply_destination_rules)
+        rules_btns.addWidget(apply_rules_btn)
+        
+        rules_layout.addLayout(rules_btns)
+        rules_group.setLayout(rules_layout)
+        layout.addWidget(rules_group)
+        
+        # Tabla de categorías
+        categories_group = QGroupBox("Categorías Personalizadas")
+        categories_layout = QHBoxLayout()
+        
+        self.categories_file_label = QLabel("Usando las categorías predefinidas")
+        self.categories_file_label.setStyleSheet("color: #8a8aaa;")
+        categories_layout.addWidget(self.categories_file_label)
+        categories_layout.addStretch()
+        
+        load_categories_btn = QPushButton("📂 Cargar tabla (JSON)")
+        load_categories_btn.clicked.connect(self.load_categories)
+        categories_layout.addWidget(load_categories_btn)
+        
+        categories_group.setLayout(categories_layout)
+        layout.addWidget(categories_group)
+        
         layout.addStretch()
         return page
     
@@ -727,13 +1184,101 @@ class OrganizerWindow(QMainWindow):
         dup_info.setStyleSheet("color: #8a8aaa;")
         dup_layout.addWidget(dup_info)
         
+        self.scan_archives_checkbox = QCheckBox("Buscar también dentro de archivos .zip y .tar (sin extraerlos)")
+        self.scan_archives_checkbox.stateChanged.connect(self.update_scan_archives)
+        dup_layout.addWidget(self.scan_archives_checkbox)
+        
+        dup_memory_layout = QHBoxLayout()
+        dup_memory_layout.addWidget(QLabel("Memoria máxima (MB):"))
+        self.dup_memory_spin = QSpinBox()
+        self.dup_memory_spin.setRange(0, 65536)
+        self.dup_memory_spin.setSpecialValueText("Sin límite")
+        self.dup_memory_spin.setToolTip("Con límite, la lista de archivos se vuelca a disco por tramos ordenados.\nPensado para carpetas con millones de archivos.")
+        self.dup_memory_spin.valueChanged.connect(self.update_duplicate_memory)
+        dup_memory_layout.addWidget(self.dup_memory_spin)
+        dup_memory_layout.addStretch()
+        dup_layout.addLayout(dup_memory_layout)
+        
         find_dup_btn = QPushButton("🔍 Buscar Duplicados")
         find_dup_btn.clicked.connect(self.find_duplicates)
         dup_layout.addWidget(find_dup_btn)
         
+        chunks_info = QLabel("Duplicados parciales: compara bloques definidos por contenido para encontrar imágenes de disco,\nlogs o archivos comprimidos que solo difieren en unos pocos bloques (más lento).")
+        chunks_info.setWordWrap(True)
+        chunks_info.setStyleSheet("color: #8a8aaa;")
+        dup_layout.addWidget(chunks_info)
+        
+        chunks_btn = QPushButton("🧩 Buscar Duplicados Parciales")
+        chunks_btn.clicked.connect(self.find_partial_duplicates)
+        dup_layout.addWidget(chunks_btn)
+        
         dup_group.setLayout(dup_layout)
         layout.addWidget(dup_group)
         
+        # Análisis
+        analytics_group = QGroupBox("Análisis de Carpeta")
+        analytics_layout = QVBoxLayout()
+        
+        analytics_info = QLabel("Muestra en qué se va el espacio (por extensión, categoría, tamaño, año y subcarpeta)\ny los archivos más grandes y más antiguos, en una sola pasada.")
+        analytics_info.setWordWrap(True)
+        analytics_info.setStyleSheet("color: #8a8aaa;")
+        analytics_layout.addWidget(analytics_info)
+        
+        analyze_btn = QPushButton("📊 Analizar Carpeta")
+        analyze_btn.clicked.connect(self.analyze_folder)
+        analytics_layout.addWidget(analyze_btn)
+        
+        analytics_group.setLayout(analytics_layout)
+        layout.addWidget(analytics_group)
+        
+        # Exportar
+        export_group = QGroupBox("Exportar Datos")
+        export_layout = QVBoxLayout()
+        
+        export_info = QLabel("Escribe el escaneo, los grupos de duplicados (con los bytes recuperables) o el historial\nen CSV o NDJSON fila a fila, mientras se van obteniendo.")
+        export_info.setWordWrap(True)
+        export_info.setStyleSheet("color: #8a8aaa;")
+        export_layout.addWidget(export_info)
+        
+        export_btns = QHBoxLayout()
+        export_scan_btn = QPushButton("📤 Escaneo")
+        export_scan_btn.clicked.connect(lambda: self.export_data("scan"))
+        export_btns.addWidget(export_scan_btn)
+        
+        export_dup_btn = QPushButton("📤 Duplicados")
+        export_dup_btn.clicked.connect(lambda: self.export_data("duplicates"))
+        export_btns.addWidget(export_dup_btn)
+        
+        export_history_btn = QPushButton("📤 Historial")
+        export_history_btn.clicked.connect(lambda: self.export_data("history"))
+        export_btns.addWidget(export_history_btn)
+        
+        export_layout.addLayout(export_btns)
+        export_group.setLayout(export_layout)
+        layout.addWidget(export_group)
+        
+        # Plan
+        plan_group = QGroupBox("Plan de Organización")
+        plan_layout = QVBoxLayout()
+        
+        plan_info = QLabel("Calcula el destino final de cada archivo y guárdalo para revisarlo o ejecutarlo más tarde.\nAl ejecutar un plan guardado se omiten los archivos que ya no existen.")
+        plan_info.setWordWrap(True)
+        plan_info.setStyleSheet("color: #8a8aaa;")
+        plan_layout.addWidget(plan_info)
+        
+        plan_btns = QHBoxLayout()
+        save_plan_btn = QPushButton("💾 Guardar Plan")
+        save_plan_btn.clicked.connect(self.save_plan)
+        plan_btns.addWidget(save_plan_btn)
+        
+        run_plan_btn = QPushButton("📂 Ejecutar Plan Guardado")
+        run_plan_btn.clicked.connect(self.execute_saved_plan)
+        plan_btns.addWidget(run_plan_btn)
+        
+        plan_layout.addLayout(plan_btns)
+        plan_group.setLayout(plan_layout)
+        layout.addWidget(plan_group)
+        
         # Deshacer
         undo_group = QGroupBox("Deshacer Operaciones")
         undo_layout = QVBoxLayout()
@@ -756,6 +1301,65 @@ class OrganizerWindow(QMainWindow):
         undo_group.setLayout(undo_layout)
         layout.addWidget(undo_group)
         
+        # Rendimiento de E/S
+        io_group = QGroupBox("Rendimiento de E/S")
+        io_layout = QVBoxLayout()
+        
+        self.cache_friendly_checkbox = QCheckBox("Liberar la caché del sistema al leer y copiar (no afecta a otros servicios)")
+        self.cache_friendly_checkbox.setChecked(True)
+        self.cache_friendly_checkbox.stateChanged.connect(self.update_io_options)
+        io_layout.addWidget(self.cache_friendly_checkbox)
+        
+        memory_layout = QHBoxLayout()
+        memory_layout.addWidget(QLabel("Memoria máxima por búfer:"))
+        self.io_memory_spin = QSpinBox()
+        self.io_memory_spin.setRange(0, 1024)
+        self.io_memory_spin.setSuffix(" MB")
+        self.io_memory_spin.setSpecialValueText("Automático")
+        self.io_memory_spin.setFixedWidth(140)
+        self.io_memory_spin.valueChanged.connect(self.update_io_options)
+        memory_layout.addWidget(self.io_memory_spin)
+        memory_layout.addStretch()
+        io_layout.addLayout(memory_layout)
+        
+        limits_layout = QHBoxLayout()
+        limits_layout.addWidget(QLabel("Ancho de banda:"))
+        self.bandwidth_spin = QSpinBox()
+        self.bandwidth_spin.setRange(0, 100000)
+        self.bandwidth_spin.setSuffix(" MB/s")
+        self.bandwidth_spin.setSpecialValueText("Sin límite")
+        self.bandwidth_spin.setFixedWidth(140)
+        self.bandwidth_spin.valueChanged.connect(self.update_io_limits)
+        limits_layout.addWidget(self.bandwidth_spin)
+        
+        limits_layout.addWidget(QLabel("Archivos por segundo:"))
+        self.files_rate_spin = QSpinBox()
+        self.files_rate_spin.setRange(0, 100000)
+        self.files_rate_spin.setSpecialValueText("Sin límite")
+        self.files_rate_spin.setFixedWidth(140)
+        self.files_rate_spin.valueChanged.connect(self.update_io_limits)
+        limits_layout.addWidget(self.files_rate_spin)
+        limits_layout.addStretch()
+        io_layout.addLayout(limits_layout)
+        
+        priority_layout = QHBoxLayout()
+        priority_layout.addWidget(QLabel("Prioridad del proceso:"))
+        self.priority_combo = QComboBox()
+        self.priority_combo.addItems(["Normal", "Baja", "Solo en reposo"])
+        self.priority_combo.setFixedWidth(160)
+        self.priority_combo.currentIndexChanged.connect(self.update_process_priority)
+        priority_layout.addWidget(self.priority_combo)
+        priority_layout.addStretch()
+        io_layout.addLayout(priority_layout)
+        
+        self.process_worker_checkbox = QCheckBox("Ejecutar las operaciones en un proceso aparte")
+        self.process_worker_checkbox.setToolTip("La ventana no se bloquea durante operaciones largas y un fallo no la cierra.\nSi se cierra la ventana, la operación continúa y al volver a abrirla se retoma.")
+        self.process_worker_checkbox.setChecked(True)
+        io_layout.addWidget(self.process_worker_checkbox)
+        
+        io_group.setLayout(io_layout)
+        layout.addWidget(io_group)
+        
         # Info
         info_group = QGroupBox("Información")
         info_layout = QVBoxLayout()
@@ -788,12 +1392,33 @@ class OrganizerWindow(QMainWindow):
             self.source_path_input.setText(folder)
             self.organizer.set_source_folder(folder)
     
+    def add_source_folder(self):
+        if not self.source_path_input.text():
+            self.select_source_folder()
+            return
+        folder = QFileDialog.getExistingDirectory(self, "Añadir carpeta de origen")
+        if folder:
+            folders = [str(path) for path in self.organizer.source_folders] + [folder]
+            self.organizer.set_source_folders(folders)
+            self.source_path_input.setText("; ".join(str(path) for path in self.organizer.source_folders))
+    
     def select_destination_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Selecciona la carpeta de destino")
         if folder:
             self.dest_path_input.setText(folder)
             self.organizer.set_destination_folder(folder)
     
+    def add_mirror_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Añadir carpeta espejo")
+        if folder:
+            folders = [str(path) for path in self.organizer.mirror_folders] + [folder]
+            self.organizer.set_mirror_folders(folders)
+            self.mirror_path_input.setText("; ".join(str(path) for path in self.organizer.mirror_folders))
+    
+    def clear_mirror_folders(self):
+        self.organizer.set_mirror_folders([])
+        self.mirror_path_input.clear()
+    
     def add_rule(self):
         rule_text = self.rule_input.text().strip()
         if not rule_text:
@@ -813,11 +1438,12 @@ class OrganizerWindow(QMainWindow):
     def update_rules_from_categories(self):
         self.rules_list.clear()
         
+        existing = set()
         for category_name, checkbox in self.category_checkboxes.items():
             if checkbox.isChecked():
                 for ext in EXTENSION_CATEGORIES[category_name]:
-                    existing = [self.rules_list.item(i).text() for i in range(self.rules_list.count())]
                     if ext not in existing:
+                        existing.add(ext)
                         self.rules_list.addItem(QListWidgetItem(ext))
         
         self.update_rules_in_organizer()
@@ -829,13 +1455,71 @@ class OrganizerWindow(QMainWindow):
     def update_operation(self):
         self.organizer.set_operation("copy" if self.operation_combo.currentIndex() == 0 else "move")
     
+    def update_durable_moves(self):
+        self.organizer.set_durable_moves(self.durable_moves_checkbox.isChecked())
+    
+    def update_pack_threshold(self):
+        self.organizer.set_small_file_packing(self.pack_threshold_spin.value() * 1024)
+    
+    def update_verify_copies(self):
+        self.organizer.set_verify_copies(self.verify_copies_checkbox.isChecked())
+    
+    def update_collision_policy(self):
+        policies = ["rename", "skip_identical"]
+        self.organizer.set_collision_policy(policies[self.collision_combo.currentIndex()])
+    
     def update_organize_by(self):
-        methods = ["extension", "date", "size"]
+        methods = ["extension", "category", "date", "size"]
         self.organizer.set_organize_by(methods[self.organize_by_combo.currentIndex()])
     
+    def update_date_options(self):
+        granularities = ["year", "month", "day"]
+        self.organizer.set_date_granularity(granularities[self.date_granularity_combo.currentIndex()])
+        self.organizer.set_date_source("capture" if self.capture_date_checkbox.isChecked() else "modified")
+    
     def update_recursive(self):
         self.organizer.set_recursive(self.recursive_checkbox.isChecked())
     
+    def update_max_depth(self):
+        depth = self.max_depth_spin.value()
+        self.organizer.set_max_depth(depth if depth > 0 else None)
+    
+    def update_excluded_dirs(self):
+        self.organizer.set_excluded_dirs(self.excluded_dirs_input.text())
+    
+    def update_follow_symlinks(self):
+        self.organizer.set_follow_symlinks(self.follow_symlinks_checkbox.isChecked())
+    
+    def update_incremental(self):
+        self.organizer.set_incremental(self.incremental_checkbox.isChecked())
+    
+    def update_skip_organized(self):
+        self.organizer.set_skip_organized(self.skip_organized_checkbox.isChecked())
+    
+    def update_duplicate_memory(self):
+        self.organizer.set_duplicate_memory_limit(self.dup_memory_spin.value() * 1024 * 1024)
+    
+    def update_scan_archives(self):
+        self.organizer.set_scan_archives(self.scan_archives_checkbox.isChecked())
+    
+    def update_io_options(self):
+        set_cache_friendly(self.cache_friendly_checkbox.isChecked())
+        set_io_memory_limit(self.io_memory_spin.value() * 1024 * 1024)
+    
+    def update_io_limits(self):
+        bandwidth = self.bandwidth_spin.value() * 1024 * 1024
+        files_rate = self.files_rate_spin.value()
+        set_io_limits(bandwidth or None, files_rate or None)
+        # Un proceso de trabajo en marcha tiene sus propios límites
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.set_io_limits(bandwidth or None, files_rate or None)
+    
+    def update_process_priority(self):
+        priorities = [(0, "best-effort"), (10, "best-effort"), (19, "idle")]
+        nice, io_class = priorities[self.priority_combo.currentIndex()]
+        # Se aplica al hilo o proceso de trabajo, no a la ventana
+        self.organizer.set_priority(nice, io_class)
+    
     def update_name_filter(self):
         self.organizer.set_name_filter(self.name_filter_input.text())
     
@@ -847,6 +1531,15 @@ class OrganizerWindow(QMainWindow):
         max_size = self.max_size_spin.value() * 1024 * 1024 if self.max_size_spin.value() > 0 else None
         self.organizer.set_size_filter(min_size, max_size)
     
+    def update_date_filter(self):
+        min_date = None
+        max_date = None
+        if self.min_date_checkbox.isChecked():
+            min_date = datetime.combine(self.min_date_edit.date().toPython(), time.min)
+        if self.max_date_checkbox.isChecked():
+            max_date = datetime.combine(self.max_date_edit.date().toPython(), time.max)
+        self.organizer.set_date_filter(min_date, max_date)
+    
     def add_custom_destination(self):
         ext = self.custom_ext_input.text().strip()
         folder = self.custom_folder_input.text().strip()
@@ -859,6 +1552,35 @@ class OrganizerWindow(QMainWindow):
             self.custom_ext_input.clear()
             self.custom_folder_input.clear()
     
+    def apply_destination_rules(self):
+        try:
+            count = self.organizer.set_destination_rules(self.destination_rules_input.toPlainText())
+        except ValueError as e:
+            QMessageBox.warning(self, "Reglas de destino", str(e))
+            return
+        
+        self.destination_rules_label.setText(f"{count} reglas activas" if count else "Sin reglas")
+    
+    def load_destination_rules(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Cargar reglas de destino", "", "Reglas (*.txt *.rules);;Todos (*)")
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.destination_rules_input.setPlainText(f.read())
+            self.apply_destination_rules()
+    
+    def load_categories(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Cargar tabla de categorías", "", "JSON (*.json)")
+        if not path:
+            return
+        
+        try:
+            count = self.organizer.load_categories(Path(path))
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"No se pudo cargar la tabla: {e}")
+            return
+        
+        self.categories_file_label.setText(f"{count} categorías de {Path(path).name}")
+    
     def show_preview(self):
         if not self.source_path_input.text():
             QMessageBox.warning(self, "Error", "Selecciona una carpeta de origen")
@@ -871,7 +1593,7 @@ class OrganizerWindow(QMainWindow):
         self.status_label.setText("Escaneando...")
         self.progress_bar.setValue(0)
         
-        self.worker = WorkerThread(self.organizer, "scan")
+        self.worker = self.create_worker("scan")
         self.worker.progress.connect(self.update_progress)
         self.worker.finished.connect(self.on_scan_finished)
         self.worker.start()
@@ -912,7 +1634,7 @@ class OrganizerWindow(QMainWindow):
         self.status_label.setText("Organizando...")
         self.progress_bar.setValue(0)
         
-        self.worker = WorkerThread(self.organizer, "organize")
+        self.worker = self.create_worker("organize")
         self.worker.progress.connect(self.update_progress)
         self.worker.finished.connect(self.on_organize_finished)
         self.worker.start()
@@ -928,15 +1650,177 @@ class OrganizerWindow(QMainWindow):
             result_msg += f"✓ Copiados: {len(results['copied'])}\n"
         if results["moved"]:
             result_msg += f"✓ Movidos: {len(results['moved'])}\n"
+        if results["skipped"]:
+            result_msg += f"= Omitidos (ya en el destino): {len(results['skipped'])}\n"
         if results["errors"]:
             result_msg += f"\n✗ Errores: {len(results['errors'])}\n"
         
+        if len(self.organizer.destination_results) > 1:
+            result_msg += "\nPor destino:\n"
+            for folder, folder_results in self.organizer.destination_results.items():
+                result_msg += f"  {folder}: {len(folder_results['copied'])} copiados"
+                if folder_results["errors"]:
+                    result_msg += f", {len(folder_results['errors'])} errores"
+                result_msg += "\n"
+        
         QMessageBox.information(self, "Resultado", result_msg)
     
+    def analyze_folder(self):
+        if not self.source_path_input.text():
+            QMessageBox.warning(self, "Error", "Selecciona una carpeta de origen")
+            return
+        
+        self.status_label.setText("Analizando...")
+        self.progress_bar.setValue(0)
+        
+        self.worker = self.create_worker("analyze")
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished.connect(self.on_analyze_finished)
+        self.worker.start()
+    
+    def on_analyze_finished(self, success, message):
+        self.status_label.setText(message)
+        self.progress_bar.setValue(100)
+        
+        if self.organizer.analytics and self.organizer.analytics.total_files:
+            dialog = AnalyticsDialog(self.organizer.analytics, self)
+            dialog.exec()
+        else:
+            QMessageBox.information(self, "Análisis", "No se encontraron archivos con los filtros seleccionados")
+    
+    def export_data(self, kind):
+        if kind != "history" and not self.source_path_input.text():
+            QMessageBox.warning(self, "Error", "Selecciona una carpeta de origen")
+            return
+        
+        names = {"scan": "escaneo", "duplicates": "duplicados", "history": "historial"}
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar datos", f"{names[kind]}.csv", "CSV (*.csv);;NDJSON (*.ndjson)"
+        )
+        if not path:
+            return
+        
+        self.status_label.setText("Exportando...")
+        self.progress_bar.setValue(0)
+        
+        self.worker = self.create_worker("export", kind=kind, output=path)
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished.connect(self.on_export_finished)
+        self.worker.start()
+    
+    def on_export_finished(self, success, message):
+        self.status_label.setText(message)
+        self.progress_bar.setValue(100)
+        QMessageBox.information(self, "Exportar", message)
+    
+    def save_plan(self):
+        if not self.source_path_input.text() or not self.dest_path_input.text():
+            QMessageBox.warning(self, "Error", "Selecciona las carpetas de origen y destino")
+            return
+        
+        self.status_label.setText("Calculando plan...")
+        self.progress_bar.setValue(0)
+        
+        self.worker = self.create_worker("plan")
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished.connect(self.on_plan_finished)
+        self.worker.start()
+    
+    def on_plan_finished(self, success, message):
+        self.status_label.setText(message)
+        self.progress_bar.setValue(100)
+        
+        if not success:
+            QMessageBox.information(self, "Plan", "No se encontraron archivos con los filtros seleccionados")
+            return
+        
+        path, _ = QFileDialog.getSaveFileName(self, "Guardar plan", "plan.json", "Plan (*.json)")
+        if path:
+            self.organizer.plan.save(Path(path))
+            QMessageBox.information(self, "Plan", f"{message}\nGuardado en {path}")
+    
+    def execute_saved_plan(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Abrir plan", "", "Plan (*.json)")
+        if not path:
+            return
+        
+        try:
+            plan = OrganizePlan.load(Path(path))
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"No se pudo leer el plan: {e}")
+            return
+        
+        op_text = "mover" if plan.operation == "move" else "copiar"
+        reply = QMessageBox.question(
+            self, "Confirmar",
+            f"¿Deseas {op_text} {len(plan.operations)} archivos según el plan?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        
+        if reply != QMessageBox.Yes:
+            return
+        
+        self.organizer.plan = plan
+        self.status_label.setText("Ejecutando plan...")
+        self.progress_bar.setValue(0)
+        
+        self.worker = self.create_worker("execute_plan")
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished.connect(self.on_organize_finished)
+        self.worker.start()
+    
+    def create_worker(self, operation, **options):
+        if self.process_worker_checkbox.isChecked():
+            worker = ProcessWorker(self.organizer, operation, **options)
+        else:
+            worker = WorkerThread(self.organizer, operation, **options)
+        self.track_worker(worker)
+        return worker
+    
+    def track_worker(self, worker):
+        """El botón de cancelar solo está activo mientras la operación sigue en marcha."""
+        self.cancel_btn.setEnabled(True)
+        worker.finished.connect(lambda success, message: self.cancel_btn.setEnabled(False))
+    
+    def cancel_operation(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText("Cancelando...")
+    
+    def resume_worker(self):
+        """Retoma la operación que seguía en marcha en otro proceso cuando se cerró la ventana."""
+        client = WorkerClient.attach()
+        if client is None:
+            return
+        
+        handlers = {
+            "organize": self.on_organize_finished,
+            "execute_plan": self.on_organize_finished,
+            "scan": self.on_scan_finished,
+            "plan": self.on_plan_finished,
+            "analyze": self.on_analyze_finished,
+            "duplicates": self.on_duplicates_finished,
+            "resolve_duplicates": self.on_resolve_finished,
+            "chunks": self.on_partial_duplicates_finished,
+            "export": self.on_export_finished,
+            "undo": self.on_undo_finished
+        }
+        self.status_label.setText("Reconectando con la operación en curso...")
+        self.progress_bar.setValue(0)
+        
+        self.worker = ProcessWorker(self.organizer, client.operation, client=client)
+        self.track_worker(self.worker)
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished.connect(handlers.get(client.operation, lambda success, message: self.status_label.setText(message)))
+        self.worker.start()
+    
     def update_progress(self, current, total):
         if total > 0:
             self.progress_bar.setValue(int((current / total) * 100))
             self.status_label.setText(f"{current}/{total}")
+        else:
+            self.status_label.setText(f"{current} archivos")
     
     def undo_last(self):
         history = self.organizer.get_history(1)
@@ -947,8 +1831,8 @@ class OrganizerWindow(QMainWindow):
         last_batch = history[0]
         count = len(last_batch.get("operations", []))
         
-        if last_batch["type"] != "move":
-            QMessageBox.warning(self, "Deshacer", "Solo se pueden deshacer operaciones de 'Mover'")
+        if last_batch["type"] not in UNDOABLE_BATCH_TYPES:
+            QMessageBox.warning(self, "Deshacer", "Solo se pueden deshacer operaciones de 'Mover' o de limpieza de duplicados")
             return
         
         reply = QMessageBox.question(
@@ -963,7 +1847,7 @@ class OrganizerWindow(QMainWindow):
         self.status_label.setText("Deshaciendo...")
         self.progress_bar.setValue(0)
         
-        self.worker = WorkerThread(self.organizer, "undo")
+        self.worker = self.create_worker("undo")
         self.worker.progress.connect(self.update_progress)
         self.worker.finished.connect(self.on_undo_finished)
         self.worker.start()
@@ -981,17 +1865,11 @@ class OrganizerWindow(QMainWindow):
         self.status_label.setText("Buscando duplicados...")
         self.progress_bar.setValue(0)
         
-        # Escanear todos los archivos (sin filtro de extensiones)
+        # Todos los archivos (sin filtro de extensiones); el escaneo lo hace la operación, no la ventana
         self.organizer._preview_files = []
         self.organizer.rules = []  # Temporalmente sin filtro
-        self.organizer.get_files()
         
-        if not self.organizer._preview_files:
-            QMessageBox.information(self, "Duplicados", "No se encontraron archivos")
-            self.update_rules_in_organizer()
-            return
-        
-        self.worker = WorkerThread(self.organizer, "duplicates")
+        self.worker = self.create_worker("duplicates")
         self.worker.progress.connect(self.update_progress)
         self.worker.finished.connect(self.on_duplicates_finished)
         self.worker.start()
@@ -1004,9 +1882,54 @@ class OrganizerWindow(QMainWindow):
         if self.organizer.duplicate_finder.duplicates:
             dialog = DuplicatesDialog(self.organizer.duplicate_finder.duplicates, self)
             dialog.exec()
+            if dialog.resolution:
+                self.resolve_duplicates(dialog.resolution)
         else:
             QMessageBox.information(self, "Duplicados", "No se encontraron archivos duplicados")
     
+    def resolve_duplicates(self, resolution: dict):
+        self.status_label.setText("Resolviendo duplicados...")
+        self.progress_bar.setValue(0)
+        
+        self.worker = self.create_worker("resolve_duplicates", **resolution)
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished.connect(self.on_resolve_finished)
+        self.worker.start()
+    
+    def on_resolve_finished(self, success, message):
+        self.status_label.setText(message)
+        self.progress_bar.setValue(100)
+        QMessageBox.information(self, "Duplicados", message)
+    
+    def find_partial_duplicates(self):
+        if not self.source_path_input.text():
+            QMessageBox.warning(self, "Error", "Selecciona una carpeta de origen")
+            return
+        
+        self.status_label.setText("Analizando bloques...")
+        self.progress_bar.setValue(0)
+        self.organizer._preview_files = []
+        
+        self.worker = self.create_worker("chunks")
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished.connect(self.on_partial_duplicates_finished)
+        self.worker.start()
+    
+    def on_partial_duplicates_finished(self, success, message):
+        self.status_label.setText(message)
+        self.progress_bar.setValue(100)
+        
+        if not success or self.organizer.chunk_analyzer is None:
+            QMessageBox.warning(self, "Duplicados Parciales", message)
+            return
+        
+        report = self.organizer.chunk_analyzer.get_report()
+        if report["top_pairs"]:
+            dialog = ChunkReportDialog(report, self)
+            dialog.exec()
+        else:
+            QMessageBox.information(self, "Duplicados Parciales", "No se encontraron archivos que compartan bloques")
+    
     def show_history(self):
         history = self.organizer.get_history(20)
         if history:
@@ -1024,20 +1947,40 @@ class OrganizerWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             self.source_path_input.clear()
             self.dest_path_input.clear()
+            self.clear_mirror_folders()
             self.rules_list.clear()
             self.rule_input.clear()
             self.operation_combo.setCurrentIndex(0)
             self.organize_by_combo.setCurrentIndex(0)
+            self.collision_combo.setCurrentIndex(0)
+            self.verify_copies_checkbox.setChecked(False)
+            self.durable_moves_checkbox.setChecked(False)
+            self.pack_threshold_spin.setValue(0)
+            self.date_granularity_combo.setCurrentIndex(1)
+            self.capture_date_checkbox.setChecked(False)
             self.recursive_checkbox.setChecked(False)
+            self.max_depth_spin.setValue(0)
+            self.excluded_dirs_input.setText(", ".join(DEFAULT_EXCLUDED_DIRS))
+            self.follow_symlinks_checkbox.setChecked(False)
+            self.incremental_checkbox.setChecked(False)
+            self.skip_organized_checkbox.setChecked(True)
+            self.scan_archives_checkbox.setChecked(False)
+            self.dup_memory_spin.setValue(0)
             self.name_filter_input.clear()
             self.exclude_filter_input.clear()
             self.min_size_spin.setValue(0)
             self.max_size_spin.setValue(0)
+            self.min_date_checkbox.setChecked(False)
+            self.max_date_checkbox.setChecked(False)
             self.custom_dest_list.clear()
+            self.categories_file_label.setText("Usando las categorías predefinidas")
+            self.destination_rules_input.clear()
+            self.destination_rules_label.setText("Sin reglas")
             
             for checkbox in self.category_checkboxes.values():
                 checkbox.setChecked(False)
             
             self.organizer = FileOrganizer()
+            self.update_io_options()
             self.progress_bar.setValue(0)
             self.status_label.setText("Listo")
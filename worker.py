@@ -0,0 +1,487 @@
+"""
+Proceso de trabajo para las operaciones pesadas.
+
+La interfaz lanza cada operación en un proceso aparte que recibe una copia de
+la configuración del FileOrganizer, envía el progreso agrupado por un socket
+local autenticado y deja el resultado en disco. El proceso sigue vivo aunque
+se cierre la interfaz; al volver a abrirla, WorkerClient.attach lo encuentra
+gracias al archivo de estado y se reconecta o recoge el resultado.
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import threading
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from multiprocessing.connection import Listener, Client
+from typing import Iterator, List, Optional, Tuple
+
+from organizer import FileOrganizer, ScanIndex, set_io_limits
+
+WORKER_DIR = Path.home() / ".organizer_worker"
+STATE_FILE = "state.json"
+JOB_FILE = "job.pickle"
+RESULT_FILE = "result.pickle"
+LOG_FILE = "worker.log"
+# Argumento con el que el ejecutable congelado (PyInstaller) se relanza como proceso de trabajo
+WORKER_FLAG = "--worker"
+
+# Como mucho un mensaje de progreso cada PROGRESS_INTERVAL segundos
+PROGRESS_INTERVAL = 0.1
+START_TIMEOUT = 15.0
+
+# Estado que la interfaz envía al proceso y el que vuelve con el resultado
+INPUT_ATTRIBUTES = ["_preview_files", "_preview_pruned", "plan"]
+RESULT_ATTRIBUTES = ["_preview_files", "_preview_pruned", "scan_delta", "plan", "results",
+                     "destination_results", "analytics", "chunk_analyzer"]
+# Las listas y diccionarios del resultado viajan en lotes de este tamaño
+RESULT_BATCH = 1000
+
+
+def run_operation(organizer: FileOrganizer, operation: str, progress_callback=None,
+                  cancel_event: Optional[threading.Event] = None, **options) -> Tuple[bool, str]:
+    """Ejecuta una operación por nombre; la usan tanto WorkerThread como el proceso de trabajo."""
+    if operation == "organize":
+        return organizer.organize(progress_callback, cancel_event=cancel_event)
+    if operation == "scan":
+        # Es la vista previa de organizar: se podan las carpetas ya organizadas
+        organizer.get_files(progress_callback, cancel_event, prune_organized=True)
+        return True, f"Encontrados {len(organizer._preview_files)} archivos"
+    if operation == "duplicates":
+        organizer.find_duplicates(progress_callback, cancel_event=cancel_event)
+        count = organizer.duplicate_finder.get_duplicate_count()
+        return True, f"Encontrados {count} archivos duplicados"
+    if operation == "plan":
+        organizer.get_files(progress_callback, cancel_event, prune_organized=True)
+        organizer.plan = organizer.build_plan()
+        count = len(organizer.plan.operations)
+        return count > 0, f"Plan con {count} operaciones"
+    if operation == "execute_plan":
+        return organizer.execute_plan(organizer.plan, progress_callback, cancel_event=cancel_event)
+    if operation == "chunks":
+        report = organizer.analyze_chunks(progress_callback).get_report()
+        return True, f"Analizados {report['files']} archivos por bloques"
+    if operation == "analyze":
+        analytics = organizer.analyze(progress_callback)
+        return True, f"Analizados {analytics.total_files} archivos"
+    if operation == "resolve_duplicates":
+        results = organizer.resolve_duplicates(progress_callback=progress_callback, **options)
+        message = f"Eliminados {len(results['removed'])} duplicados"
+        if results["errors"]:
+            message += f" | Errores: {len(results['errors'])}"
+        return bool(results["removed"]), message
+    if operation == "export":
+        kind = options["kind"]
+        if kind == "scan":
+            rows = organizer.export_scan(options["output"], progress_callback=progress_callback)
+        elif kind == "duplicates":
+            rows = organizer.export_duplicates(options["output"], progress_callback=progress_callback)
+        else:
+            rows = organizer.export_history(options["output"])
+        return rows > 0, f"Exportadas {rows} filas a {options['output']}"
+    if operation == "undo":
+        return organizer.undo_last(progress_callback)
+    return False, "Operación desconocida"
+
+
+def _open_private(path: Path, mode: str, **kwargs):
+    """Crea el archivo ya con permisos 0600: nunca es legible por otros, ni siquiera un instante."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o600)
+    return os.fdopen(fd, mode, **kwargs)
+
+
+def _write_json(path: Path, data: dict):
+    # Contiene la clave de autenticación del socket
+    tmp = path.with_suffix(".tmp")
+    with _open_private(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _write_pickle(path: Path, data: dict):
+    # El trabajo también lleva la clave de autenticación
+    tmp = path.with_suffix(".tmp")
+    with _open_private(tmp, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _write_records(path: Path, records: List[tuple]):
+    """Escribe los registros del resultado uno tras otro para poder leerlos de uno en uno."""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, 'wb') as f:
+        for record in records:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _read_records(path: Path) -> Iterator[tuple]:
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def _collect(organizer: FileOrganizer, names) -> dict:
+    """Atributos del organizador que se pueden serializar; los que no, se omiten."""
+    state = {}
+    for name in names:
+        value = getattr(organizer, name)
+        try:
+            pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            continue
+        state[name] = value
+    return state
+
+
+def _result_records(organizer: FileOrganizer) -> List[tuple]:
+    """
+    Resultado como registros (nombre, tipo, valor). Las listas y diccionarios
+    grandes se parten en lotes: cada uno se deserializa por separado y la
+    interfaz no se queda sin el GIL mientras los recibe.
+    """
+    state = _collect(organizer, RESULT_ATTRIBUTES)
+    state["duplicates"] = organizer.duplicate_finder.duplicates
+    records = []
+    for name, value in state.items():
+        if isinstance(value, list) and len(value) > RESULT_BATCH:
+            records.append((name, "set", []))
+            for start in range(0, len(value), RESULT_BATCH):
+                records.append((name, "extend", value[start:start + RESULT_BATCH]))
+        elif isinstance(value, dict) and len(value) > RESULT_BATCH:
+            records.append((name, "set", {}))
+            items = list(value.items())
+            for start in range(0, len(items), RESULT_BATCH):
+                records.append((name, "update", dict(items[start:start + RESULT_BATCH])))
+        else:
+            records.append((name, "set", value))
+    return records
+
+
+class JobServer:
+    """Lado del proceso de trabajo: acepta a un cliente cada vez y le reenvía el progreso."""
+    
+    def __init__(self, job_dir: Path, job: dict):
+        self.job_dir = job_dir
+        self.listener = Listener(("127.0.0.1", 0), authkey=bytes.fromhex(job["authkey"]))
+        self.cancel_event = threading.Event()
+        self.state = {
+            "pid": os.getpid(),
+            "address": list(self.listener.address),
+            "authkey": job["authkey"],
+            "operation": job["operation"],
+            "started": datetime.now().isoformat(),
+            "status": "running"
+        }
+        self._lock = threading.Lock()
+        self._conn = None
+        self._latest = (0, 0)
+        self._last_sent = 0.0
+        self._finished = None
+    
+    def start(self):
+        _write_json(self.job_dir / STATE_FILE, self.state)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+    
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                return
+            except Exception:
+                # Clave incorrecta u otro cliente: se ignora y se sigue escuchando
+                continue
+            with self._lock:
+                if self._conn is not None:
+                    self._conn.close()
+                self._conn = conn
+                self._send(("progress",) + self._latest)
+                if self._finished is not None:
+                    self._send(("finished",) + self._finished)
+            threading.Thread(target=self._read_loop, args=(conn,), daemon=True).start()
+    
+    def _read_loop(self, conn):
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return
+            if not message:
+                continue
+            if message[0] == "cancel":
+                self.cancel_event.set()
+            elif message[0] == "limits":
+                set_io_limits(message[1], message[2])
+    
+    def _send(self, message: tuple):
+        """Envía al cliente actual; debe llamarse con el cerrojo tomado."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.send(message)
+        except (OSError, EOFError, ValueError):
+            self._conn = None
+    
+    def progress(self, current: int, total: int):
+        self._latest = (current, total)
+        now = time.monotonic()
+        if now - self._last_sent >= PROGRESS_INTERVAL:
+            self._last_sent = now
+            with self._lock:
+                self._send(("progress", current, total))
+    
+    def finish(self, success: bool, message: str, records: List[tuple] = ()):
+        """Envía al cliente conectado el resultado en lotes y después el mensaje final."""
+        self.state.update(status="finished", success=success, message=message,
+                          finished=datetime.now().isoformat())
+        _write_json(self.job_dir / STATE_FILE, self.state)
+        with self._lock:
+            self._finished = (success, message)
+            self._send(("progress",) + self._latest)
+            for record in records:
+                self._send(("result",) + record)
+            self._send(("finished", success, message))
+            if self._conn is not None:
+                self._conn.close()
+        self.listener.close()
+
+
+def serve(job_dir: Path):
+    """Punto de entrada del proceso de trabajo."""
+    with open(job_dir / JOB_FILE, 'rb') as f:
+        job = pickle.load(f)
+    
+    server = JobServer(job_dir, job)
+    server.start()
+    
+    organizer = FileOrganizer()
+    organizer.apply_config(job["config"])
+    # El proceso solo trabaja para la operación: la prioridad no afecta a la ventana
+    organizer.apply_priority(whole_process=True)
+    for name, value in job["state"].items():
+        setattr(organizer, name, value)
+    if "duplicates" in job:
+        organizer.duplicate_finder.duplicates = job["duplicates"]
+    
+    try:
+        success, message = run_operation(organizer, job["operation"], server.progress,
+                                         server.cancel_event, **job["options"])
+        records = _result_records(organizer)
+    except Exception as e:
+        success, message = False, f"Error en el proceso de trabajo: {e}"
+        records = []
+    
+    # El archivo sirve a la interfaz que se reconecte cuando la operación ya terminó
+    try:
+        _write_records(job_dir / RESULT_FILE, records)
+    except Exception:
+        records = []
+        _write_records(job_dir / RESULT_FILE, records)
+    server.finish(success, message, records)
+
+
+class WorkerClient:
+    """Lado de la interfaz: recibe el progreso de un proceso de trabajo y recoge su resultado."""
+    
+    def __init__(self, job_dir: Path, state: dict):
+        self.job_dir = job_dir
+        self.state = state
+        self.operation = state["operation"]
+        self._conn = None
+        self._records = []
+        self._received = False
+    
+    @classmethod
+    def attach(cls, job_dir: Path = WORKER_DIR) -> Optional["WorkerClient"]:
+        """Cliente para la operación en curso o terminada sin recoger, si la hay."""
+        try:
+            with open(job_dir / STATE_FILE, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cls(job_dir, state)
+    
+    def _reload_state(self):
+        try:
+            with open(self.job_dir / STATE_FILE, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            pass
+    
+    def connect(self) -> bool:
+        if self.state.get("status") != "running":
+            return False
+        try:
+            self._conn = Client(tuple(self.state["address"]), authkey=bytes.fromhex(self.state["authkey"]))
+        except (OSError, EOFError, ValueError):
+            self._conn = None
+        return self._conn is not None
+    
+    def is_alive(self) -> bool:
+        """True si el proceso sigue en marcha y acepta conexiones."""
+        if self._conn is not None:
+            return True
+        if self.connect():
+            self.close()
+            return True
+        return False
+    
+    def messages(self) -> Iterator[tuple]:
+        """
+        Genera ("progress", actual, total) y termina con ("finished", éxito, mensaje).
+        Si el proceso desaparece sin terminar, el último mensaje lo indica. Los
+        lotes del resultado se guardan para load_results.
+        """
+        if self._conn is None and not self.connect():
+            self._reload_state()
+            yield self._final_message()
+            return
+        
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                self.close()
+                self._reload_state()
+                yield self._final_message()
+                return
+            if message[0] == "result":
+                self._records.append(message[1:])
+                continue
+            yield message
+            if message[0] == "finished":
+                self._received = True
+                self.close()
+                return
+    
+    def _final_message(self) -> tuple:
+        if self.state.get("status") == "finished":
+            return ("finished", self.state["success"], self.state["message"])
+        return ("finished", False, "El proceso de trabajo terminó inesperadamente")
+    
+    def _send(self, message: tuple):
+        if self._conn is not None:
+            try:
+                self._conn.send(message)
+            except (OSError, EOFError, ValueError):
+                pass
+    
+    def cancel(self):
+        self._send(("cancel",))
+    
+    def set_io_limits(self, bytes_per_second: Optional[float], files_per_second: Optional[float]):
+        """Cambia los límites de E/S del proceso en marcha."""
+        self._send(("limits", bytes_per_second, files_per_second))
+    
+    def load_results(self, organizer: FileOrganizer):
+        """
+        Copia al organizador de la interfaz el estado calculado en el proceso:
+        los lotes recibidos por el socket o, si no llegaron, los del archivo de resultado.
+        """
+        records = self._records if self._received else _read_records(self.job_dir / RESULT_FILE)
+        result = {}
+        try:
+            for name, kind, value in records:
+                if kind == "extend":
+                    result[name].extend(value)
+                elif kind == "update":
+                    result[name].update(value)
+                else:
+                    result[name] = value
+        except (OSError, pickle.UnpicklingError):
+            result = {}
+        self._records = []
+        
+        duplicates = result.pop("duplicates", None)
+        if duplicates is not None:
+            organizer.duplicate_finder.duplicates = duplicates
+        for name, value in result.items():
+            setattr(organizer, name, value)
+        
+        # Historial e índice los ha escrito el otro proceso
+        organizer.history.load_history()
+        if organizer.incremental and organizer.scan_index is not None:
+            organizer.scan_index = ScanIndex(organizer.scan_index.index_file)
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def discard(self):
+        """Borra los archivos de la operación una vez recogido el resultado."""
+        self.close()
+        for name in (STATE_FILE, JOB_FILE, RESULT_FILE):
+            try:
+                (self.job_dir / name).unlink()
+            except OSError:
+                pass
+
+
+def worker_command(job_dir: Path) -> List[str]:
+    """
+    Orden que lanza el proceso de trabajo. Un ejecutable congelado no tiene
+    intérprete ni worker.py: se relanza a sí mismo con WORKER_FLAG y main.py
+    llama a serve.
+    """
+    if getattr(sys, "frozen", False):
+        return [sys.executable, WORKER_FLAG, str(job_dir)]
+    return [sys.executable, str(Path(__file__).resolve()), str(job_dir)]
+
+
+def start_job(organizer: FileOrganizer, operation: str, job_dir: Path = WORKER_DIR, **options) -> WorkerClient:
+    """
+    Lanza la operación en un proceso independiente y devuelve el cliente ya
+    conectado. Solo puede haber una operación por carpeta de trabajo.
+    """
+    previous = WorkerClient.attach(job_dir)
+    if previous is not None and previous.state.get("status") == "running" and previous.is_alive():
+        raise RuntimeError("Ya hay una operación en curso en otro proceso")
+    if previous is not None:
+        previous.discard()
+    
+    job_dir.mkdir(parents=True, exist_ok=True)
+    job = {
+        "operation": operation,
+        "options": options,
+        "config": organizer.get_config(),
+        "state": _collect(organizer, INPUT_ATTRIBUTES),
+        "duplicates": organizer.duplicate_finder.duplicates,
+        "authkey": os.urandom(16).hex()
+    }
+    _write_pickle(job_dir / JOB_FILE, job)
+    
+    # Sesión propia: el proceso no muere al cerrar la interfaz
+    kwargs = {"start_new_session": True}
+    if os.name == "nt":
+        kwargs = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    with open(job_dir / LOG_FILE, 'ab') as log:
+        subprocess.Popen(
+            worker_command(job_dir), stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+            cwd=str(job_dir), close_fds=True, **kwargs
+        )
+    
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        client = WorkerClient.attach(job_dir)
+        if client is not None and client.state.get("authkey") == job["authkey"]:
+            if client.connect() or client.state.get("status") == "finished":
+                return client
+        time.sleep(0.05)
+    raise RuntimeError("El proceso de trabajo no ha arrancado")
+
+
+if __name__ == "__main__":
+    serve(Path(sys.argv[1]))